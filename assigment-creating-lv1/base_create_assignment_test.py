@@ -1,134 +1,157 @@
-import csv
-import re
+import pytest
 from seleniumbase import BaseCase
 from selenium.common.exceptions import WebDriverException, NoSuchElementException
-
-class BaseCreateAssigmentTest(BaseCase):
+from harness.cleanup import AssignmentCleanupMixin, assignment_ids, created_assignments
+from harness.commands import CommandCountingMixin
+from harness.data import TYPED_SCHEMA, iter_rows, load_rows
+from harness.editor import (
+    EDITOR_INPUT_API, EDITOR_INPUT_KEYS, editor_text, set_editor_content, wait_for_editor_ready,
+)
+from harness.forms import FORM_INPUT_INTERACTIVE, FORM_INPUT_SCRIPT, fill_form
+from harness.frames import FrameTrackingMixin
+from harness.pool import BrowserPoolMixin
+from harness.provision import MoodleApiError
+from harness.retry import CircuitOpenError, RetryPolicy, site_breaker
+from harness.rows import expand_csv_rows
+from harness.session import drop_session, restore_session, save_session
+from harness.site import site
+from harness.sleeps import SleepProfilingMixin
+from harness.textinput import TextInputMixin
+from harness.timing import PhaseTimingMixin
+from harness.waits import batch_verify, describe_failures, wait_for_selector
+
+class BaseCreateAssigmentTest(PhaseTimingMixin, CommandCountingMixin, SleepProfilingMixin, TextInputMixin, AssignmentCleanupMixin, BrowserPoolMixin, FrameTrackingMixin, BaseCase):
     """Base class for tests involving course & assignment creation and authentication."""
+    reuse_session = True
+    editor_input = EDITOR_INPUT_API
+    form_input = FORM_INPUT_SCRIPT
+    open_retry = RetryPolicy(attempts=3, delay=1, backoff=2, deadline=60, retry_on=(WebDriverException,))
+    login_retry = RetryPolicy(attempts=3, delay=1, backoff=2, retry_on=(WebDriverException,))
+    verify_retry = RetryPolicy(attempts=None, delay=0.1, backoff=2, jitter=0, retry_on=(WebDriverException,))
+
+    course_name = "L01.25-Q"
+
+    @pytest.fixture(autouse=True)
+    def use_shared_setup(self, shared_setup):
+        self.shared_setup = shared_setup
 
     def setUp(self):
         super().setUp()
-        self.create_course()
+        url = "https://sandbox.moodledemo.net/"
+        # The course is checked and created by the first test of the session only, whichever worker runs it.
+        self.shared_setup.once(f"course {self.course_name} on {site.resolve(url)}", self.create_course)
 
         # Open the course site and log in
-        url = "https://sandbox.moodledemo.net/"
         self.open_page_with_retries(url)
         self.set_window_size(1550, 878)
-        self.sleep(1)
-
-    def read_data_from_csv(self, filename):
-        """Reads data from a CSV file and processes escape sequences."""
-        data = []
-
-        # Regular expression to match escape sequences
-        escape_sequence_re = re.compile(r'\\.')
-
-        def unescape(match):
-            """Converts escape sequences to their intended characters."""
-            seq = match.group(0)
-            if seq == r'\\':
-                return '\\'
-            elif seq == r'\n':
-                return '\n'
-            elif seq == r'\t':
-                return '\t'
-            elif seq == r'\"':
-                return '\"'
-            elif seq == r'\'':
-                return '\''
-            # Add more cases for different escape sequences if necessary
-            return seq  # Returns unchanged if not a recognized escape
-
-        def convert_value(value):
-            """Tries to convert the string to a boolean, int, or float."""
-            if (value.startswith("'") and value.endswith("'")) or (value.startswith('"') and value.endswith('"')):
-                return value.strip("'\"")
-
-            # Handle booleans
-            if value.lower() == 'true':
-                return True
-            elif value.lower() == 'false':
-                return False
-
-            # Handle numbers
-            try:
-                int_value = int(value)
-                return int_value
-            except ValueError:
-                pass
-
-            try:
-                float_value = float(value)
-                return float_value
-            except ValueError:
-                pass
-
-            return value
-
-        # Open the CSV file
-        with open(filename, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                processed_row = {
-                    key: convert_value(escape_sequence_re.sub(unescape, value))
-                    for key, value in row.items()
-                }
-                data.append(processed_row)
-
-        return data
+        self.wait_for_ready_state_complete()
+
+    def __init_subclass__(cls, **kwargs):
+        """Expands `csv_rows` test methods into one test per CSV row."""
+        super().__init_subclass__(**kwargs)
+        expand_csv_rows(cls, cls.read_data_from_csv, cls.stream_data_from_csv)
+
+    @classmethod
+    def read_data_from_csv(cls, filename):
+        """Reads data from a CSV file and processes escape sequences, converting booleans and numbers."""
+        return load_rows(filename, TYPED_SCHEMA)
+
+    @classmethod
+    def stream_data_from_csv(cls, filename):
+        """Yields the rows of a CSV file while reading it, converted like `read_data_from_csv`."""
+        return iter_rows(filename, TYPED_SCHEMA)
 
     def open_page_with_retries(self, url, max_retries=3):
-        """Attempts to open a page, retries up to max_retries times if it fails."""
-        retry_count = 0
-        success = False
-
-        while not success and retry_count < max_retries:
-            try:
-                self.open(url)
-                success = True
-            except WebDriverException as e:
-                retry_count += 1
-                print(f"Attempt {retry_count} of {max_retries} failed: {e}")
-                self.sleep(2)  # Wait before retrying
-
-        if not success:
+        """
+        Attempts to open a page, retries up to max_retries times if it fails.
+
+        Retries follow `open_retry`. Once the site failed several opens in a
+        row, its circuit breaker makes the next opens fail immediately.
+
+        Sandbox URLs are moved to the site chosen with `--moodle-url` or `--standin`.
+        """
+        url = site.resolve(url)
+
+        def report(number, e):
+            print(f"Attempt {number} of {max_retries} failed: {e}")
+
+        try:
+            self.open_retry.copy(attempts=max_retries).call(
+                lambda: self.open(url), sleep=self.sleep, on_retry=report, breaker=site_breaker(url)
+            )
+        except CircuitOpenError as e:
+            self.fail(f"Failed to open the page {url}, the site looks down: {e}")
+        except WebDriverException:
             self.fail(f"Failed to open the page {url} after {max_retries} attempts")
 
     def login(self, username, password, max_retries=3):
-        """Logs into the application with provided username and password."""
-        retry_count = 0
-        logged_in = False
+        """
+        Logs into the application with provided username and password.
+
+        When `reuse_session` is set, a session cached by an earlier login of
+        the same user in this worker is restored instead of using the form.
+        Failed form submissions are retried following `login_retry`.
+        """
+        if self.reuse_session and restore_session(self, username):
+            return
 
         # self.sleep(2) # Wait for the page to load before attempting to log in
 
         self.click(".usermenu .login a")
-        while retry_count < max_retries and not logged_in:
+
+        def attempt():
             self.clear("#username")
-            self.update_text("#username", username)
+            self.input_text("#username", username, "login")
             self.clear("#password")
-            self.update_text("#password", password)
+            self.input_text("#password", password, "login")
             self.click("#loginbtn")
+            return self.is_element_visible(".userinitials")
 
-            if self.is_element_visible(".userinitials"):
-                logged_in = True
-            else:
-                retry_count += 1
-                print(f"Login attempt {retry_count} failed. Retrying...")
-                self.sleep(2)  # Wait before retrying
+        def report(number, e):
+            print(f"Login attempt {number} failed. Retrying...")
+
+        logged_in = self.login_retry.copy(attempts=max_retries).until(
+            attempt,
+            sleep=lambda seconds: self.sleep(seconds, lambda: self.is_element_visible(".userinitials")),
+            on_retry=report,
+        )
 
         if not logged_in:
             self.fail("Failed to log in after multiple attempts")
 
+        if self.reuse_session:
+            save_session(self, username)
+
+    def wait_for_editor_ready(self, frame=0, timeout=20):
+        """Waits until the TinyMCE editor in iframe `frame` is initialized and editable."""
+        if not wait_for_editor_ready(self, frame, timeout):
+            self.fail(f"TinyMCE editor in frame {frame} was not ready after {timeout} seconds")
+
     def switch_and_update_editor_content(self, content):
-        """Switches to the TinyMCE editor and updates its content."""
-        self.switch_to_frame(0, 20)
-        self.sleep(1)
+        """
+        Updates the content of the TinyMCE editor.
+
+        The content is set through the TinyMCE API in a single script call and
+        read back. Set `editor_input` to "keys" to type it into the editor
+        instead, when the keystroke input itself is under test.
+        """
+        self.wait_for_editor_ready(0, 20)
+        if self.editor_input != EDITOR_INPUT_KEYS:
+            expected = editor_text(content.replace('\r\n', '\n'))
+            actual = editor_text(set_editor_content(self, content))
+            assert actual == expected, f"Editor content is {actual!r} instead of {expected!r}."
+            return
+
+        self.use_frame(0)
         self.clear("#tinymce")
-        self.update_text("#tinymce", content)
-        self.switch_to_default_content()
+        self.input_text("#tinymce", content, "editor_content")
+        self.use_frame(None)
 
     def logout(self):
         """Logs out from the application."""
+        if self.reuse_session and drop_session(self):
+            return
+
         if self.is_element_present("#user-menu-toggle"):
             self.click("#user-menu-toggle")
         else:
@@ -137,77 +160,117 @@ class BaseCreateAssigmentTest(BaseCase):
         self.click("a:contains('Log out')")
 
     def select_all_editor_content(self):
-        """Selects all content within the TinyMCE editor."""
-        self.switch_to_frame(0)
-        self.wait_for_element_visible("#tinymce")
+        """Selects all content within the TinyMCE editor, from the page without entering its frame."""
+        self.use_frame(None)
+        self.wait_for_editor_ready()
         self.execute_script(
             """
-            var editor = document.getElementById('tinymce');
-            if (document.createRange && window.getSelection) {
-                var range = document.createRange();
+            var frame = window.frames[0];
+            var editor = frame.document.getElementById('tinymce');
+            if (frame.document.createRange && frame.getSelection) {
+                var range = frame.document.createRange();
                 range.selectNodeContents(editor);
-                var sel = window.getSelection();
+                var sel = frame.getSelection();
                 sel.removeAllRanges();
                 sel.addRange(range);
             }
             """
         )
-        self.switch_to_default_content()
 
     def safe_verify_element_present(self, selector, retries=3, wait_time=1):
         """
         Safely verifies if an element is present with retry logic.
 
+        The check waits in the browser with a MutationObserver for up to
+        `retries * wait_time` seconds and returns as soon as it holds. Selectors
+        the browser cannot evaluate fall back to polling with `find_elements`,
+        following `verify_retry` until the same deadline.
+
         Args:
             selector (str): The CSS selector of the element to check.
             retries (int): The number of times to retry checking for the element.
             wait_time (int or float): The number of seconds to wait between retries.
         """
-        attempt = 0
-        while attempt < retries:
-            elements = self.find_elements(selector)
-            if len(elements) > 0:
-                return True
-            else:
-                print(f"Element not found. Retry attempt {attempt + 1} of {retries}.")
-                self.sleep(wait_time)
-                attempt += 1
-
-        # If element is still not found after all retries, assert failure
-        assert len(elements) > 0, f"Element with selector '{selector}' not found after {retries} retries."
+        observed = wait_for_selector(self, selector, True, retries * wait_time)
+        if observed is not None:
+            assert observed, f"Element with selector '{selector}' not found after {retries} retries."
+            return True
+
+        def check():
+            return len(self.find_elements(selector)) > 0
+
+        def report(number, e):
+            print(f"Element not found. Retry attempt {number}.")
+
+        held = self.verify_retry.copy(deadline=retries * wait_time, max_delay=wait_time).until(
+            check, sleep=lambda seconds: self.sleep(seconds, check), on_retry=report
+        )
+        assert held, f"Element with selector '{selector}' not found after {retries} retries."
+        return True
 
     def safe_verify_element_not_present(self, selector, retries=3, wait_time=1):
         """
         Safely verifies if an element is not present with retry logic.
 
+        The check waits in the browser with a MutationObserver for up to
+        `retries * wait_time` seconds and returns as soon as it holds. Selectors
+        the browser cannot evaluate fall back to polling with `find_elements`,
+        following `verify_retry` until the same deadline.
+
         Args:
             selector (str): The CSS selector of the element to check.
             retries (int): The number of times to retry checking for the element.
             wait_time (int or float): The number of seconds to wait between retries.
         """
-        attempt = 0
-        while attempt < retries:
-            elements = self.find_elements(selector)
-            if len(elements) == 0:
-                return True
-            else:
-                print(f"Element still found. Retry attempt {attempt + 1} of {retries}.")
-                self.sleep(wait_time)
-                attempt += 1
-
-        # If element is still found after all retries, assert failure
-        assert len(elements) == 0, f"Element with selector '{selector}' still present after {retries} retries."
+        observed = wait_for_selector(self, selector, False, retries * wait_time)
+        if observed is not None:
+            assert observed, f"Element with selector '{selector}' still present after {retries} retries."
+            return True
+
+        def check():
+            return len(self.find_elements(selector)) == 0
+
+        def report(number, e):
+            print(f"Element still found. Retry attempt {number}.")
+
+        held = self.verify_retry.copy(deadline=retries * wait_time, max_delay=wait_time).until(
+            check, sleep=lambda seconds: self.sleep(seconds, check), on_retry=report
+        )
+        assert held, f"Element with selector '{selector}' still present after {retries} retries."
+        return True
+
+    def verify_elements(self, checks, timeout=3):
+        """
+        Verifies several elements, in the page and in iframes, in one round trip.
+
+        Args:
+            checks (list): (frame, selector, expected) tuples. `frame` is the iframe
+                index or None for the page, `expected` is True if the element must be
+                present and False if it must be absent.
+            timeout (int or float): The number of seconds to wait for all expectations.
+
+        Returns:
+            dict: Maps each (frame, selector) to whether the element was present.
+        """
+        self.use_frame(None)
+        presence = batch_verify(self, checks, timeout)
+        failures = describe_failures(checks, presence)
+        assert not failures, failures
+        return presence
 
     def create_course(self):
-        """Test Course Creation with Login/Logout."""
+        """Test Course Creation with Login/Logout, or through the web services when the site has a token."""
         url = "https://sandbox.moodledemo.net/"
         username = 'admin'
         password = 'sandbox24'
 
+        if self.ensure_course_with_api(url):
+            return
+
         # Open the course site and log in
         self.open_page_with_retries(url)
         self.set_window_size(1550, 878)
-        self.sleep(1)
+        self.wait_for_ready_state_complete()
 
         self.login(username, password)
 
@@ -231,17 +294,54 @@ class BaseCreateAssigmentTest(BaseCase):
 
         self.logout()
 
+    def ensure_course_with_api(self, url="https://sandbox.moodledemo.net/"):
+        """
+        Creates the course through the Moodle web services if it does not exist,
+        when the site has a token (`--moodle-token` or `--standin`).
+
+        Returns:
+            bool: True if the course exists now, False to set it up through the UI.
+        """
+        api = site.api(url)
+        if api is None:
+            return False
+        try:
+            _, created = api.ensure_course(self.course_name, self.course_name, f"{self.course_name}-001")
+        except MoodleApiError as e:
+            print(f"Could not set up the course through the web services, using the UI: {e}")
+            return False
+        if created:
+            print(f"Created course {self.course_name} through the web services.")
+        return True
+
     def create_assignment(self, assignment_name, description, show_description,
                           enable_allow_submissions_from, allow_submissions_from_minute,
                           allow_submissions_from_hour, enable_online_text_submission):
         """Create an assignment using helper functions."""
         self.open_course("L01.25-Q")
+        existing = assignment_ids(self)
         self.enter_edit_mode_and_add_assignment()
-        self.set_assignment_details(assignment_name, description, show_description)
-        self.configure_submission_time(enable_allow_submissions_from,
-                                       allow_submissions_from_minute, allow_submissions_from_hour)
-        self.configure_online_text_submission(enable_online_text_submission)
+        if self.form_input == FORM_INPUT_INTERACTIVE:
+            self.set_assignment_details(assignment_name, description, show_description)
+            self.configure_submission_time(enable_allow_submissions_from,
+                                           allow_submissions_from_minute, allow_submissions_from_hour)
+            self.configure_online_text_submission(enable_online_text_submission)
+        else:
+            self.fill_assignment_form({
+                'name': assignment_name,
+                'description': description,
+                'show_description': show_description,
+                'allow_submissions_from': enable_allow_submissions_from,
+                'allow_submissions_from_minute': allow_submissions_from_minute,
+                'allow_submissions_from_hour': allow_submissions_from_hour,
+                'online_text': enable_online_text_submission,
+            })
+            self.verify_submission_time(enable_allow_submissions_from)
+            self.verify_online_text_submission(enable_online_text_submission)
         self.click("#id_submitbutton2")
+        # The new assignments on the course page, deleted at the end of the session unless --keep-assignments.
+        created = [cmid for cmid, name in assignment_ids(self).items() if name == assignment_name and cmid not in existing]
+        created_assignments.add("https://sandbox.moodledemo.net/", self.course_name, created)
 
     def open_course(self, course_name):
         """Navigates to the specified course."""
@@ -256,34 +356,73 @@ class BaseCreateAssigmentTest(BaseCase):
 
     def set_assignment_details(self, assignment_name, description, show_description):
         """Sets the name and description for the assignment."""
-        self.update_text("#id_name", assignment_name)
+        self.input_text("#id_name", assignment_name, "assignment_name")
         if show_description:
             self.click("#id_showdescription")
         self.enter_description_in_editor(description)
 
+    def fill_assignment_form(self, values):
+        """
+        Fills the assignment form in one script call instead of field by field.
+
+        Text fields and selects get input and change events, checkboxes are
+        clicked when they must change, so the form reacts like to the
+        interactive path. The day of "Allow submissions from" is left as the
+        form proposes it instead of being picked in the calendar popup.
+
+        Args:
+            values (dict): `name`, `description`, `show_description`,
+                `allow_submissions_from` (enabled), `allow_submissions_from_minute`,
+                `allow_submissions_from_hour` and `online_text` (enabled).
+        """
+        self.wait_for_editor_ready()
+        fields = [
+            ('text', "#id_name", str(values['name'])),
+            ('checkbox', "#id_showdescription", bool(values['show_description'])),
+            ('editor', 0, str(values['description'])),
+            ('checkbox', "#id_allowsubmissionsfromdate_enabled", bool(values['allow_submissions_from'])),
+        ]
+        if values['allow_submissions_from']:
+            fields.append(('select', "#id_allowsubmissionsfromdate_minute", str(values['allow_submissions_from_minute'])))
+            fields.append(('select', "#id_allowsubmissionsfromdate_hour", str(values['allow_submissions_from_hour'])))
+        fields.append(('checkbox', "#id_assignsubmission_onlinetext_enabled", bool(values['online_text'])))
+        problems = fill_form(self, fields)
+        assert not problems, f"Could not fill the assignment form: {', '.join(problems)}"
+
     def enter_description_in_editor(self, description):
         """Interacts with TinyMCE editor to set the description."""
-        self.switch_to_frame(0)
-        self.update_text("#tinymce", description)
-        self.switch_to_default_content()
+        self.wait_for_editor_ready()
+        self.use_frame(0)
+        self.input_text("#tinymce", description, "description")
+        self.use_frame(None)
 
     def configure_submission_time(self, enable_allow_submissions_from,
                                   allow_submissions_from_minute, allow_submissions_from_hour):
         """Configures the submission time settings."""
         if enable_allow_submissions_from:
             self.click("#id_allowsubmissionsfromdate_calendar .icon")
-            self.sleep(1)
+            self.sleep(1, lambda: self.is_element_visible(".yui3-calendar-row:nth-of-type(2) :last-child"))
             self.click(".yui3-calendar-row:nth-of-type(2) :last-child")
             self.select_option_by_text("#id_allowsubmissionsfromdate_minute", allow_submissions_from_minute)
             self.select_option_by_text("#id_allowsubmissionsfromdate_hour", allow_submissions_from_hour)
         else:
             self.click("#id_allowsubmissionsfromdate_enabled")
+        self.verify_submission_time(enable_allow_submissions_from)
+
+    def verify_submission_time(self, enable_allow_submissions_from):
+        """Verifies the submission time settings are disabled when they should be."""
+        if not enable_allow_submissions_from:
             self.safe_verify_element_present('#id_allowsubmissionsfromdate_calendar.disabled')
 
     def configure_online_text_submission(self, enable_online_text_submission):
         """Configures online text submission settings."""
         if enable_online_text_submission:
             self.click("#id_assignsubmission_onlinetext_enabled")
+        self.verify_online_text_submission(enable_online_text_submission)
+
+    def verify_online_text_submission(self, enable_online_text_submission):
+        """Verifies the word limit of online text submissions shows only when they are enabled."""
+        if enable_online_text_submission:
             self.safe_verify_element_present("//*[@id='fgroup_id_assignsubmission_onlinetext_wordlimit_group_label']")
         else:
             self.safe_verify_element_present('//*[@data-groupname="assignsubmission_onlinetext_wordlimit_group" and contains(@style, "display: none;")]')
@@ -295,7 +434,7 @@ class BaseCreateAssigmentTest(BaseCase):
         activities[-1].click() # Assume the last activity is the newest assignment
 
         delete_buttons = self.find_elements("#action-menu-5-menu > a:nth-child(9)")
-        self.sleep(1)
+        self.sleep(1, lambda: self.is_element_visible("#action-menu-5-menu > a:nth-child(9)"))
         if delete_buttons:
             delete_buttons[0].click()
-        self.sleep(1)  # Ensure deletion has occurred
\ No newline at end of file
+        self.sleep(1, lambda: len(self.find_elements(".activity-grid .activity-actions")) < len(activities))  # Ensure deletion has occurred
\ No newline at end of file
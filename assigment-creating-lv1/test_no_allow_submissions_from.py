@@ -1,38 +1,31 @@
 from base_create_assignment_test import BaseCreateAssigmentTest
+from harness.rows import csv_rows
 
 
 class TestNoAllowSubmissionsFrom(BaseCreateAssigmentTest):
-    def test_no_allow_submissions_from(self):
+    @csv_rows('test_no_allow_submissions_from.csv')
+    def test_no_allow_submissions_from(self, row):
         """Main test function to run the align center test."""
 
-        data = self.read_data_from_csv('test_no_allow_submissions_from.csv')
+        username = row['username']
+        password = row['password']
+        assignment_name = row['assignment_name']
+        description = row['description']
+        show_description = row['show_description']
+        enable_allow_submissions_from = row['enable_allow_submissions_from']
+        allow_submissions_from_minute = row['allow_submissions_from_minute']
+        allow_submissions_from_hour = row['allow_submissions_from_hour']
+        enable_online_text_submission = row['enable_online_text_submission']
+        self.form_input = row.get('form_input', self.form_input)
 
-        # Assuming only one row of credentials in the CSV for this test scenario
-        for row in data:
-            username = row['username']
-            password = row['password']
-            assignment_name = row['assignment_name']
-            description = row['description']
-            show_description = row['show_description']
-            enable_allow_submissions_from = row['enable_allow_submissions_from']
-            allow_submissions_from_minute = row['allow_submissions_from_minute']
-            allow_submissions_from_hour = row['allow_submissions_from_hour']
-            enable_online_text_submission = row['enable_online_text_submission']
-            skip_test = row.get('_skip_', False)
+        self.login(username, password)
 
-            # Skip processing if this row is marked to skip
-            if skip_test:
-                print(f"Skipping test for username: {username}")
-                continue
+        self.create_assignment(
+            assignment_name, description, show_description,
+            enable_allow_submissions_from, allow_submissions_from_minute, allow_submissions_from_hour,
+            enable_online_text_submission
+        )
 
-            self.login(username, password)
+        self.assert_element(f'[data-value="{assignment_name}"]')
 
-            self.create_assignment(
-                assignment_name, description, show_description,
-                enable_allow_submissions_from, allow_submissions_from_minute, allow_submissions_from_hour,
-                enable_online_text_submission
-            )
-
-            self.assert_element(f'[data-value="{assignment_name}"]')
-
-            self.logout()
\ No newline at end of file
+        self.logout()
\ No newline at end of file
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Make the shared `harness` package importable when running from this directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest_plugins = ['harness.plugin']
@@ -1,10 +1,35 @@
-import csv
-import re
 from seleniumbase import BaseCase
 from selenium.common.exceptions import WebDriverException, NoSuchElementException
-
-class CreateAssigmentTest(BaseCase):
+from harness import planner
+from harness.cleanup import AssignmentCleanupMixin, assignment_ids, created_assignments
+from harness.commands import CommandCountingMixin
+from harness.data import TYPED_SCHEMA, iter_rows, load_rows
+from harness.editor import (
+    EDITOR_INPUT_API, EDITOR_INPUT_KEYS, editor_text, set_editor_content, wait_for_editor_ready,
+)
+from harness.forms import FORM_INPUT_INTERACTIVE, FORM_INPUT_SCRIPT, fill_form
+from harness.frames import FrameTrackingMixin
+from harness.pool import BrowserPoolMixin
+from harness.provision import MoodleApiError
+from harness.retry import CircuitOpenError, RetryPolicy, site_breaker
+from harness.rows import csv_rows, expand_csv_rows
+from harness.session import drop_session, restore_session, save_session
+from harness.site import site
+from harness.sleeps import SleepProfilingMixin
+from harness.textinput import TextInputMixin
+from harness.timing import PhaseTimingMixin
+from harness.waits import batch_verify, describe_failures, wait_for_selector
+
+class CreateAssigmentTest(PhaseTimingMixin, CommandCountingMixin, SleepProfilingMixin, TextInputMixin, AssignmentCleanupMixin, BrowserPoolMixin, FrameTrackingMixin, BaseCase):
     """Test create assignment by single csv data file."""
+    reuse_session = True
+    editor_input = EDITOR_INPUT_API
+    form_input = FORM_INPUT_SCRIPT
+    open_retry = RetryPolicy(attempts=3, delay=1, backoff=2, deadline=60, retry_on=(WebDriverException,))
+    login_retry = RetryPolicy(attempts=3, delay=1, backoff=2, retry_on=(WebDriverException,))
+    verify_retry = RetryPolicy(attempts=None, delay=0.1, backoff=2, jitter=0, retry_on=(WebDriverException,))
+    start_page_sel = None
+    course_name = "L01.25-Q"
     username_sel = "#username"
     password_sel = "#password"
     login_btn_sel = "#loginbtn"
@@ -17,119 +42,119 @@ class CreateAssigmentTest(BaseCase):
     enable_online_text_submission_sel = "#id_assignsubmission_onlinetext_enabled1"
     url = "https://sandbox.moodledemo.net/"
 
-    def read_data_from_csv(self, filename):
-        """Reads data from a CSV file and processes escape sequences."""
-        data = []
-
-        # Regular expression to match escape sequences
-        escape_sequence_re = re.compile(r'\\.')
-
-        def unescape(match):
-            """Converts escape sequences to their intended characters."""
-            seq = match.group(0)
-            if seq == r'\\':
-                return '\\'
-            elif seq == r'\n':
-                return '\n'
-            elif seq == r'\t':
-                return '\t'
-            elif seq == r'\"':
-                return '\"'
-            elif seq == r'\'':
-                return '\''
-            # Add more cases for different escape sequences if necessary
-            return seq  # Returns unchanged if not a recognized escape
-
-        def convert_value(value):
-            """Tries to convert the string to a boolean, int, or float."""
-            if (value.startswith("'") and value.endswith("'")) or (value.startswith('"') and value.endswith('"')):
-                return value.strip("'\"")
-
-            # Handle booleans
-            if value.lower() == 'true':
-                return True
-            elif value.lower() == 'false':
-                return False
-
-            # Handle numbers
-            try:
-                int_value = int(value)
-                return int_value
-            except ValueError:
-                pass
-
-            try:
-                float_value = float(value)
-                return float_value
-            except ValueError:
-                pass
-
-            return value
-
-        # Open the CSV file
-        with open(filename, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                processed_row = {
-                    key: convert_value(escape_sequence_re.sub(unescape, value))
-                    for key, value in row.items()
-                }
-                data.append(processed_row)
-
-        return data
+    @classmethod
+    def read_data_from_csv(cls, filename):
+        """Reads data from a CSV file and processes escape sequences, converting booleans and numbers."""
+        return load_rows(filename, TYPED_SCHEMA)
+
+    @classmethod
+    def stream_data_from_csv(cls, filename):
+        """Yields the rows of a CSV file while reading it, converted like `read_data_from_csv`."""
+        return iter_rows(filename, TYPED_SCHEMA)
 
     def open_page_with_retries(self, url, max_retries=3):
-        """Attempts to open a page, retries up to max_retries times if it fails."""
-        retry_count = 0
-        success = False
-
-        while not success and retry_count < max_retries:
-            try:
-                self.open(url)
-                success = True
-            except WebDriverException as e:
-                retry_count += 1
-                print(f"Attempt {retry_count} of {max_retries} failed: {e}")
-                self.sleep(2)  # Wait before retrying
-
-        if not success:
+        """
+        Attempts to open a page, retries up to max_retries times if it fails.
+
+        Retries follow `open_retry`. Once the site failed several opens in a
+        row, its circuit breaker makes the next opens fail immediately.
+
+        Sandbox URLs are moved to the site chosen with `--moodle-url` or `--standin`.
+        """
+        url = site.resolve(url)
+
+        def report(number, e):
+            print(f"Attempt {number} of {max_retries} failed: {e}")
+
+        try:
+            self.open_retry.copy(attempts=max_retries).call(
+                lambda: self.open(url), sleep=self.sleep, on_retry=report, breaker=site_breaker(url)
+            )
+        except CircuitOpenError as e:
+            self.fail(f"Failed to open the page {url}, the site looks down: {e}")
+        except WebDriverException:
             self.fail(f"Failed to open the page {url} after {max_retries} attempts")
 
     def login(self, username, password, max_retries=3):
-        """Logs into the application with provided username and password."""
-        retry_count = 0
-        logged_in = False
+        """
+        Logs into the application with provided username and password.
+
+        When `reuse_session` is set, a session cached by an earlier login of
+        the same user in this worker is restored instead of using the form.
+        Failed form submissions are retried following `login_retry`.
+        """
+        if self.reuse_session and restore_session(self, username):
+            return
 
         # self.sleep(2) # Wait for the page to load before attempting to log in
 
         self.click(".usermenu .login a")
-        while retry_count < max_retries and not logged_in:
-                self.clear(self.username_sel)
-                self.update_text(self.username_sel, username)
-                self.clear(self.password_sel)
-                self.update_text(self.password_sel, password)
-                self.click(self.login_btn_sel)
-
-                if self.is_element_visible(".userinitials"):
-                    logged_in = True
-                else:
-                    retry_count += 1
-                    print(f"Login attempt {retry_count} failed. Retrying...")
-                    self.sleep(2)  # Wait before retrying
+
+        def attempt():
+            self.clear(self.username_sel)
+            self.input_text(self.username_sel, username, "login")
+            self.clear(self.password_sel)
+            self.input_text(self.password_sel, password, "login")
+            self.click(self.login_btn_sel)
+            return self.is_element_visible(".userinitials")
+
+        def report(number, e):
+            print(f"Login attempt {number} failed. Retrying...")
+
+        logged_in = self.login_retry.copy(attempts=max_retries).until(
+            attempt,
+            sleep=lambda seconds: self.sleep(seconds, lambda: self.is_element_visible(".userinitials")),
+            on_retry=report,
+        )
 
         if not logged_in:
             self.fail("Failed to log in after multiple attempts")
 
+        if self.reuse_session:
+            save_session(self, username)
+
+    def start_row(self, url, username, password):
+        """Opens the site, logs in and goes to the start page, sharing the prefix of the previous row of the same group."""
+        planner.start_row(self, url, username, password, self.start_page_sel)
+
+    def finish_row(self):
+        """Logs out unless the next row can reuse the prefix of this row."""
+        planner.finish_row(self)
+
+    def keep_browser_state(self, driver):
+        """Keeps the pooled browser logged in when the next row shares the prefix of this row."""
+        return planner.keep_row_state(driver)
+
+    def wait_for_editor_ready(self, frame=0, timeout=20):
+        """Waits until the TinyMCE editor in iframe `frame` is initialized and editable."""
+        if not wait_for_editor_ready(self, frame, timeout):
+            self.fail(f"TinyMCE editor in frame {frame} was not ready after {timeout} seconds")
+
     def switch_and_update_editor_content(self, content):
-        """Switches to the TinyMCE editor and updates its content."""
-        self.switch_to_frame(0, 20)
-        self.sleep(1)
+        """
+        Updates the content of the TinyMCE editor.
+
+        The content is set through the TinyMCE API in a single script call and
+        read back. Set `editor_input` to "keys" to type it into the editor
+        instead, when the keystroke input itself is under test.
+        """
+        self.wait_for_editor_ready(0, 20)
+        if self.editor_input != EDITOR_INPUT_KEYS:
+            expected = editor_text(content.replace('\r\n', '\n'))
+            actual = editor_text(set_editor_content(self, content))
+            assert actual == expected, f"Editor content is {actual!r} instead of {expected!r}."
+            return
+
+        self.use_frame(0)
         self.clear("#tinymce")
-        self.update_text("#tinymce", content)
-        self.switch_to_default_content()
+        self.input_text("#tinymce", content, "editor_content")
+        self.use_frame(None)
 
     def logout(self):
         """Logs out from the application."""
+        if self.reuse_session and drop_session(self):
+            return
+
         if self.is_element_present("#user-menu-toggle"):
             self.click("#user-menu-toggle")
         else:
@@ -138,66 +163,103 @@ class CreateAssigmentTest(BaseCase):
         self.click("a:contains('Log out')")
 
     def select_all_editor_content(self):
-        """Selects all content within the TinyMCE editor."""
-        self.switch_to_frame(0)
-        self.wait_for_element_visible("#tinymce")
+        """Selects all content within the TinyMCE editor, from the page without entering its frame."""
+        self.use_frame(None)
+        self.wait_for_editor_ready()
         self.execute_script(
             """
-            var editor = document.getElementById('tinymce');
-            if (document.createRange && window.getSelection) {
-                var range = document.createRange();
+            var frame = window.frames[0];
+            var editor = frame.document.getElementById('tinymce');
+            if (frame.document.createRange && frame.getSelection) {
+                var range = frame.document.createRange();
                 range.selectNodeContents(editor);
-                var sel = window.getSelection();
+                var sel = frame.getSelection();
                 sel.removeAllRanges();
                 sel.addRange(range);
             }
             """
         )
-        self.switch_to_default_content()
 
     def safe_verify_element_present(self, selector, retries=3, wait_time=1):
         """
         Safely verifies if an element is present with retry logic.
 
+        The check waits in the browser with a MutationObserver for up to
+        `retries * wait_time` seconds and returns as soon as it holds. Selectors
+        the browser cannot evaluate fall back to polling with `find_elements`,
+        following `verify_retry` until the same deadline.
+
         Args:
             selector (str): The CSS selector of the element to check.
             retries (int): The number of times to retry checking for the element.
             wait_time (int or float): The number of seconds to wait between retries.
         """
-        attempt = 0
-        while attempt < retries:
-            elements = self.find_elements(selector)
-            if len(elements) > 0:
-                return True
-            else:
-                print(f"Element not found. Retry attempt {attempt + 1} of {retries}.")
-                self.sleep(wait_time)
-                attempt += 1
-
-        # If element is still not found after all retries, assert failure
-        assert len(elements) > 0, f"Element with selector '{selector}' not found after {retries} retries."
+        observed = wait_for_selector(self, selector, True, retries * wait_time)
+        if observed is not None:
+            assert observed, f"Element with selector '{selector}' not found after {retries} retries."
+            return True
+
+        def check():
+            return len(self.find_elements(selector)) > 0
+
+        def report(number, e):
+            print(f"Element not found. Retry attempt {number}.")
+
+        held = self.verify_retry.copy(deadline=retries * wait_time, max_delay=wait_time).until(
+            check, sleep=lambda seconds: self.sleep(seconds, check), on_retry=report
+        )
+        assert held, f"Element with selector '{selector}' not found after {retries} retries."
+        return True
 
     def safe_verify_element_not_present(self, selector, retries=3, wait_time=1):
         """
         Safely verifies if an element is not present with retry logic.
 
+        The check waits in the browser with a MutationObserver for up to
+        `retries * wait_time` seconds and returns as soon as it holds. Selectors
+        the browser cannot evaluate fall back to polling with `find_elements`,
+        following `verify_retry` until the same deadline.
+
         Args:
             selector (str): The CSS selector of the element to check.
             retries (int): The number of times to retry checking for the element.
             wait_time (int or float): The number of seconds to wait between retries.
         """
-        attempt = 0
-        while attempt < retries:
-            elements = self.find_elements(selector)
-            if len(elements) == 0:
-                return True
-            else:
-                print(f"Element still found. Retry attempt {attempt + 1} of {retries}.")
-                self.sleep(wait_time)
-                attempt += 1
-
-        # If element is still found after all retries, assert failure
-        assert len(elements) == 0, f"Element with selector '{selector}' still present after {retries} retries."
+        observed = wait_for_selector(self, selector, False, retries * wait_time)
+        if observed is not None:
+            assert observed, f"Element with selector '{selector}' still present after {retries} retries."
+            return True
+
+        def check():
+            return len(self.find_elements(selector)) == 0
+
+        def report(number, e):
+            print(f"Element still found. Retry attempt {number}.")
+
+        held = self.verify_retry.copy(deadline=retries * wait_time, max_delay=wait_time).until(
+            check, sleep=lambda seconds: self.sleep(seconds, check), on_retry=report
+        )
+        assert held, f"Element with selector '{selector}' still present after {retries} retries."
+        return True
+
+    def verify_elements(self, checks, timeout=3):
+        """
+        Verifies several elements, in the page and in iframes, in one round trip.
+
+        Args:
+            checks (list): (frame, selector, expected) tuples. `frame` is the iframe
+                index or None for the page, `expected` is True if the element must be
+                present and False if it must be absent.
+            timeout (int or float): The number of seconds to wait for all expectations.
+
+        Returns:
+            dict: Maps each (frame, selector) to whether the element was present.
+        """
+        self.use_frame(None)
+        presence = batch_verify(self, checks, timeout)
+        failures = describe_failures(checks, presence)
+        assert not failures, failures
+        return presence
 
     def create_course_if_needed(self, username= 'admin', password= 'sandbox24', url="https://sandbox.moodledemo.net", should_login=False):
         """Test Course Creation with Login/Logout."""
@@ -205,7 +267,10 @@ class CreateAssigmentTest(BaseCase):
         # Open the course site and log in
         self.open_page_with_retries(url)
         self.set_window_size(1550, 878)
-        self.sleep(1)
+        self.wait_for_ready_state_complete()
+
+        if self.ensure_course_with_api(url):
+            return
 
         if(should_login):
             self.login(username, password)
@@ -233,17 +298,54 @@ class CreateAssigmentTest(BaseCase):
         if(should_login):
             self.logout()
 
+    def ensure_course_with_api(self, url="https://sandbox.moodledemo.net/"):
+        """
+        Creates the course through the Moodle web services if it does not exist,
+        when the site has a token (`--moodle-token` or `--standin`).
+
+        Returns:
+            bool: True if the course exists now, False to set it up through the UI.
+        """
+        api = site.api(url)
+        if api is None:
+            return False
+        try:
+            _, created = api.ensure_course(self.course_name, self.course_name, f"{self.course_name}-001")
+        except MoodleApiError as e:
+            print(f"Could not set up the course through the web services, using the UI: {e}")
+            return False
+        if created:
+            print(f"Created course {self.course_name} through the web services.")
+        return True
+
     def create_assignment(self, assignment_name, description, show_description,
                           enable_allow_submissions_from, allow_submissions_from_minute,
                           allow_submissions_from_hour, enable_online_text_submission):
         """Create an assignment using helper functions."""
         self.open_course("L01.25-Q")
+        existing = assignment_ids(self)
         self.enter_edit_mode_and_add_assignment()
-        self.set_assignment_details(assignment_name, description, show_description)
-        self.configure_submission_time(enable_allow_submissions_from,
-                                       allow_submissions_from_minute, allow_submissions_from_hour)
-        self.configure_online_text_submission(enable_online_text_submission)
+        if self.form_input == FORM_INPUT_INTERACTIVE:
+            self.set_assignment_details(assignment_name, description, show_description)
+            self.configure_submission_time(enable_allow_submissions_from,
+                                           allow_submissions_from_minute, allow_submissions_from_hour)
+            self.configure_online_text_submission(enable_online_text_submission)
+        else:
+            self.fill_assignment_form({
+                'name': assignment_name,
+                'description': description,
+                'show_description': show_description,
+                'allow_submissions_from': enable_allow_submissions_from,
+                'allow_submissions_from_minute': allow_submissions_from_minute,
+                'allow_submissions_from_hour': allow_submissions_from_hour,
+                'online_text': enable_online_text_submission,
+            })
+            self.verify_submission_time(enable_allow_submissions_from)
+            self.verify_online_text_submission(enable_online_text_submission)
         self.click("#id_submitbutton2")
+        # The new assignments on the course page, deleted at the end of the session unless --keep-assignments.
+        created = [cmid for cmid, name in assignment_ids(self).items() if name == assignment_name and cmid not in existing]
+        created_assignments.add(self.url, self.course_name, created)
 
     def open_course(self, course_name):
         """Navigates to the specified course."""
@@ -258,28 +360,61 @@ class CreateAssigmentTest(BaseCase):
 
     def set_assignment_details(self, assignment_name, description, show_description):
         """Sets the name and description for the assignment."""
-        self.update_text(self.assignment_name_sel, assignment_name)
+        self.input_text(self.assignment_name_sel, assignment_name, "assignment_name")
         if show_description:
             self.click(self.show_description_sel)
         self.enter_description_in_editor(description)
 
+    def fill_assignment_form(self, values):
+        """
+        Fills the assignment form in one script call instead of field by field.
+
+        Text fields and selects get input and change events, checkboxes are
+        clicked when they must change, so the form reacts like to the
+        interactive path. The day of "Allow submissions from" is left as the
+        form proposes it instead of being picked in the calendar popup.
+
+        Args:
+            values (dict): `name`, `description`, `show_description`,
+                `allow_submissions_from` (enabled), `allow_submissions_from_minute`,
+                `allow_submissions_from_hour` and `online_text` (enabled).
+        """
+        self.wait_for_editor_ready()
+        fields = [
+            ('text', self.assignment_name_sel, str(values['name'])),
+            ('checkbox', self.show_description_sel, bool(values['show_description'])),
+            ('editor', 0, str(values['description'])),
+            ('checkbox', "#id_allowsubmissionsfromdate_enabled", bool(values['allow_submissions_from'])),
+        ]
+        if values['allow_submissions_from']:
+            fields.append(('select', self.submissions_from_minute_sel, str(values['allow_submissions_from_minute'])))
+            fields.append(('select', self.submissions_from_hour_sel, str(values['allow_submissions_from_hour'])))
+        fields.append(('checkbox', self.enable_online_text_submission_sel, bool(values['online_text'])))
+        problems = fill_form(self, fields)
+        assert not problems, f"Could not fill the assignment form: {', '.join(problems)}"
+
     def enter_description_in_editor(self, description):
         """Interacts with TinyMCE editor to set the description."""
-        self.switch_to_frame(0)
-        self.update_text(self.description_sel, description)
-        self.switch_to_default_content()
+        self.wait_for_editor_ready()
+        self.use_frame(0)
+        self.input_text(self.description_sel, description, "description")
+        self.use_frame(None)
 
     def configure_submission_time(self, enable_allow_submissions_from,
                                   allow_submissions_from_minute, allow_submissions_from_hour):
         """Configures the submission time settings."""
         if enable_allow_submissions_from:
             self.click(self.allow_submissions_from_sel)
-            self.sleep(1)
+            self.sleep(1, lambda: self.is_element_visible(".yui3-calendar-row:nth-of-type(2) :last-child"))
             self.click(".yui3-calendar-row:nth-of-type(2) :last-child")
             self.select_option_by_text(self.submissions_from_minute_sel, allow_submissions_from_minute)
-            self.select_option_by_text(self.submissions_from_minute_sel, allow_submissions_from_hour)
+            self.select_option_by_text(self.submissions_from_hour_sel, allow_submissions_from_hour)
         else:
             self.click("#id_allowsubmissionsfromdate_enabled")
+        self.verify_submission_time(enable_allow_submissions_from)
+
+    def verify_submission_time(self, enable_allow_submissions_from):
+        """Verifies the submission time settings with the selector of the row, if any."""
         if (self.assert_allow_submissions_from_sel):
             self.safe_verify_element_present(self.assert_allow_submissions_from_sel)
 
@@ -287,6 +422,10 @@ class CreateAssigmentTest(BaseCase):
         """Configures online text submission settings."""
         if enable_online_text_submission:
             self.click(self.enable_online_text_submission_sel)
+        self.verify_online_text_submission(enable_online_text_submission)
+
+    def verify_online_text_submission(self, enable_online_text_submission):
+        """Verifies the online text submission settings with the selector of the row, if any."""
         if self.online_text_submission_sel:
             self.safe_verify_element_present(self.online_text_submission_sel)
 
@@ -297,69 +436,62 @@ class CreateAssigmentTest(BaseCase):
         activities[-1].click() # Assume the last activity is the newest assignment
 
         delete_buttons = self.find_elements("#action-menu-5-menu > a:nth-child(9)")
-        self.sleep(1)
+        self.sleep(1, lambda: self.is_element_visible("#action-menu-5-menu > a:nth-child(9)"))
         if delete_buttons:
             delete_buttons[0].click()
-        self.sleep(1)  # Ensure deletion has occurred
+        self.sleep(1, lambda: len(self.find_elements(".activity-grid .activity-actions")) < len(activities))  # Ensure deletion has occurred
 
-    def test_create_assignment(self):
+    @csv_rows('test_create_assignment.csv')
+    def test_create_assignment(self, row):
         """Test function to run multiple assignment tests."""
 
-        data = self.read_data_from_csv('test_create_assignment.csv')
-
-        for idx, row in enumerate(data):
-            # Use a fallback for 'test_name' from the row dictionary
-            test_name = row.get('test_name', f'Test_{idx + 1}')
-
-            # Extracting other fields from the CSV row
-            username = row['username']
-            password = row['password']
-            assignment_name = row['assignment_name']
-            description = row['description']
-            show_description = row.get('show_description', 'False')
-            enable_allow_submissions_from = row.get('enable_allow_submissions_from', 'False')
-            allow_submissions_from_minute = row.get('allow_submissions_from_minute', '00')
-            allow_submissions_from_hour = row.get('allow_submissions_from_hour', '00')
-            enable_online_text_submission = row.get('enable_online_text_submission', 'False')
-            skip_test = row.get('_skip_', False)
-
-            self.username_sel = row.get('username_sel', self.username_sel)
-            self.password_sel = row.get('password_sel', self.password_sel)
-            self.login_btn_sel = row.get('login_btn_sel', self.login_btn_sel)
-            assert_element_sel = row.get('assert_element_sel', None)
-            self.assignment_name_sel = row.get('assignment_name_sel', self.assignment_name_sel)
-            self.description_sel = row.get('description_sel', self.description_sel)
-            self.show_description_sel = row.get('show_description_sel', self.show_description_sel)
-            self.allow_submissions_from_sel = row.get("allow_submissions_from_sel", self.allow_submissions_from_sel)
-            self.submissions_from_minute_sel = row.get("submissions_from_minute_sel", self.submissions_from_minute_sel)
-            self.submissions_from_hour_sel = row.get("submissions_from_hour_sel", self.submissions_from_hour_sel)
-            self.enable_online_text_submission_sel = row.get("enable_online_text_submission_sel", self.enable_online_text_submission_sel)
-            self.assert_allow_submissions_from_sel = row.get("assert_allow_submissions_from_sel", None)
-            self.online_text_submission_sel = row.get("online_text_submission_sel", None)
-
-            self.url = row.get("url", self.url)
-
-            if skip_test:
-                print(f"Skipping test: {test_name}\n")
-                continue
-
-            print(f"Running test: {test_name}\n")
-
-            # Open the course site and log in
-            self.open_page_with_retries(self.url)
-            self.set_window_size(1550, 878)
-            self.sleep(1)
+        # Use a fallback for 'test_name' from the row dictionary
+        test_name = row.get('test_name', self._testMethodName)
+
+        # Extracting other fields from the CSV row
+        username = row['username']
+        password = row['password']
+        assignment_name = row['assignment_name']
+        description = row['description']
+        show_description = row.get('show_description', 'False')
+        enable_allow_submissions_from = row.get('enable_allow_submissions_from', 'False')
+        allow_submissions_from_minute = row.get('allow_submissions_from_minute', '00')
+        allow_submissions_from_hour = row.get('allow_submissions_from_hour', '00')
+        enable_online_text_submission = row.get('enable_online_text_submission', 'False')
+
+        self.username_sel = row.get('username_sel', self.username_sel)
+        self.password_sel = row.get('password_sel', self.password_sel)
+        self.login_btn_sel = row.get('login_btn_sel', self.login_btn_sel)
+        assert_element_sel = row.get('assert_element_sel', None)
+        self.assignment_name_sel = row.get('assignment_name_sel', self.assignment_name_sel)
+        self.description_sel = row.get('description_sel', self.description_sel)
+        self.show_description_sel = row.get('show_description_sel', self.show_description_sel)
+        self.allow_submissions_from_sel = row.get("allow_submissions_from_sel", self.allow_submissions_from_sel)
+        self.submissions_from_minute_sel = row.get("submissions_from_minute_sel", self.submissions_from_minute_sel)
+        self.submissions_from_hour_sel = row.get("submissions_from_hour_sel", self.submissions_from_hour_sel)
+        self.enable_online_text_submission_sel = row.get("enable_online_text_submission_sel", self.enable_online_text_submission_sel)
+        self.assert_allow_submissions_from_sel = row.get("assert_allow_submissions_from_sel", None)
+        self.online_text_submission_sel = row.get("online_text_submission_sel", None)
+
+        self.url = row.get("url", self.url)
+        self.form_input = row.get('form_input', self.form_input)
+
+        print(f"Running test: {test_name}\n")
 
-            self.login(username, password)
+        # Open the course site and log in
+        self.start_row(self.url, username, password)
 
-            self.create_course_if_needed(username=username, password=password, url=self.url)
+        self.create_course_if_needed(username=username, password=password, url=self.url)
 
-            self.create_assignment(
-                assignment_name, description, show_description,
-                enable_allow_submissions_from, allow_submissions_from_minute, allow_submissions_from_hour,
-                enable_online_text_submission
-            )
+        self.create_assignment(
+            assignment_name, description, show_description,
+            enable_allow_submissions_from, allow_submissions_from_minute, allow_submissions_from_hour,
+            enable_online_text_submission
+        )
+
+        self.assert_element(assert_element_sel)
+
+        self.finish_row()
 
-            self.assert_element(assert_element_sel)
 
-            self.logout()
\ No newline at end of file
+expand_csv_rows(CreateAssigmentTest, CreateAssigmentTest.read_data_from_csv, CreateAssigmentTest.stream_data_from_csv)
@@ -1,4 +1,5 @@
 from base_editor_test import BaseEditorTest
+from harness.rows import csv_rows
 
 
 class TestAlignRight(BaseEditorTest):
@@ -15,38 +16,25 @@ class TestAlignRight(BaseEditorTest):
 
     def verify_text_alignment(self):
         """Verifies if the text in TinyMCE is righted."""
-        self.switch_to_frame(0)
+        self.use_frame(0)
         self.click("p")
         self.click("html")
         self.safe_verify_element_present('[data-id="id_s__summary"] > [style*="text-align: right;"]')
-        self.switch_to_default_content()
+        self.use_frame(None)
 
-    def test_align_right(self):
+    @csv_rows('test_align_right.csv')
+    def test_align_right(self, row):
         """Main test function to run the align right test."""
         url = "https://sandbox.moodledemo.net/"
-        data = self.read_data_from_csv('test_align_right.csv')
+        username = row['username']
+        password = row['password']
+        editor_content = row['editor_content']
+        self.editor_input = row.get('editor_input', self.editor_input)
 
-        # Assuming only one row of credentials in the CSV for this test scenario
-        for row in data:
-            username = row['username']
-            password = row['password']
-            editor_content = row['editor_content']
-            skip_test = row.get('_skip_', 'False').lower() == 'true'
+        self.start_row(url, username, password)
 
-            # Skip processing if this row is marked to skip
-            if skip_test:
-                print(f"Skipping test for username: {username}")
-                continue
+        self.switch_and_update_editor_content(editor_content)
+        self.align_text_right()
+        self.verify_text_alignment()
 
-            self.open_page_with_retries(url)
-            self.set_window_size(1550, 878)
-            self.sleep(1)
-
-            self.login(username, password)
-            self.click("a:contains('Settings')")
-
-            self.switch_and_update_editor_content(editor_content)
-            self.align_text_right()
-            self.verify_text_alignment()
-
-            self.logout()
\ No newline at end of file
+        self.finish_row()
\ No newline at end of file
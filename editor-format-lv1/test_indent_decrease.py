@@ -1,4 +1,5 @@
 from base_editor_test import BaseEditorTest
+from harness.rows import csv_rows
 
 
 class TestIndentDecrease(BaseEditorTest):
@@ -25,50 +26,38 @@ class TestIndentDecrease(BaseEditorTest):
             self.click(align_button_selector)
 
     def verify_indent_increase_text(self):
-        self.switch_to_frame(0)
+        self.use_frame(0)
         self.click("p")
         self.click("html")
         """Verifies if the text in TinyMCE is righted."""
         self.safe_verify_element_present('[data-id="id_s__summary"] > [style*="padding-left: 40px;"]')
-        self.switch_to_default_content()
+        self.use_frame(None)
 
     def verify_indent_decrease_text(self):
-        self.switch_to_frame(0)
+        self.use_frame(0)
         self.click("p")
         self.click("html")
         """Verifies if the text in TinyMCE is righted."""
-        # no padding
-        self.safe_verify_element_not_present('[data-id="id_s__summary"] > [style*="padding-left: 40px;"]')
-        # decrease indent button is disabled
-        self.switch_to_default_content()
-        self.safe_verify_element_present('[data-mce-name="outdent"].tox-tbtn--disabled')
-
-    def test_indent_decrease(self):
+        self.verify_elements([
+            # no padding
+            (0, '[data-id="id_s__summary"] > [style*="padding-left: 40px;"]', False),
+            # decrease indent button is disabled
+            (None, '[data-mce-name="outdent"].tox-tbtn--disabled', True),
+        ])
+
+    @csv_rows('test_indent_decrease.csv')
+    def test_indent_decrease(self, row):
         """Main test function to run the align right test."""
         url = "https://sandbox.moodledemo.net/"
-        data = self.read_data_from_csv('test_indent_decrease.csv')
-
-        # Assuming only one row of credentials in the CSV for this test scenario
-        for row in data:
-            username = row['username']
-            password = row['password']
-            editor_content = row['editor_content']
-            skip_test = row.get('_skip_', 'False').lower() == 'true'
-
-            # Skip processing if this row is marked to skip
-            if skip_test:
-                print(f"Skipping test for username: {username}")
-                continue
-
-            self.open_page_with_retries(url)
-            self.set_window_size(1550, 878)
-            self.sleep(1)
+        username = row['username']
+        password = row['password']
+        editor_content = row['editor_content']
+        self.editor_input = row.get('editor_input', self.editor_input)
 
-            self.login(username, password)
-            self.click("a:contains('Settings')")
+        self.start_row(url, username, password)
 
-            self.switch_and_update_editor_content(editor_content)
-            self.indent_decrease_text()
-            self.verify_indent_decrease_text()
+        self.switch_and_update_editor_content(editor_content)
+        self.indent_decrease_text()
+        self.verify_indent_decrease_text()
 
-            self.logout()
\ No newline at end of file
+        self.finish_row()
\ No newline at end of file
@@ -1,101 +1,153 @@
-import csv
-import re
 from seleniumbase import BaseCase
 from selenium.common.exceptions import WebDriverException, NoSuchElementException
-
-class BaseEditorTest(BaseCase):
+from harness import planner
+from harness.commands import CommandCountingMixin
+from harness.data import TEXT_SCHEMA, iter_rows, load_rows
+from harness.editor import (
+    EDITOR_INPUT_API, EDITOR_INPUT_KEYS, editor_text, set_editor_content, wait_for_editor_ready,
+)
+from harness.frames import FrameTrackingMixin
+from harness.pool import BrowserPoolMixin
+from harness.retry import CircuitOpenError, RetryPolicy, site_breaker
+from harness.rows import expand_csv_rows
+from harness.session import drop_session, restore_session, save_session
+from harness.site import site
+from harness.sleeps import SleepProfilingMixin
+from harness.textinput import TextInputMixin
+from harness.timing import PhaseTimingMixin
+from harness.waits import batch_verify, describe_failures, wait_for_selector
+
+class BaseEditorTest(PhaseTimingMixin, CommandCountingMixin, SleepProfilingMixin, TextInputMixin, BrowserPoolMixin, FrameTrackingMixin, BaseCase):
     """Base class for tests involving editor interactions and authentication."""
+    reuse_session = True
+    editor_input = EDITOR_INPUT_API
+    open_retry = RetryPolicy(attempts=3, delay=1, backoff=2, deadline=60, retry_on=(WebDriverException,))
+    login_retry = RetryPolicy(attempts=3, delay=1, backoff=2, retry_on=(WebDriverException,))
+    verify_retry = RetryPolicy(attempts=None, delay=0.1, backoff=2, jitter=0, retry_on=(WebDriverException,))
+    url = "https://sandbox.moodledemo.net/"
+    start_page_sel = "a:contains('Settings')"
     username_sel = "#username"
     password_sel = "#password"
     login_btn_sel = "#loginbtn"
 
-    def read_data_from_csv(self, filename):
-        """Reads data from a CSV file and processes escape sequences."""
-        data = []
-
-        # Regular expression to match escape sequences
-        escape_sequence_re = re.compile(r'\\.')
-
-        def unescape(match):
-            """Converts escape sequences to their intended characters."""
-            seq = match.group(0)
-            if seq == r'\\':
-                return '\\'
-            elif seq == r'\n':
-                return '\n'
-            elif seq == r'\t':
-                return '\t'
-            elif seq == r'\"':
-                return '\"'
-            elif seq == r'\'':
-                return '\''
-            # Add more cases for different escape sequences if necessary
-            return seq  # Returns unchanged if not a recognized escape
-
-        # Open the CSV file
-        with open(filename, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                processed_row = {
-                    key: escape_sequence_re.sub(unescape, value.strip("'"))
-                    for key, value in row.items()
-                }
-                data.append(processed_row)
-
-        return data
+    def __init_subclass__(cls, **kwargs):
+        """Expands `csv_rows` test methods into one test per CSV row."""
+        super().__init_subclass__(**kwargs)
+        expand_csv_rows(cls, cls.read_data_from_csv, cls.stream_data_from_csv)
+
+    @classmethod
+    def read_data_from_csv(cls, filename):
+        """Reads data from a CSV file and processes escape sequences, stripping the quotes around values."""
+        return load_rows(filename, TEXT_SCHEMA)
+
+    @classmethod
+    def stream_data_from_csv(cls, filename):
+        """Yields the rows of a CSV file while reading it, converted like `read_data_from_csv`."""
+        return iter_rows(filename, TEXT_SCHEMA)
 
     def open_page_with_retries(self, url, max_retries=3):
-        """Attempts to open a page, retries up to max_retries times if it fails."""
-        retry_count = 0
-        success = False
-
-        while not success and retry_count < max_retries:
-            try:
-                self.open(url)
-                success = True
-            except WebDriverException as e:
-                retry_count += 1
-                print(f"Attempt {retry_count} of {max_retries} failed: {e}")
-                self.sleep(2)  # Wait before retrying
-
-        if not success:
+        """
+        Attempts to open a page, retries up to max_retries times if it fails.
+
+        Retries follow `open_retry`. Once the site failed several opens in a
+        row, its circuit breaker makes the next opens fail immediately.
+
+        Sandbox URLs are moved to the site chosen with `--moodle-url` or `--standin`.
+        """
+        url = site.resolve(url)
+
+        def report(number, e):
+            print(f"Attempt {number} of {max_retries} failed: {e}")
+
+        try:
+            self.open_retry.copy(attempts=max_retries).call(
+                lambda: self.open(url), sleep=self.sleep, on_retry=report, breaker=site_breaker(url)
+            )
+        except CircuitOpenError as e:
+            self.fail(f"Failed to open the page {url}, the site looks down: {e}")
+        except WebDriverException:
             self.fail(f"Failed to open the page {url} after {max_retries} attempts")
 
     def login(self, username, password, max_retries=3):
-        """Logs into the application with provided username and password."""
-        retry_count = 0
-        logged_in = False
+        """
+        Logs into the application with provided username and password.
+
+        When `reuse_session` is set, a session cached by an earlier login of
+        the same user in this worker is restored instead of using the form.
+        Failed form submissions are retried following `login_retry`.
+        """
+        if self.reuse_session and restore_session(self, username):
+            return
 
         # self.sleep(2) # Wait for the page to load before attempting to log in
 
         self.click(".usermenu .login a")
-        while retry_count < max_retries and not logged_in:
-                self.clear(self.username_sel)
-                self.update_text(self.username_sel, username)
-                self.clear(self.password_sel)
-                self.update_text(self.password_sel, password)
-                self.click(self.login_btn_sel)
-
-                if self.is_element_visible(".userinitials"):
-                    logged_in = True
-                else:
-                    retry_count += 1
-                    print(f"Login attempt {retry_count} failed. Retrying...")
-                    self.sleep(2)  # Wait before retrying
+
+        def attempt():
+            self.clear(self.username_sel)
+            self.input_text(self.username_sel, username, "login")
+            self.clear(self.password_sel)
+            self.input_text(self.password_sel, password, "login")
+            self.click(self.login_btn_sel)
+            return self.is_element_visible(".userinitials")
+
+        def report(number, e):
+            print(f"Login attempt {number} failed. Retrying...")
+
+        logged_in = self.login_retry.copy(attempts=max_retries).until(
+            attempt,
+            sleep=lambda seconds: self.sleep(seconds, lambda: self.is_element_visible(".userinitials")),
+            on_retry=report,
+        )
 
         if not logged_in:
             self.fail("Failed to log in after multiple attempts")
 
+        if self.reuse_session:
+            save_session(self, username)
+
+    def start_row(self, url, username, password):
+        """Opens the site, logs in and goes to the start page, sharing the prefix of the previous row of the same group."""
+        planner.start_row(self, url, username, password, self.start_page_sel)
+
+    def finish_row(self):
+        """Logs out unless the next row can reuse the prefix of this row."""
+        planner.finish_row(self)
+
+    def keep_browser_state(self, driver):
+        """Keeps the pooled browser logged in when the next row shares the prefix of this row."""
+        return planner.keep_row_state(driver)
+
+    def wait_for_editor_ready(self, frame=0, timeout=20):
+        """Waits until the TinyMCE editor in iframe `frame` is initialized and editable."""
+        if not wait_for_editor_ready(self, frame, timeout):
+            self.fail(f"TinyMCE editor in frame {frame} was not ready after {timeout} seconds")
+
     def switch_and_update_editor_content(self, content):
-        """Switches to the TinyMCE editor and updates its content."""
-        self.switch_to_frame(0, 20)
-        self.sleep(1)
+        """
+        Updates the content of the TinyMCE editor.
+
+        The content is set through the TinyMCE API in a single script call and
+        read back. Set `editor_input` to "keys" to type it into the editor
+        instead, when the keystroke input itself is under test.
+        """
+        self.wait_for_editor_ready(0, 20)
+        if self.editor_input != EDITOR_INPUT_KEYS:
+            expected = editor_text(content.replace('\r\n', '\n'))
+            actual = editor_text(set_editor_content(self, content))
+            assert actual == expected, f"Editor content is {actual!r} instead of {expected!r}."
+            return
+
+        self.use_frame(0)
         self.clear("#tinymce")
-        self.update_text("#tinymce", content)
-        self.switch_to_default_content()
+        self.input_text("#tinymce", content, "editor_content")
+        self.use_frame(None)
 
     def logout(self):
         """Logs out from the application."""
+        if self.reuse_session and drop_session(self):
+            return
+
         if self.is_element_present("#user-menu-toggle"):
             self.click("#user-menu-toggle")
         else:
@@ -103,63 +155,100 @@ class BaseEditorTest(BaseCase):
         self.click("a:contains('Log out')")
 
     def select_all_editor_content(self):
-        """Selects all content within the TinyMCE editor."""
-        self.switch_to_frame(0)
-        self.wait_for_element_visible("#tinymce")
+        """Selects all content within the TinyMCE editor, from the page without entering its frame."""
+        self.use_frame(None)
+        self.wait_for_editor_ready()
         self.execute_script(
             """
-            var editor = document.getElementById('tinymce');
-            if (document.createRange && window.getSelection) {
-                var range = document.createRange();
+            var frame = window.frames[0];
+            var editor = frame.document.getElementById('tinymce');
+            if (frame.document.createRange && frame.getSelection) {
+                var range = frame.document.createRange();
                 range.selectNodeContents(editor);
-                var sel = window.getSelection();
+                var sel = frame.getSelection();
                 sel.removeAllRanges();
                 sel.addRange(range);
             }
             """
         )
-        self.switch_to_default_content()
 
     def safe_verify_element_present(self, selector, retries=3, wait_time=1):
         """
         Safely verifies if an element is present with retry logic.
 
+        The check waits in the browser with a MutationObserver for up to
+        `retries * wait_time` seconds and returns as soon as it holds. Selectors
+        the browser cannot evaluate fall back to polling with `find_elements`,
+        following `verify_retry` until the same deadline.
+
         Args:
             selector (str): The CSS selector of the element to check.
             retries (int): The number of times to retry checking for the element.
             wait_time (int or float): The number of seconds to wait between retries.
         """
-        attempt = 0
-        while attempt < retries:
-            elements = self.find_elements(selector)
-            if len(elements) > 0:
-                return True
-            else:
-                print(f"Element not found. Retry attempt {attempt + 1} of {retries}.")
-                self.sleep(wait_time)
-                attempt += 1
-
-        # If element is still not found after all retries, assert failure
-        assert len(elements) > 0, f"Element with selector '{selector}' not found after {retries} retries."
+        observed = wait_for_selector(self, selector, True, retries * wait_time)
+        if observed is not None:
+            assert observed, f"Element with selector '{selector}' not found after {retries} retries."
+            return True
+
+        def check():
+            return len(self.find_elements(selector)) > 0
+
+        def report(number, e):
+            print(f"Element not found. Retry attempt {number}.")
+
+        held = self.verify_retry.copy(deadline=retries * wait_time, max_delay=wait_time).until(
+            check, sleep=lambda seconds: self.sleep(seconds, check), on_retry=report
+        )
+        assert held, f"Element with selector '{selector}' not found after {retries} retries."
+        return True
 
     def safe_verify_element_not_present(self, selector, retries=3, wait_time=1):
         """
         Safely verifies if an element is not present with retry logic.
 
+        The check waits in the browser with a MutationObserver for up to
+        `retries * wait_time` seconds and returns as soon as it holds. Selectors
+        the browser cannot evaluate fall back to polling with `find_elements`,
+        following `verify_retry` until the same deadline.
+
         Args:
             selector (str): The CSS selector of the element to check.
             retries (int): The number of times to retry checking for the element.
             wait_time (int or float): The number of seconds to wait between retries.
         """
-        attempt = 0
-        while attempt < retries:
-            elements = self.find_elements(selector)
-            if len(elements) == 0:
-                return True
-            else:
-                print(f"Element still found. Retry attempt {attempt + 1} of {retries}.")
-                self.sleep(wait_time)
-                attempt += 1
-
-        # If element is still found after all retries, assert failure
-        assert len(elements) == 0, f"Element with selector '{selector}' still present after {retries} retries."
\ No newline at end of file
+        observed = wait_for_selector(self, selector, False, retries * wait_time)
+        if observed is not None:
+            assert observed, f"Element with selector '{selector}' still present after {retries} retries."
+            return True
+
+        def check():
+            return len(self.find_elements(selector)) == 0
+
+        def report(number, e):
+            print(f"Element still found. Retry attempt {number}.")
+
+        held = self.verify_retry.copy(deadline=retries * wait_time, max_delay=wait_time).until(
+            check, sleep=lambda seconds: self.sleep(seconds, check), on_retry=report
+        )
+        assert held, f"Element with selector '{selector}' still present after {retries} retries."
+        return True
+
+    def verify_elements(self, checks, timeout=3):
+        """
+        Verifies several elements, in the page and in iframes, in one round trip.
+
+        Args:
+            checks (list): (frame, selector, expected) tuples. `frame` is the iframe
+                index or None for the page, `expected` is True if the element must be
+                present and False if it must be absent.
+            timeout (int or float): The number of seconds to wait for all expectations.
+
+        Returns:
+            dict: Maps each (frame, selector) to whether the element was present.
+        """
+        self.use_frame(None)
+        presence = batch_verify(self, checks, timeout)
+        failures = describe_failures(checks, presence)
+        assert not failures, failures
+        return presence
\ No newline at end of file
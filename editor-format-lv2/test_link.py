@@ -1,4 +1,5 @@
 from base_editor_test import BaseEditorTest
+from harness.rows import csv_rows
 
 
 class TestLink(BaseEditorTest):
@@ -18,46 +19,33 @@ class TestLink(BaseEditorTest):
         self.click(".modal-footer > .btn")
 
     def verify_link_text(self, link):
-        self.switch_to_frame(0)
+        self.use_frame(0)
         self.click("p")
         self.click("html")
         """Verifies if the text in TinyMCE is righted."""
         self.safe_verify_element_present(f'[data-id="id_s__summary"] a[href="{link}"]')
-        self.switch_to_default_content()
+        self.use_frame(None)
 
-    def test_link(self):
+    @csv_rows('test_link.csv')
+    def test_link(self, row):
         """Main test function to run the align right test."""
-        data = self.read_data_from_csv('test_link.csv')
-
-        # Assuming only one row of credentials in the CSV for this test scenario
-        for row in data:
-            url = row['url']
-            
-            username = row['username']
-            password = row['password']
-            editor_content = row['editor_content']
-            link = row['link']
-            skip_test = row.get('_skip_', 'False').lower() == 'true'
-            
-            self.username_sel = row.get('username_sel', self.username_sel)
-            self.password_sel = row.get('password_sel', self.password_sel)
-            self.login_btn_sel = row.get('login_btn_sel', self.login_btn_sel)
-            self.tiny_link_button_selector = row.get('tiny_link_button_selector', self.tiny_link_button_selector)
-
-            # Skip processing if this row is marked to skip
-            if skip_test:
-                print(f"Skipping test for username: {username}")
-                continue
-
-            self.open_page_with_retries(url)
-            self.set_window_size(1550, 878)
-            self.sleep(1)
-
-            self.login(username, password)
-            self.click("a:contains('Settings')")
-
-            self.switch_and_update_editor_content(editor_content)
-            self.link_text(link)
-            self.verify_link_text(link)
-
-            self.logout()
\ No newline at end of file
+        url = row['url']
+        
+        username = row['username']
+        password = row['password']
+        editor_content = row['editor_content']
+        self.editor_input = row.get('editor_input', self.editor_input)
+        link = row['link']
+        
+        self.username_sel = row.get('username_sel', self.username_sel)
+        self.password_sel = row.get('password_sel', self.password_sel)
+        self.login_btn_sel = row.get('login_btn_sel', self.login_btn_sel)
+        self.tiny_link_button_selector = row.get('tiny_link_button_selector', self.tiny_link_button_selector)
+
+        self.start_row(url, username, password)
+
+        self.switch_and_update_editor_content(editor_content)
+        self.link_text(link)
+        self.verify_link_text(link)
+
+        self.finish_row()
\ No newline at end of file
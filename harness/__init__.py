@@ -0,0 +1 @@
+"""Shared helpers for the data-driven Selenium suites."""
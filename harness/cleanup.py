@@ -0,0 +1,139 @@
+from harness.js import execute_async_script
+from harness.provision import MoodleApiError
+from harness.site import site
+
+# Maps the course module id of each assignment linked from the current page to its name.
+ASSIGNMENT_IDS_SCRIPT = """
+var assignments = {};
+document.querySelectorAll('a[href*="/mod/assign/view.php?id="]').forEach(function (link) {
+    var cmid = new URL(link.href, document.baseURI).searchParams.get('id');
+    var label = (link.querySelector('.instancename') || link).cloneNode(true);
+    label.querySelectorAll('.accesshide').forEach(function (hidden) { hidden.remove(); });
+    assignments[cmid] = label.textContent.trim();
+});
+return assignments;
+"""
+
+# Deletes activities by course module id with the session of the page, like
+# confirming "Delete" in the activity menu; calls back with the deleted ids.
+DELETE_ACTIVITIES_SCRIPT = """
+var cmids = arguments[0], done = arguments[arguments.length - 1];
+var config = (window.M && M.cfg) || {};
+var root = (config.wwwroot || location.origin).replace(/\\/$/, '');
+Promise.all(cmids.map(function (cmid) {
+    var query = new URLSearchParams({delete: cmid, confirm: 1, sesskey: config.sesskey || ''});
+    return fetch(root + '/course/mod.php?' + query, {credentials: 'same-origin'}).then(function (response) {
+        return response.ok ? cmid : null;
+    }, function () {
+        return null;
+    });
+})).then(function (deleted) {
+    done(deleted.filter(function (cmid) { return cmid !== null; }));
+});
+"""
+
+
+def assignment_ids(case):
+    """Returns the assignments linked from the current page (a course page) as {course module id: name}."""
+    return {int(cmid): name for cmid, name in (case.execute_script(ASSIGNMENT_IDS_SCRIPT) or {}).items()}
+
+
+class CreatedAssignments:
+    """
+    Remembers the assignments the tests created, to delete them together
+    once every test of the session is done.
+
+    Tests `add` the course module ids of their new assignments; the plugin
+    passes the ones of each test (`recent`) to the process reporting the
+    run (the pytest-xdist controller, or pytest itself without xdist) with
+    the test report, and that process alone calls `delete_all` at the end,
+    so no worker deletes an assignment another one is still checking.
+
+    Deleting goes through the Moodle web services: one lookup and one
+    `core_course_delete_modules` call per course, whatever the number of
+    assignments. That needs a web-service token (pytest `--moodle-token` or
+    `--moodle-username`); without one, each test deletes its own
+    assignments with its browser when it ends (`delete_recent_in_browser`).
+    Assignments neither way could delete are counted in `left`.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        # (site url, course short name, course module id) of the current test.
+        self.recent = []
+        # Assignments of the current test deleted with its browser.
+        self.deleted_recent = 0
+        # Maps (site url, course short name) to the ids of the created assignments.
+        self.pending = {}
+        self.deleted = 0
+        self.left = 0
+
+    def reset(self):
+        self.recent = []
+        self.deleted_recent = 0
+
+    def add(self, url, course, cmids):
+        self.recent.extend((url, course, cmid) for cmid in cmids)
+
+    def delete_recent_in_browser(self, case):
+        """
+        Deletes the assignments of the current test that no web-service
+        token can delete at the end, with the browser of `case`, in one
+        script call. Meant for the end of the test, once nothing checks them.
+        """
+        if not self.enabled:
+            return
+        in_browser = [entry for entry in self.recent if site.api(entry[0]) is None]
+        if not in_browser:
+            return
+        try:
+            deleted = set(execute_async_script(
+                case, DELETE_ACTIVITIES_SCRIPT, [cmid for _, _, cmid in in_browser], timeout=30,
+            ) or [])
+        except Exception as e:
+            print(f"Could not delete the assignments of this test with the browser: {e}")
+            return
+        self.recent = [entry for entry in self.recent if entry not in in_browser or entry[2] not in deleted]
+        self.deleted_recent += len(deleted)
+
+    def collect(self, created):
+        """Adds the assignments a test reported, from its `recent` entries."""
+        for url, course, cmid in created:
+            self.pending.setdefault((url, course), set()).add(cmid)
+
+    def delete_all(self):
+        """Deletes the assignments collected so far, in one batch per course."""
+        pending, self.pending = self.pending, {}
+        for (url, course_name), cmids in pending.items():
+            api = site.api(url)
+            if api is None:
+                self.left += len(cmids)
+                continue
+            try:
+                course = api.find_course(course_name)
+                if course is None:
+                    continue
+                # Skip the ones already gone, which Moodle would refuse as invalid.
+                existing = {assignment['cmid'] for assignment in api.course_assignments(course['id'])}
+                api.delete_modules(sorted(cmids & existing))
+                self.deleted += len(cmids & existing)
+            except MoodleApiError as e:
+                print(f"Could not delete the assignments of {course_name}: {e}")
+                self.left += len(cmids)
+
+
+created_assignments = CreatedAssignments()
+
+
+class AssignmentCleanupMixin:
+    """
+    Deletes the assignments a test created with its browser when the test
+    ends, for the sites without a web-service token to delete them at the
+    end of the session. Goes before `BrowserPoolMixin` in the bases, so the
+    browser is still there, and after `CommandCountingMixin`, so the
+    deletion stays out of the command budgets.
+    """
+
+    def tearDown(self):
+        created_assignments.delete_recent_in_browser(self)
+        super().tearDown()
@@ -0,0 +1,97 @@
+from harness.timing import phase_timer
+
+# Phase of the commands sent outside any timed phase.
+OTHER_PHASE = 'other'
+
+
+class CommandCounter:
+    """
+    Counts the WebDriver commands sent by the running test, by phase and command.
+
+    One counter lives in each test process and is reset for every test.
+    Commands are only counted while `active`, i.e. from the end of setUp
+    to the start of tearDown, so browser launch and pool resets are left out.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.counts = {}
+
+    def reset(self):
+        self.active = False
+        self.counts = {}
+
+    def record(self, command):
+        if not self.active:
+            return
+        by_command = self.counts.setdefault(phase_timer.current or OTHER_PHASE, {})
+        by_command[command] = by_command.get(command, 0) + 1
+
+    @property
+    def total(self):
+        return sum(sum(by_command.values()) for by_command in self.counts.values())
+
+    def phase_total(self, phase):
+        return sum(self.counts.get(phase, {}).values())
+
+
+command_counter = CommandCounter()
+
+
+def instrument(driver):
+    """Makes `driver` report each command it sends, elements' commands included, to `command_counter`."""
+    if getattr(driver, '_counts_commands', False):
+        return
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        command_counter.record(driver_command if isinstance(driver_command, str) else 'bidi')
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    driver._counts_commands = True
+
+
+def budget_failures(counter, budget=None, phase_budgets=None):
+    """
+    Returns a message for each command budget `counter` went over.
+
+    Args:
+        budget (int): Maximum number of commands for the whole test, or None.
+        phase_budgets (dict): Maximum number of commands for each phase.
+    """
+    failures = []
+    if budget is not None and counter.total > budget:
+        failures.append(f"{counter.total} WebDriver commands, budget is {budget}")
+    for phase, phase_budget in sorted((phase_budgets or {}).items()):
+        count = counter.phase_total(phase)
+        if count > phase_budget:
+            failures.append(f"{count} WebDriver commands in phase {phase}, budget is {phase_budget}")
+    return failures
+
+
+class CommandCountingMixin:
+    """
+    Counts the WebDriver commands of seleniumbase test cases with `command_counter`.
+
+    Set `command_budget` (whole test) and/or `phase_command_budgets`
+    ({phase: count}) on a test class to fail its tests when they send more
+    commands than that.
+    """
+
+    command_budget = None
+    phase_command_budgets = None
+
+    def setUp(self):
+        super().setUp()
+        instrument(self.driver)
+        command_counter.active = True
+
+    def get_new_driver(self, *args, **kwargs):
+        driver = super().get_new_driver(*args, **kwargs)
+        instrument(driver)
+        return driver
+
+    def tearDown(self):
+        command_counter.active = False
+        super().tearDown()
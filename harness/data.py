@@ -0,0 +1,280 @@
+import csv
+import gzip
+import json
+import os
+import re
+from collections.abc import Mapping
+from contextlib import suppress
+from itertools import zip_longest
+from pathlib import Path
+
+# Bump when the parsing changes, to ignore the sidecars written before.
+LOADER_VERSION = 1
+
+ESCAPE_RE = re.compile(r'\\.')
+ESCAPES = {
+    r'\\': '\\',
+    r'\n': '\n',
+    r'\t': '\t',
+    r'\"': '"',
+    r"\'": "'",
+}
+
+
+def unescape(value):
+    """Converts escape sequences to their intended characters; unknown ones are kept."""
+    return ESCAPE_RE.sub(lambda match: ESCAPES.get(match.group(0), match.group(0)), value)
+
+
+def value_kind(value):
+    """Classifies a typed cell: 'quoted', 'bool', 'int', 'float', 'empty' or 'str'."""
+    if (value.startswith("'") and value.endswith("'")) or (value.startswith('"') and value.endswith('"')):
+        return 'quoted'
+    if value.lower() in ('true', 'false'):
+        return 'bool'
+    try:
+        int(value)
+        return 'int'
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return 'float'
+    except ValueError:
+        pass
+    return 'empty' if value == '' else 'str'
+
+
+def convert_value(value):
+    """Tries to convert the string to a boolean, int, or float; quoted strings lose their quotes."""
+    return KIND_CONVERTERS[value_kind(value)](value)
+
+
+KIND_CONVERTERS = {
+    'quoted': lambda value: value.strip("'\""),
+    'bool': lambda value: value.lower() == 'true',
+    'int': int,
+    'float': float,
+    'empty': str,
+    'str': str,
+}
+
+
+class CsvSchema:
+    """
+    How the cells of a CSV file are turned into values.
+
+    `compile` looks at every value of a column once and returns one
+    converter per column: escape sequences are only processed in columns
+    that contain a backslash and, for typed schemas, a column whose values
+    all have the same kind gets that kind's converter instead of trying
+    each conversion per cell.
+
+    Args:
+        name (str): Identifies the schema in caches.
+        strip_quotes (bool): Strip single quotes around each value before
+            unescaping (the editor suites).
+        typed (bool): Convert values to bool, int or float after unescaping
+            (the assignment suites).
+    """
+
+    def __init__(self, name, strip_quotes=False, typed=False):
+        self.name = name
+        self.strip_quotes = strip_quotes
+        self.typed = typed
+
+    def column_kind(self, values):
+        """Returns the kind shared by all values of a typed column (ignoring empty ones), or None."""
+        kinds = {value_kind(unescape(value)) for value in values} - {'empty'}
+        return kinds.pop() if len(kinds) == 1 else None
+
+    def compile(self, header, records):
+        """Returns a converter for each column of `header`, from the `records` of the file."""
+        converters = []
+        for index, _ in enumerate(header):
+            values = [record[index] for record in records]
+            converters.append(self.converter(values))
+        return converters
+
+    def converter(self, values=None):
+        """
+        Returns the converter of a column from all its `values`, or a
+        converter that handles any value when they are not known (streaming).
+        """
+        escaped = values is None or any('\\' in value for value in values)
+        steps = []
+        if self.strip_quotes:
+            steps.append(lambda value: value.strip("'"))
+        if escaped:
+            steps.append(unescape)
+        if self.typed:
+            kind = None if values is None else self.column_kind(values)
+            if kind is None:
+                steps.append(convert_value)
+            elif kind != 'str':
+                convert = KIND_CONVERTERS[kind]
+                steps.append(lambda value: convert(value) if value else value)
+        if not steps:
+            return str
+        if len(steps) == 1:
+            return steps[0]
+
+        def convert_all(value):
+            for step in steps:
+                value = step(value)
+            return value
+        return convert_all
+
+
+# The editor suites keep values as text, without their single quotes.
+TEXT_SCHEMA = CsvSchema('text', strip_quotes=True)
+# The assignment suites convert booleans and numbers.
+TYPED_SCHEMA = CsvSchema('typed', typed=True)
+
+
+class Row(Mapping):
+    """
+    One immutable CSV row: a read-only mapping from column name to value.
+
+    The rows of a file share one column index and store only a tuple of
+    values each.
+    """
+
+    __slots__ = ('_columns', '_values')
+
+    def __init__(self, columns, values):
+        self._columns = columns
+        self._values = tuple(values)
+
+    def __getitem__(self, key):
+        return self._values[self._columns[key]]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __repr__(self):
+        return f'Row({dict(self)!r})'
+
+
+def make_rows(header, value_rows):
+    columns = {key: index for index, key in enumerate(header)}
+    return tuple(Row(columns, values) for values in value_rows)
+
+
+def open_csv(path):
+    """Opens a CSV file for reading, decompressing it if its name ends with `.gz`."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', newline='')
+    return open(path, newline='')
+
+
+def fit(record, header):
+    """Pads a record with empty values or cuts it to the length of `header`."""
+    return [value if value is not None else '' for value, _ in zip_longest(record, header)][:len(header)]
+
+
+def parse_csv(path, schema):
+    """Parses a CSV file with `schema`; returns the header and the converted values of each row."""
+    with open_csv(path) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        records = [fit(record, header) for record in reader if record]
+    converters = schema.compile(header, records)
+    return header, [[convert(value) for convert, value in zip(converters, record)] for record in records]
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def sidecar_path(path, schema):
+    """Sidecars live in the `__pycache__` next to the CSV file, like compiled modules."""
+    path = Path(path)
+    return path.parent / '__pycache__' / f'{path.name}.{schema.name}.json'
+
+
+def read_sidecar(path, schema, stamp):
+    try:
+        with sidecar_path(path, schema).open() as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if cached.get('version') != LOADER_VERSION or cached.get('stamp') != stamp:
+        return None
+    return cached['header'], cached['rows']
+
+
+def write_sidecar(path, schema, stamp, header, value_rows):
+    sidecar = sidecar_path(path, schema)
+    temporary = sidecar.with_name(f'{sidecar.name}.{os.getpid()}.tmp')
+    try:
+        sidecar.parent.mkdir(exist_ok=True)
+        with temporary.open('w') as file:
+            json.dump({'version': LOADER_VERSION, 'stamp': stamp, 'header': header, 'rows': value_rows}, file)
+        # Atomic, so parallel workers never read half a sidecar.
+        os.replace(temporary, sidecar)
+    except OSError:
+        with suppress(OSError):
+            temporary.unlink()
+
+
+# Parsed files of this process, keyed by (path, schema name).
+_cache = {}
+
+
+def load_rows(path, schema):
+    """
+    Loads the rows of a CSV file, parsing it only when it changed.
+
+    Rows are cached by path and modification time in memory and in an
+    on-disk sidecar, so collecting the suites again or in another
+    pytest-xdist worker does not parse the file again.
+
+    Args:
+        path (str): The CSV file, gzip-compressed if its name ends with `.gz`.
+        schema (CsvSchema): How cells are converted.
+
+    Returns:
+        tuple: The immutable `Row` of each line.
+    """
+    path = os.path.abspath(path)
+    stamp = file_stamp(path)
+    key = (path, schema.name)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    parsed = read_sidecar(path, schema, stamp)
+    if parsed is None:
+        parsed = parse_csv(path, schema)
+        write_sidecar(path, schema, stamp, *parsed)
+    rows = make_rows(*parsed)
+    _cache[key] = (stamp, rows)
+    return rows
+
+
+def iter_rows(path, schema):
+    """
+    Yields the rows of a CSV file one at a time, while reading it.
+
+    Unlike `load_rows`, nothing is cached and the file is never held in
+    memory as a whole, so very large (or `.gz` compressed) files can drive
+    tests whose first rows run before the file is fully read. Cells are
+    converted one by one, with the same results as `load_rows`.
+
+    Args:
+        path (str): The CSV file, gzip-compressed if its name ends with `.gz`.
+        schema (CsvSchema): How cells are converted.
+    """
+    convert = schema.converter()
+    with open_csv(path) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        columns = {key: index for index, key in enumerate(header)}
+        for record in reader:
+            if record:
+                yield Row(columns, [convert(value) for value in fit(record, header)])
@@ -0,0 +1,96 @@
+import heapq
+import json
+import os
+import re
+from pathlib import Path
+
+# Weight of the latest run in the stored duration of a test.
+LATEST_WEIGHT = 0.5
+
+# Suffix pytest-xdist adds to node ids with --dist loadgroup.
+GROUP_SUFFIX_RE = re.compile(r'@[^/:\[\]]+$')
+
+
+def history_key(nodeid):
+    """Returns the node id a duration is stored under, without an xdist group suffix."""
+    return GROUP_SUFFIX_RE.sub('', nodeid)
+
+
+class DurationHistory:
+    """
+    Adds up the seconds each test of the run takes, for `save_durations`.
+
+    Only the process reporting the run (the pytest-xdist controller, or
+    pytest itself without xdist) records durations, when `path` is set.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.durations = {}
+
+    def record(self, nodeid, seconds):
+        key = history_key(nodeid)
+        self.durations[key] = self.durations.get(key, 0) + seconds
+
+
+duration_history = DurationHistory()
+
+
+def load_durations(path):
+    """Reads the test durations saved by `save_durations`; empty if the file is missing or unreadable."""
+    try:
+        with Path(path).open() as file:
+            return json.load(file).get('durations', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path, durations):
+    """
+    Merges the test durations of this run into the history file.
+
+    Tests seen before keep a moving average (`LATEST_WEIGHT` for this run),
+    so one slow run does not reorder the next ones.
+
+    Args:
+        path (str): The JSON history file.
+        durations (dict): Maps node ids to the seconds they took in this run.
+
+    Returns:
+        dict: The merged durations.
+    """
+    merged = load_durations(path)
+    for nodeid, seconds in durations.items():
+        previous = merged.get(nodeid)
+        merged[nodeid] = seconds if previous is None else previous + LATEST_WEIGHT * (seconds - previous)
+    path = Path(path)
+    temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with temporary.open('w') as file:
+        json.dump({'durations': merged}, file, indent=2, sort_keys=True)
+    os.replace(temporary, path)
+    return merged
+
+
+def estimate(nodeids, durations):
+    """
+    Returns the expected seconds of each node id.
+
+    Tests without history are expected to take the average of the known
+    ones, so new rows are neither run first nor left for the end.
+    """
+    known = [durations[history_key(nodeid)] for nodeid in nodeids if history_key(nodeid) in durations]
+    default = sum(known) / len(known) if known else 0
+    return [durations.get(history_key(nodeid), default) for nodeid in nodeids]
+
+
+def longest_first(expected):
+    """Returns the indices of `expected` from the longest to the shortest, ties in collection order."""
+    return sorted(range(len(expected)), key=lambda index: -expected[index])
+
+
+def makespan(expected, workers):
+    """Returns the seconds the last of `workers` finishes when each takes the next longest test."""
+    loads = [0.0] * max(workers, 1)
+    for index in longest_first(expected):
+        heapq.heapreplace(loads, loads[0] + expected[index])
+    return max(loads)
@@ -0,0 +1,156 @@
+import re
+
+from harness.js import execute_async_script
+
+WHITESPACE_RE = re.compile(r'[ \t]+')
+
+# Finds the TinyMCE instance whose iframe is `window.frames[frameIndex]`.
+FIND_EDITOR_JS = """
+function findEditor(frameIndex) {
+    if (!window.tinymce || !window.frames[frameIndex]) {
+        return null;
+    }
+    var editors = tinymce.get();
+    for (var i = 0; i < editors.length; i++) {
+        var iframe = editors[i].iframeElement;
+        if (iframe && iframe.contentWindow === window.frames[frameIndex]) {
+            return editors[i];
+        }
+    }
+    return null;
+}
+"""
+
+EDITOR_READY_SCRIPT = FIND_EDITOR_JS + """
+var frameIndex = arguments[0];
+var deadline = Date.now() + arguments[1];
+var done = arguments[arguments.length - 1];
+var finished = false;
+
+function isReady(editor) {
+    var body = editor && editor.initialized && editor.getBody();
+    return !!(body && body.id === 'tinymce' && body.isContentEditable);
+}
+
+function finish(ready) {
+    if (!finished) {
+        finished = true;
+        done(ready);
+    }
+}
+
+function check() {
+    if (finished) {
+        return;
+    }
+    var editor = findEditor(frameIndex);
+    if (isReady(editor)) {
+        return finish(true);
+    }
+    if (Date.now() > deadline) {
+        return finish(false);
+    }
+    if (editor && !editor.__readyWaitHooked) {
+        // Resolve as soon as TinyMCE reports the init instead of on the next poll.
+        editor.__readyWaitHooked = true;
+        editor.once('init', function () { setTimeout(check, 0); });
+    }
+    setTimeout(check, 50);
+}
+
+check();
+"""
+
+# Replaces the content of a TinyMCE instance with one paragraph per line.
+SET_CONTENT_JS = """
+function setEditorLines(editor, lines) {
+    function escapeHtml(text) {
+        var div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    // Spaces HTML would collapse (leading, trailing, repeated) become &nbsp;, as typing them does.
+    function keepSpaces(html) {
+        return html.replace(/^ | $| (?= )/g, '&nbsp;');
+    }
+
+    // TinyMCE 6 renamed fire to dispatch.
+    function dispatch(name) {
+        (editor.dispatch || editor.fire).call(editor, name);
+    }
+
+    // One paragraph per line, like pressing Enter between lines would give.
+    editor.setContent(lines.map(function (line) {
+        return '<p>' + (keepSpaces(escapeHtml(line)) || '<br>') + '</p>';
+    }).join(''));
+    editor.undoManager.add();
+    editor.setDirty(true);
+    dispatch('input');
+    dispatch('change');
+}
+"""
+
+SET_EDITOR_CONTENT_SCRIPT = FIND_EDITOR_JS + SET_CONTENT_JS + """
+var editor = findEditor(arguments[0]);
+var lines = arguments[1];
+if (!editor) {
+    return null;
+}
+
+setEditorLines(editor, lines);
+
+return Array.prototype.map.call(editor.getBody().children, function (node) {
+    return node.textContent;
+}).join('\\n');
+"""
+
+# Values of the `editor_input` row column.
+EDITOR_INPUT_API = 'api'
+EDITOR_INPUT_KEYS = 'keys'
+
+
+def wait_for_editor_ready(case, frame=0, timeout=20):
+    """
+    Waits until the TinyMCE editor living in iframe `frame` is usable.
+
+    The editor is ready once TinyMCE reports it initialized and its
+    `#tinymce` body is editable. The check runs inside the page as one async
+    script, so it returns as soon as the editor is up instead of after a
+    fixed sleep.
+
+    Returns:
+        bool: True if the editor became ready before the timeout.
+    """
+    return bool(execute_async_script(case, EDITOR_READY_SCRIPT, frame, int(timeout * 1000), timeout=timeout + 5))
+
+
+def editor_text(text):
+    """
+    Returns editor text with its whitespace normalized, to compare what was
+    set with what the editor reads back.
+
+    TinyMCE keeps some spaces as `&nbsp;` (read back as non-breaking spaces)
+    and collapses others, and tabs, depending on where they are. Each line
+    is compared with non-breaking spaces as spaces, runs of spaces and tabs
+    as one space, and without leading or trailing whitespace.
+    """
+    if text is None:
+        return None
+    return '\n'.join(WHITESPACE_RE.sub(' ', line).strip(' ') for line in text.replace('\xa0', ' ').split('\n'))
+
+
+def set_editor_content(case, content, frame=0):
+    """
+    Replaces the content of the TinyMCE editor in iframe `frame` in one script call.
+
+    Each line of `content` becomes a paragraph, so the result matches typing
+    the text with Enter between lines, but the cost does not grow with the
+    length of the text. Must be called from the default content.
+
+    Returns:
+        str: The editor text read back after the update (lines joined with
+        newlines), or None if no editor was found.
+    """
+    lines = content.replace('\r\n', '\n').split('\n')
+    return case.execute_script(SET_EDITOR_CONTENT_SCRIPT, frame, lines)
@@ -0,0 +1,85 @@
+from harness.editor import FIND_EDITOR_JS, SET_CONTENT_JS
+
+# Values of the `form_input` row column.
+FORM_INPUT_SCRIPT = 'script'
+FORM_INPUT_INTERACTIVE = 'interactive'
+
+FILL_FORM_SCRIPT = FIND_EDITOR_JS + SET_CONTENT_JS + """
+var fields = arguments[0];
+var problems = [];
+
+function notify(element) {
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+function find(selector) {
+    if (selector.charAt(0) === '/' || selector.charAt(0) === '(') {
+        return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(selector);
+}
+
+fields.forEach(function (field) {
+    var kind = field[0], selector = field[1], value = field[2];
+    if (kind === 'editor') {
+        var editor = findEditor(selector);
+        if (!editor) {
+            problems.push('no editor in frame ' + selector);
+            return;
+        }
+        setEditorLines(editor, value);
+        editor.save();
+        return;
+    }
+    var element = find(selector);
+    if (!element) {
+        problems.push('no element ' + selector);
+        return;
+    }
+    if (kind === 'checkbox') {
+        // A real click, so the form's own handlers enable or disable the dependent fields.
+        if (element.checked !== value) {
+            element.click();
+        }
+    } else if (kind === 'select') {
+        var option = Array.prototype.find.call(element.options, function (option) {
+            return option.text.trim() === value;
+        });
+        if (!option) {
+            problems.push('no option ' + JSON.stringify(value) + ' in ' + selector);
+            return;
+        }
+        element.value = option.value;
+        notify(element);
+    } else {
+        element.focus();
+        element.value = value;
+        notify(element);
+        element.blur();
+    }
+});
+
+return problems;
+"""
+
+
+def fill_form(case, fields):
+    """
+    Fills form fields in one script call, firing the events typing and
+    clicking would fire.
+
+    Args:
+        fields (list): (kind, selector, value) tuples, applied in order. `kind`
+            is "text", "checkbox" (value True or False), "select" (value is the
+            option text) or "editor" (selector is the frame index of a TinyMCE
+            editor, value its text, one paragraph per line).
+
+    Returns:
+        list: The fields that could not be filled, empty if all were.
+    """
+    fields = [
+        (kind, selector, value.replace('\r\n', '\n').split('\n') if kind == 'editor' else value)
+        for kind, selector, value in fields
+    ]
+    return case.execute_script(FILL_FORM_SCRIPT, fields)
@@ -0,0 +1,94 @@
+UNKNOWN = None
+
+
+class FrameTracker:
+    """
+    Tracks the frame the driver is switched to, to skip no-op switches.
+
+    The frame is kept as the path of frame identifiers from the page, `()`
+    being the page itself. `UNKNOWN` means it has to be switched anyway, e.g.
+    after a page load or when the driver changed. One tracker lives in each
+    test process; the counters are reset for every test.
+    """
+
+    def __init__(self):
+        self.driver = None
+        self.path = UNKNOWN
+        self.switches = 0
+        self.avoided = 0
+
+    def current(self, driver):
+        """Returns the known frame path of `driver`, or UNKNOWN."""
+        return self.path if driver is self.driver else UNKNOWN
+
+    def moved(self, driver, path):
+        self.driver = driver
+        self.path = path
+        self.switches += 1
+
+    def loaded(self, driver):
+        """A page load puts the driver back in the page without a switch."""
+        self.driver = driver
+        self.path = ()
+
+    def forget(self):
+        self.path = UNKNOWN
+
+    def reset_counts(self):
+        self.switches = 0
+        self.avoided = 0
+
+
+frame_tracker = FrameTracker()
+
+
+class FrameTrackingMixin:
+    """
+    Makes seleniumbase frame switches skip when the driver is already there.
+
+    `use_frame` lets helpers declare the frame they need (an iframe index of
+    the page, or None for the page) instead of switching in and back out
+    every time.
+    """
+
+    def setUp(self):
+        super().setUp()
+        frame_tracker.forget()
+
+    def use_frame(self, frame):
+        """Makes sure the driver is in iframe `frame` of the page, or in the page for None."""
+        path = () if frame is None else (frame,)
+        if frame_tracker.current(self.driver) == path:
+            frame_tracker.avoided += 1
+            return
+        self.switch_to_default_content()
+        if frame is not None:
+            self.switch_to_frame(frame)
+
+    def switch_to_frame(self, frame="iframe", timeout=None, invisible=False):
+        path = frame_tracker.current(self.driver)
+        super().switch_to_frame(frame, timeout, invisible)
+        frame_tracker.moved(self.driver, UNKNOWN if path is UNKNOWN else path + (frame,))
+
+    def switch_to_parent_frame(self):
+        path = frame_tracker.current(self.driver)
+        if path == ():
+            frame_tracker.avoided += 1
+            return
+        super().switch_to_parent_frame()
+        frame_tracker.moved(self.driver, path[:-1] if path else UNKNOWN)
+
+    def switch_to_default_content(self):
+        if frame_tracker.current(self.driver) == ():
+            frame_tracker.avoided += 1
+            return
+        super().switch_to_default_content()
+        frame_tracker.moved(self.driver, ())
+
+    def open(self, url, **kwargs):
+        super().open(url, **kwargs)
+        frame_tracker.loaded(self.driver)
+
+    def refresh_page(self, *args, **kwargs):
+        super().refresh_page(*args, **kwargs)
+        frame_tracker.loaded(self.driver)
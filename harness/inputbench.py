@@ -0,0 +1,106 @@
+"""
+Compares typing with entering text in one DevTools call, for growing texts.
+
+Runs against a local stand-in, so the numbers only reflect the browser:
+
+    python -m harness.inputbench --sizes 10 1000 100000
+"""
+import argparse
+import time
+
+from harness.editor import wait_for_editor_ready
+from harness.standin.server import StandinServer
+from harness.textinput import TEXT_INPUT_CDP, TEXT_INPUT_KEYS, insert_text
+
+DEFAULT_SIZES = (10, 1000, 100000)
+
+READ_TEXT_SCRIPT = """
+var element = document.querySelector(arguments[0]);
+return element.isContentEditable ? element.innerText.replace(/\\n$/, '') : element.value;
+"""
+
+
+def sample_text(size):
+    """Returns `size` characters of text without line breaks."""
+    words = 'lorem ipsum dolor sit amet '
+    return (words * (size // len(words) + 1))[:size]
+
+
+def enter_text(sb, mode, selector, text):
+    """Enters `text` into `selector` with `mode` and returns the seconds it took."""
+    start = time.perf_counter()
+    if mode == TEXT_INPUT_CDP:
+        insert_text(sb, selector, text)
+    else:
+        sb.update_text(selector, text)
+    seconds = time.perf_counter() - start
+    entered = sb.execute_script(READ_TEXT_SCRIPT, selector)
+    if entered != text:
+        raise AssertionError(f"{mode} entered {len(entered)} characters into {selector} instead of {len(text)}")
+    return seconds
+
+
+def open_field(sb, base_url, field):
+    """Opens the page of `field` ("plain" or "editor") and returns the selector to type into."""
+    if field == 'plain':
+        sb.open(f'{base_url}/login/index.php')
+        return '#username'
+    sb.open(f'{base_url}/admin/settings.php?section=frontpagesettings')
+    if not wait_for_editor_ready(sb, 0, 20):
+        raise AssertionError("The stand-in editor was not ready")
+    sb.switch_to_frame(0)
+    return '#tinymce'
+
+
+def run(sizes, fields, headless=True):
+    """
+    Times both text inputs for each field and size.
+
+    Returns:
+        list: (field, size, keys seconds, cdp seconds) tuples.
+    """
+    from seleniumbase import SB
+
+    server = StandinServer().start()
+    results = []
+    try:
+        with SB(headless=headless) as sb:
+            sb.open(f'{server.url}/login/index.php')
+            sb.update_text('#username', 'admin')
+            sb.update_text('#password', 'sandbox24')
+            sb.click('#loginbtn')
+            for field in fields:
+                for size in sizes:
+                    text = sample_text(size)
+                    timings = {}
+                    for mode in (TEXT_INPUT_KEYS, TEXT_INPUT_CDP):
+                        selector = open_field(sb, server.url, field)
+                        timings[mode] = enter_text(sb, mode, selector, text)
+                        sb.switch_to_default_content()
+                    results.append((field, size, timings[TEXT_INPUT_KEYS], timings[TEXT_INPUT_CDP]))
+                    print(format_result(*results[-1]), flush=True)
+    finally:
+        server.stop()
+    return results
+
+
+def format_result(field, size, keys, cdp):
+    return f"{field:>6} {size:>7} chars: keys {keys:8.3f}s, cdp {cdp:8.3f}s, {keys / cdp if cdp else 0:7.1f}x"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m harness.inputbench',
+        description="Time typing against one DevTools Input.insertText call per field.",
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), metavar='N',
+                        help="Text lengths to enter (default: 10 1000 100000).")
+    parser.add_argument('--fields', nargs='+', choices=('plain', 'editor'), default=['plain', 'editor'],
+                        help="Fields to enter text into: a plain input and the TinyMCE body (default: both).")
+    parser.add_argument('--headed', action='store_true', help="Show the browser.")
+    args = parser.parse_args(argv)
+    run(args.sizes, args.fields, headless=not args.headed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+def execute_async_script(case, script, *args, timeout=10):
+    """
+    Runs an async script with arguments in the browser of a test case.
+
+    seleniumbase's own `execute_async_script` takes no script arguments, so
+    this goes to the driver directly. The script calls its last argument
+    with the result.
+    """
+    case.driver.set_script_timeout(timeout)
+    return case.driver.execute_async_script(script, *args)
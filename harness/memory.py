@@ -0,0 +1,108 @@
+import os
+
+try:
+    import psutil
+except ImportError:  # psutil normally comes with seleniumbase
+    psutil = None
+
+MB = 1024 * 1024
+
+
+def worker_id():
+    """Returns the pytest-xdist worker id, or "main" without xdist."""
+    return os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+
+def process_tree_rss(driver):
+    """
+    Returns the resident memory of the browser processes started by the
+    driver service (chromedriver's children), or None if unknown.
+    """
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if psutil is None or process is None:
+        return None
+    try:
+        children = psutil.Process(process.pid).children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for child in children:
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total or None
+
+
+def js_heap_size(driver):
+    """Returns the used JS heap of the current page from CDP performance metrics, or None."""
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    except Exception:
+        return None
+    for metric in metrics:
+        if metric['name'] == 'JSHeapUsedSize':
+            return int(metric['value'])
+    return None
+
+
+def browser_memory(driver):
+    """Samples the memory of a browser: process RSS when local, else the CDP JS heap."""
+    memory = process_tree_rss(driver)
+    if memory is None:
+        memory = js_heap_size(driver)
+    return memory
+
+
+class MemoryMonitor:
+    """
+    Samples browser memory after each test and decides when to retire a
+    pooled browser.
+
+    Args:
+        limit_mb (int or float): Browsers using more than this many MB are
+            replaced by a fresh one. 0 only samples.
+    """
+
+    def __init__(self, limit_mb=0):
+        self.limit_mb = limit_mb
+        self.last_sample = None
+        self.last_retired = False
+
+    def reset_last(self):
+        """Forgets the sample of the previous test."""
+        self.last_sample = None
+        self.last_retired = False
+
+    def over_limit(self, driver):
+        """Samples `driver` and returns True if it should be retired."""
+        memory = browser_memory(driver)
+        self.last_sample = memory
+        self.last_retired = bool(self.limit_mb and memory and memory > self.limit_mb * MB)
+        return self.last_retired
+
+
+memory_monitor = MemoryMonitor()
+
+
+def summarize(samples):
+    """
+    Aggregates (worker, bytes, retired) samples into per-worker stats.
+
+    Returns:
+        dict: Maps each worker to (peak MB, average MB, samples, retired).
+    """
+    by_worker = {}
+    for worker, memory, retired in samples:
+        by_worker.setdefault(worker, []).append((memory, retired))
+    stats = {}
+    for worker, values in sorted(by_worker.items()):
+        memories = [memory for memory, _ in values]
+        stats[worker] = (
+            max(memories) / MB,
+            sum(memories) / len(memories) / MB,
+            len(memories),
+            sum(1 for _, retired in values if retired),
+        )
+    return stats
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+
+from harness.pool import BrowserPoolMixin, browser_pool
+
+# Page loads done by a full row prefix: open the site, submit the login form,
+# open the start page, and the logout at the end of the row.
+FULL_PREFIX_PAGE_LOADS = 4
+# A row that shares the prefix of the previous row only reopens the start page.
+SHARED_PREFIX_PAGE_LOADS = 1
+
+
+def row_group_key(cls, row):
+    """
+    Returns the (url, username, start page) key of a CSV row.
+
+    Rows with the same key can share the login, navigation and window setup
+    of the previous row. The url falls back to the `url` class attribute and
+    the start page is the class `start_page_sel`.
+    """
+    url = row.get('url') or getattr(cls, 'url', None)
+    if url:
+        url = str(url).rstrip('/')
+    return url, row.get('username'), getattr(cls, 'start_page_sel', None)
+
+
+def format_group_key(key):
+    """Formats a group key for reports."""
+    url, username, start_page = key
+    return f"{url} as {username}" + (f" -> {start_page}" if start_page else "")
+
+
+def group_in_order(items, key_func):
+    """
+    Stable grouping: items with the same key are made consecutive, groups
+    keep the order in which their first item appears.
+    """
+    groups = OrderedDict()
+    for item in items:
+        groups.setdefault(key_func(item), []).append(item)
+    return [item for group in groups.values() for item in group]
+
+
+class RowPlan:
+    """Summary of how many prefixes a grouped run can share."""
+
+    def __init__(self, keys):
+        self.group_sizes = OrderedDict()
+        for key in keys:
+            self.group_sizes[key] = self.group_sizes.get(key, 0) + 1
+
+    @property
+    def rows(self):
+        return sum(self.group_sizes.values())
+
+    @property
+    def groups(self):
+        return len(self.group_sizes)
+
+    @property
+    def logins_saved(self):
+        return self.rows - self.groups
+
+    @property
+    def page_loads_saved(self):
+        return self.logins_saved * (FULL_PREFIX_PAGE_LOADS - SHARED_PREFIX_PAGE_LOADS)
+
+    def lines(self):
+        """Returns the plan as report lines."""
+        lines = [
+            f"row plan: {self.rows} rows in {self.groups} groups, "
+            f"saves {self.logins_saved} logins and {self.page_loads_saved} page loads"
+        ]
+        for key, size in self.group_sizes.items():
+            lines.append(f"  {size} rows: {format_group_key(key)}")
+        return lines
+
+
+class RowSetup:
+    """Remembers which group prefix the current browser has already run."""
+
+    def __init__(self):
+        self.driver = None
+        self.key = None
+        self.start_url = None
+        self.next_key = None
+        self.prefix = None
+        self.deferred = False
+
+    def can_share(self, driver, key):
+        return self.driver is driver and self.key == key and self.start_url is not None
+
+    def reset(self):
+        self.driver = None
+        self.key = None
+        self.start_url = None
+        self.deferred = False
+
+
+row_setup = RowSetup()
+
+
+def browser_persists(case):
+    """Whether the browser of a test case is kept for the next test (pytest --rs or the browser pool)."""
+    if getattr(case, '_reuse_session', False):
+        return True
+    return browser_pool.enabled and isinstance(case, BrowserPoolMixin)
+
+
+def keep_row_state(driver):
+    """
+    Tells the browser pool whether `driver` must keep its pages and cookies
+    because its last row deferred the logout for the next row of the group.
+
+    Otherwise the browser is going to be reset, so the row state recorded
+    for it is dropped.
+    """
+    if row_setup.driver is not driver:
+        return False
+    if row_setup.deferred:
+        return True
+    row_setup.reset()
+    return False
+
+
+def start_row(case, url, username, password, start_page_sel=None):
+    """
+    Brings the browser of a seleniumbase test case to the start page of a row.
+
+    If the previous row of the same group ran in the same browser (browser
+    pool or pytest `--rs`), only the start page is reopened. Otherwise the full prefix runs:
+    open the site, set the window size, log in and click `start_page_sel`.
+    """
+    key = (str(url).rstrip('/'), username, start_page_sel)
+    row_setup.deferred = False
+    if row_setup.can_share(case.driver, key):
+        case.execute_script("window.onbeforeunload = null;")
+        case.open_page_with_retries(row_setup.start_url)
+        row_setup.prefix = 'shared'
+        return
+
+    if row_setup.driver is case.driver:
+        # The previous row of another group is still logged in (failed row).
+        case.logout()
+
+    case.open_page_with_retries(url)
+    case.set_window_size(1550, 878)
+    case.wait_for_ready_state_complete()
+
+    case.login(username, password)
+    if start_page_sel:
+        case.click(start_page_sel)
+
+    row_setup.driver = case.driver
+    row_setup.key = key
+    row_setup.start_url = case.get_current_url()
+    row_setup.prefix = 'full'
+
+
+def finish_row(case):
+    """
+    Ends a row started with `start_row`.
+
+    The logout is deferred when the next scheduled row belongs to the same
+    group and will run in the same browser.
+    """
+    if browser_persists(case) and row_setup.next_key == row_setup.key:
+        row_setup.deferred = True
+        return
+
+    case.logout()
+    row_setup.reset()
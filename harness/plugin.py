@@ -0,0 +1,502 @@
+import pytest
+
+from harness import planner
+from harness.cleanup import created_assignments
+from harness.commands import budget_failures, command_counter
+from harness.durations import duration_history, load_durations, save_durations
+from harness.frames import frame_tracker
+from harness.memory import memory_monitor, summarize, worker_id
+from harness.pool import browser_pool
+from harness.provision import MoodleApi, MoodleApiError
+from harness.results import CACHE_KEY, result_cache, row_hash
+from harness.shards import method_id, shard_key, sharding
+from harness.shared import SharedSetup
+from harness.site import SANDBOX_URL, site
+from harness.sleeps import rank, sleep_profiler
+from harness.timing import compare, load_results, phase_stats, phase_timer, save_results
+
+row_plan_key = pytest.StashKey()
+benchmark_key = pytest.StashKey()
+scheduler_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('harness')
+    group.addoption(
+        '--no-browser-pool', action='store_true', default=False,
+        help="Launch a new browser for every test instead of reusing pooled browsers.",
+    )
+    group.addoption(
+        '--browser-memory-limit', type=float, default=0, metavar='MB',
+        help="Replace a pooled browser between tests once it uses more than MB of memory (default: 0, never).",
+    )
+    group.addoption(
+        '--browser-pool-size', type=int, default=1,
+        help="Number of idle browsers each worker keeps for the next tests (default: 1).",
+    )
+    group.addoption(
+        '--moodle-url', default=None, metavar='URL',
+        help="Run against the Moodle site at URL instead of https://sandbox.moodledemo.net.",
+    )
+    group.addoption(
+        '--moodle-token', default=None, metavar='TOKEN',
+        help="Web-service token of an admin, to set up courses through the REST API instead of the browser.",
+    )
+    group.addoption(
+        '--moodle-username', default=None, metavar='USER',
+        help="Request the web-service token of USER (with --moodle-password) when --moodle-token is not given.",
+    )
+    group.addoption(
+        '--moodle-password', default=None, metavar='PASSWORD',
+        help="Password of --moodle-username.",
+    )
+    group.addoption(
+        '--keep-assignments', action='store_true', default=False,
+        help="Do not delete the assignments created by the tests at the end of the session.",
+    )
+    group.addoption(
+        '--standin', action='store_true', default=False,
+        help="Run against a local Moodle stand-in server started by each worker.",
+    )
+    group.addoption(
+        '--standin-latency', type=float, default=0, metavar='MS',
+        help="Delay the stand-in adds to every HTTP response (default: 0).",
+    )
+    group.addoption(
+        '--standin-editor-delay', type=float, default=0, metavar='MS',
+        help="Delay before each stand-in editor reports its init (default: 0).",
+    )
+    group.addoption(
+        '--shard-count', type=int, default=1, metavar='N',
+        help="Split the rows into N shards by a stable hash and run only one of them (default: 1).",
+    )
+    group.addoption(
+        '--shard-index', type=int, default=0, metavar='I',
+        help="The shard to run with --shard-count, from 0 to N - 1 (default: 0).",
+    )
+    group.addoption(
+        '--duration-history', default=None, metavar='PATH',
+        help="Save test durations to the JSON file PATH and, with -n, run the longest tests first.",
+    )
+    group.addoption(
+        '--incremental', action='store_true', default=False,
+        help="Skip rows that passed before and whose columns and test source did not change since.",
+    )
+    group.addoption(
+        '--sleep-profile', action='store_true', default=False,
+        help="Record every fixed sleep and report the idle seconds it wasted per call site.",
+    )
+    group.addoption(
+        '--benchmark', action='store_true', default=False,
+        help="Time the phases of each row (open, login, editor content, format, verify, logout).",
+    )
+    group.addoption(
+        '--benchmark-json', default=None, metavar='PATH',
+        help="Add the phase timings of this run to the JSON file PATH (implies --benchmark).",
+    )
+    group.addoption(
+        '--benchmark-compare', default=None, metavar='PATH',
+        help="Fail the run if a phase p50/p95 regressed against the JSON baseline PATH (implies --benchmark).",
+    )
+    group.addoption(
+        '--benchmark-tolerance', type=float, default=0.2,
+        help="Relative slowdown allowed by --benchmark-compare (default: 0.2).",
+    )
+
+
+def pytest_configure(config):
+    browser_pool.enabled = not config.getoption('no_browser_pool')
+    browser_pool.size = config.getoption('browser_pool_size')
+    memory_monitor.limit_mb = config.getoption('browser_memory_limit')
+    site.base_url = config.getoption('moodle_url')
+    site.token = config.getoption('moodle_token')
+    if bool(config.getoption('moodle_username')) != bool(config.getoption('moodle_password')):
+        raise pytest.UsageError("--moodle-username and --moodle-password go together")
+    created_assignments.enabled = not config.getoption('keep_assignments')
+    sleep_profiler.enabled = config.getoption('sleep_profile')
+    # Workers report their tests to the controller, which keeps the history.
+    if not hasattr(config, 'workerinput'):
+        duration_history.path = config.getoption('duration_history')
+    result_cache.enabled = config.getoption('incremental')
+    if result_cache.enabled:
+        if not hasattr(config, 'cache'):
+            raise pytest.UsageError("--incremental needs the pytest cache, do not disable the cacheprovider plugin")
+        result_cache.previous = config.cache.get(CACHE_KEY, {})
+    sharding.count = config.getoption('shard_count')
+    sharding.index = config.getoption('shard_index')
+    if sharding.count < 1 or not 0 <= sharding.index < sharding.count:
+        raise pytest.UsageError("--shard-index must be between 0 and --shard-count - 1")
+    phase_timer.enabled = bool(
+        config.getoption('benchmark')
+        or config.getoption('benchmark_json')
+        or config.getoption('benchmark_compare')
+    )
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    # With pytest-xdist only the workers open pages, each against its own stand-in.
+    if config.getoption('standin') and not config.pluginmanager.has_plugin('dsession'):
+        from harness.standin.server import StandinServer
+
+        site.standin = StandinServer(
+            latency_ms=config.getoption('standin_latency'),
+            editor_delay_ms=config.getoption('standin_editor_delay'),
+        ).start()
+        site.base_url = site.standin.url
+        site.token = site.standin.token()
+    elif config.getoption('standin'):
+        # The assignments go away with the stand-in of each worker.
+        created_assignments.enabled = False
+    username = config.getoption('moodle_username')
+    if site.token is None and username:
+        request_token(username, config.getoption('moodle_password'))
+
+
+def request_token(username, password):
+    """Gets the web-service token of `username` for `site`; without one, setup goes through the browser."""
+    base_url = site.base_url or SANDBOX_URL
+    try:
+        site.token = MoodleApi.request_token(base_url, username, password)
+    except MoodleApiError as e:
+        print(f"No web-service token for {username} on {base_url} ({e}), setting up through the browser")
+
+
+def pytest_sessionfinish(session):
+    browser_pool.close_all()
+    # Workers report their assignments to the controller, which deletes them once all tests are done.
+    if created_assignments.enabled and not hasattr(session.config, 'workerinput'):
+        created_assignments.delete_all()
+    if site.standin is not None:
+        site.standin.stop()
+        site.standin = None
+    if phase_timer.enabled and not hasattr(session.config, 'workerinput'):
+        finish_benchmark(session)
+    if duration_history.path and duration_history.durations:
+        save_durations(duration_history.path, duration_history.durations)
+    if result_cache.enabled and not hasattr(session.config, 'workerinput'):
+        session.config.cache.set(CACHE_KEY, result_cache.merged())
+
+
+def pytest_runtest_logreport(report):
+    """
+    Adds up the setup, call and teardown seconds of each test for
+    `--duration-history`, records the outcome of rows for `--incremental` and
+    collects the assignments the test created, to delete at the end.
+    """
+    if duration_history.path:
+        duration_history.record(report.nodeid, report.duration)
+    properties = dict(report.user_properties)
+    if created_assignments.enabled and report.when == 'call':
+        created_assignments.collect(properties.get('created_assignments', []))
+        created_assignments.deleted += properties.get('assignments_deleted', 0)
+    digest = properties.get('row_hash')
+    if result_cache.enabled and digest and not report.skipped:
+        result_cache.record(report.nodeid, digest, report.when, report.passed)
+
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Schedules the longest tests first from `--duration-history`, for the default `--dist load`."""
+    path = config.getoption('duration_history')
+    if not path or config.getvalue('dist') != 'load':
+        return None
+    from harness.schedule import LongestFirstScheduling
+
+    scheduler = LongestFirstScheduling(config, log, load_durations(path))
+    config.stash[scheduler_key] = scheduler
+    return scheduler
+
+
+@pytest.fixture(scope='session')
+def shared_setup(tmp_path_factory):
+    """Runs setup steps once per test session, across all pytest-xdist workers (see `SharedSetup`)."""
+    directory = tmp_path_factory.getbasetemp()
+    if worker_id() != 'main':
+        # Each worker has its own directory in the base directory of the run.
+        directory = directory.parent
+    return SharedSetup(directory)
+
+
+def finish_benchmark(session):
+    """Aggregates the phase timings of the run, saves them and compares them with the baseline."""
+    config = session.config
+    terminalreporter = config.pluginmanager.get_plugin('terminalreporter')
+    if terminalreporter is None:
+        return
+    samples = {}
+    for _, properties in call_reports(terminalreporter):
+        for phase, seconds in properties.get('phase_times', {}).items():
+            samples.setdefault(phase, []).append(seconds)
+    if not samples:
+        return
+
+    path = config.getoption('benchmark_json')
+    if path:
+        results = save_results(path, samples)
+    else:
+        results = {'runs': 1, 'phases': phase_stats(samples)}
+    regressions = []
+    baseline_path = config.getoption('benchmark_compare')
+    if baseline_path:
+        baseline = load_results(baseline_path)
+        if baseline is None:
+            regressions.append(f"baseline {baseline_path} not found")
+        else:
+            regressions = compare(results['phases'], baseline['phases'], config.getoption('benchmark_tolerance'))
+        if regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    config.stash[benchmark_key] = (results, regressions)
+
+
+def item_row(item):
+    """Returns the CSV row of a test item expanded by `csv_rows`, or None."""
+    return getattr(getattr(item, 'obj', None), 'csv_row', None)
+
+
+def item_group_key(item):
+    """Returns the planner group key of a row item, or None for other tests."""
+    row = item_row(item)
+    if row is None or not hasattr(item.cls, 'start_row'):
+        return None
+    return planner.row_group_key(item.cls, row)
+
+
+def item_shard_key(item):
+    """
+    Returns the key sharding a test item: its test method and CSV row, or its
+    node id for other tests. Streamed tests (None) run in every shard and
+    shard their rows.
+    """
+    if getattr(getattr(item, 'obj', None), 'csv_stream', None):
+        return None
+    row = item_row(item)
+    return shard_key(method_id(item.cls, item.name), row) if row is not None else item.nodeid
+
+
+def in_shard(item):
+    key = item_shard_key(item)
+    return key is None or sharding.owns(key)
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """
+    Keeps the items of the selected shard and orders row items so rows sharing
+    a (url, username, start page) prefix run back to back.
+    """
+    if sharding.enabled:
+        deselected = [item for item in items if not in_shard(item)]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if in_shard(item)]
+    unchanged = skip_unchanged_rows(items) if result_cache.enabled else []
+    items[:] = planner.group_in_order(items, item_group_key)
+    keys = [key for key in map(item_group_key, items) if key is not None]
+    config.stash[row_plan_key] = planner.RowPlan(keys)
+    # Skipped rows go last, so the rows that run still share their prefixes.
+    items.extend(unchanged)
+
+
+def skip_unchanged_rows(items):
+    """
+    Tags row items with their hash and takes out the ones that passed before
+    with the same hash, marked to be skipped.
+
+    Returns:
+        list: The unchanged row items, removed from `items`.
+    """
+    unchanged = []
+    for item in items:
+        row = item_row(item)
+        if row is None:
+            continue
+        digest = row_hash(item.cls, row)
+        item.user_properties.append(('row_hash', digest))
+        if result_cache.is_unchanged(item.nodeid, digest):
+            item.add_marker(pytest.mark.skip(reason="unchanged since it passed (--incremental)"))
+            unchanged.append(item)
+    if unchanged:
+        skipped = set(unchanged)
+        items[:] = [item for item in items if item not in skipped]
+    return unchanged
+
+
+def pytest_report_collectionfinish(config, start_path, items):
+    lines = []
+    if sharding.enabled:
+        lines.append(f"shard {sharding.index} of {sharding.count}: {len(items)} tests")
+    plan = config.stash.get(row_plan_key, None)
+    if plan is not None and plan.rows:
+        lines.extend(plan.lines())
+    return lines
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    planner.row_setup.next_key = item_group_key(nextitem) if nextitem is not None else None
+    planner.row_setup.prefix = None
+    frame_tracker.reset_counts()
+    browser_pool.last_borrow = None
+    memory_monitor.reset_last()
+    phase_timer.reset()
+    command_counter.reset()
+    sleep_profiler.reset()
+    created_assignments.reset()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    try:
+        result = yield
+    finally:
+        if planner.row_setup.prefix:
+            item.user_properties.append(('row_prefix', planner.row_setup.prefix))
+        item.user_properties.append(('frame_switches', frame_tracker.switches))
+        item.user_properties.append(('frame_switches_avoided', frame_tracker.avoided))
+        if browser_pool.last_borrow:
+            item.user_properties.append(('browser', browser_pool.last_borrow))
+        if memory_monitor.last_sample:
+            item.user_properties.append(
+                ('browser_memory', (worker_id(), memory_monitor.last_sample, memory_monitor.last_retired))
+            )
+        if phase_timer.durations:
+            item.user_properties.append(('phase_times', dict(phase_timer.durations)))
+        if command_counter.counts:
+            item.user_properties.append(('webdriver_commands', command_counter.counts))
+        if sleep_profiler.records:
+            item.user_properties.append(('sleeps', list(sleep_profiler.records)))
+        if created_assignments.recent:
+            item.user_properties.append(('created_assignments', list(created_assignments.recent)))
+        if created_assignments.deleted_recent:
+            item.user_properties.append(('assignments_deleted', created_assignments.deleted_recent))
+    failures = budget_failures(
+        command_counter,
+        getattr(item.cls, 'command_budget', None),
+        getattr(item.cls, 'phase_command_budgets', None),
+    )
+    if failures:
+        pytest.fail("Over the WebDriver command budget: " + "; ".join(failures), pytrace=False)
+    return result
+
+
+def call_reports(terminalreporter):
+    """Yields the call-phase reports of the run with their user properties as a dict."""
+    for status in ('passed', 'failed'):
+        for report in terminalreporter.stats.get(status, []):
+            if report.when == 'call':
+                yield report, dict(report.user_properties)
+
+
+def pytest_terminal_summary(terminalreporter):
+    prefixes = [properties.get('row_prefix') for _, properties in call_reports(terminalreporter)]
+    shared = prefixes.count('shared')
+    full = prefixes.count('full')
+    if shared or full:
+        saved_page_loads = shared * (planner.FULL_PREFIX_PAGE_LOADS - planner.SHARED_PREFIX_PAGE_LOADS)
+        terminalreporter.write_sep('-', 'row plan')
+        terminalreporter.write_line(
+            f"{full} rows ran the full prefix, {shared} shared it: "
+            f"saved {shared} logins and {saved_page_loads} page loads"
+        )
+
+    switches = {
+        report.nodeid: (properties['frame_switches'], properties['frame_switches_avoided'])
+        for report, properties in call_reports(terminalreporter)
+        if 'frame_switches' in properties
+    }
+    if any(done or avoided for done, avoided in switches.values()):
+        terminalreporter.write_sep('-', 'frame switches')
+        if terminalreporter.verbosity > 0:
+            for nodeid, (done, avoided) in sorted(switches.items()):
+                terminalreporter.write_line(f"{nodeid}: {done} switches, {avoided} avoided")
+        terminalreporter.write_line(
+            f"{sum(done for done, _ in switches.values())} frame switches, "
+            f"{sum(avoided for _, avoided in switches.values())} avoided"
+        )
+
+    browsers = [properties.get('browser') for _, properties in call_reports(terminalreporter)]
+    if 'reused' in browsers or 'launched' in browsers:
+        terminalreporter.write_sep('-', 'browser pool')
+        terminalreporter.write_line(
+            f"{browsers.count('launched')} browsers launched, {browsers.count('reused')} tests reused a pooled browser"
+        )
+
+    samples = [properties['browser_memory'] for _, properties in call_reports(terminalreporter) if 'browser_memory' in properties]
+    if samples:
+        terminalreporter.write_sep('-', 'browser memory')
+        for worker, (peak, average, count, retired) in summarize(samples).items():
+            terminalreporter.write_line(
+                f"{worker}: peak {peak:.0f} MB, average {average:.0f} MB over {count} tests, {retired} browsers retired"
+            )
+
+    commands = {
+        report.nodeid: properties['webdriver_commands']
+        for report, properties in call_reports(terminalreporter)
+        if 'webdriver_commands' in properties
+    }
+    if commands:
+        by_phase, by_command = {}, {}
+        for counts in commands.values():
+            for phase, phase_counts in counts.items():
+                for command, count in phase_counts.items():
+                    by_phase[phase] = by_phase.get(phase, 0) + count
+                    by_command[command] = by_command.get(command, 0) + count
+        total = sum(by_phase.values())
+        terminalreporter.write_sep('-', 'webdriver commands')
+        if terminalreporter.verbosity > 0:
+            for nodeid, counts in sorted(commands.items()):
+                terminalreporter.write_line(f"{nodeid}: {sum(sum(c.values()) for c in counts.values())} commands")
+        terminalreporter.write_line(f"{total} commands over {len(commands)} tests, {total / len(commands):.0f} per test")
+        terminalreporter.write_line(
+            "by phase: " + ", ".join(f"{phase} {count}" for phase, count in sorted(by_phase.items(), key=lambda p: -p[1]))
+        )
+        top = sorted(by_command.items(), key=lambda c: -c[1])[:8]
+        terminalreporter.write_line("by command: " + ", ".join(f"{command} {count}" for command, count in top))
+
+    sleeps = [record for _, properties in call_reports(terminalreporter) for record in properties.get('sleeps', [])]
+    if sleeps:
+        ranked = rank(sleeps)
+        terminalreporter.write_sep('-', 'sleeps')
+        terminalreporter.write_line(
+            f"{len(sleeps)} sleeps, {sum(entry[2] for entry in ranked):.1f}s idle, "
+            f"{sum(entry[3] for entry in ranked):.1f}s wasted on conditions that were already true"
+        )
+        for site_name, calls, slept, wasted, unknown in ranked:
+            note = f", {unknown} without condition" if unknown else ""
+            terminalreporter.write_line(f"{wasted:6.1f}s wasted of {slept:6.1f}s  {site_name}: {calls} calls{note}")
+
+    if created_assignments.deleted or created_assignments.left:
+        terminalreporter.write_sep('-', 'cleanup')
+        terminalreporter.write_line(
+            f"{created_assignments.deleted} assignments created by the tests deleted, "
+            f"{created_assignments.left} left (the deletion failed)"
+        )
+        if created_assignments.left:
+            terminalreporter.write_line(
+                "Delete them from the course page, or run with --moodle-token or "
+                "--moodle-username/--moodle-password to delete them through the web services",
+                yellow=True, bold=True,
+            )
+
+    scheduler = terminalreporter.config.stash.get(scheduler_key, None)
+    if scheduler is not None and scheduler.durations and scheduler.predicted is not None:
+        predicted, workers = scheduler.predicted
+        terminalreporter.write_sep('-', 'schedule')
+        terminalreporter.write_line(
+            f"longest tests first on {workers} workers, from the durations of {len(scheduler.durations)} tests: "
+            f"expected to take {predicted:.1f}s"
+        )
+
+    benchmark = terminalreporter.config.stash.get(benchmark_key, None)
+    if benchmark is not None:
+        results, regressions = benchmark
+        terminalreporter.write_sep('-', 'phase timings')
+        for phase, stats in results['phases'].items():
+            terminalreporter.write_line(
+                f"{phase}: p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, max {stats['max']:.2f}s "
+                f"over {stats['count']} rows"
+            )
+        if results['runs'] > 1:
+            terminalreporter.write_line(f"aggregated over {results['runs']} runs")
+        for regression in regressions:
+            terminalreporter.write_line(f"REGRESSION: {regression}", red=True)
@@ -0,0 +1,173 @@
+from contextlib import suppress
+
+from harness.memory import memory_monitor
+
+RESET_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def is_healthy(driver):
+    """Returns True if the browser still answers WebDriver commands."""
+    try:
+        return driver.execute_script("return 1;") == 1 and len(driver.window_handles) > 0
+    except Exception:
+        return False
+
+
+def reset_browser(driver):
+    """
+    Brings a browser back to a blank state: one window, no cookies or
+    storage, on about:blank.
+
+    Returns:
+        bool: False if the browser failed to reset and should be discarded.
+    """
+    try:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+        driver.execute_script(RESET_STORAGE_SCRIPT)
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Clears the cookies of every domain, not only the current one.
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        else:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+        return True
+    except Exception:
+        return False
+
+
+def quit_browser(driver):
+    """Quits a browser, ignoring errors from one that already died."""
+    with suppress(Exception):
+        driver.quit()
+
+
+class BrowserPool:
+    """
+    Long-lived browsers shared by the tests of one worker process.
+
+    Tests borrow a browser instead of launching one and give it back after
+    the test. Browsers are reset when given back (or lazily on the next
+    borrow when a test asked to keep its state) and health-checked before
+    being lent again, so Chrome starts once per worker rather than once per
+    test.
+    """
+
+    def __init__(self, size=1):
+        self.enabled = True
+        self.size = size
+        self.launched = 0
+        self.reused = 0
+        self.last_borrow = None
+        self._idle = []
+
+    def borrow(self, keep_state=None):
+        """
+        Returns a healthy idle browser, or None if a new one must be launched.
+
+        Args:
+            keep_state (callable): Called with a browser given back without
+                reset; returns True if its state may be kept for this borrow.
+        """
+        while self._idle:
+            driver, dirty = self._idle.pop()
+            if not is_healthy(driver):
+                quit_browser(driver)
+                continue
+            if dirty and not (keep_state and keep_state(driver)) and not reset_browser(driver):
+                quit_browser(driver)
+                continue
+            self.reused += 1
+            return driver
+        return None
+
+    def give_back(self, driver, reset=True):
+        """Returns a borrowed browser to the pool, quitting it if the pool is full or it is broken."""
+        if len(self._idle) >= self.size or not is_healthy(driver):
+            quit_browser(driver)
+            return
+        if reset and not reset_browser(driver):
+            quit_browser(driver)
+            return
+        self._idle.append((driver, not reset))
+
+    def close_all(self):
+        """Quits every idle browser, at the end of the session."""
+        while self._idle:
+            quit_browser(self._idle.pop()[0])
+
+
+browser_pool = BrowserPool()
+
+
+class BrowserPoolMixin:
+    """
+    Makes seleniumbase test cases take their browser from `browser_pool`.
+
+    Disabled when seleniumbase already shares one browser (`--rs`).
+    Override `keep_browser_state` to let a browser keep its pages and cookies
+    for the next test.
+    """
+
+    def keep_browser_state(self, driver):
+        """Returns True if `driver` may skip the reset between tests."""
+        return False
+
+    def get_new_driver(self, *args, **kwargs):
+        pooled = (
+            browser_pool.enabled
+            and not getattr(self, '_reuse_session', False)
+            and not self._drivers_list
+        )
+        if not pooled:
+            return super().get_new_driver(*args, **kwargs)
+
+        driver = browser_pool.borrow(self.keep_browser_state)
+        if driver is None:
+            driver = super().get_new_driver(*args, **kwargs)
+            browser_pool.launched += 1
+            browser_pool.last_borrow = 'launched'
+        else:
+            browser_pool.last_borrow = 'reused'
+            # The bookkeeping seleniumbase does for the browsers it launches.
+            browser = kwargs.get('browser') or (args[0] if args else None) or self.browser
+            self._drivers_list.append(driver)
+            self._drivers_browser_map[driver] = browser
+            if kwargs.get('switch_to', True):
+                self.driver = driver
+                self.browser = browser
+        self._pooled_driver = driver
+        return driver
+
+    def return_browser(self, driver):
+        """
+        Gives the browser back to the pool, keeping its state if
+        `keep_browser_state` allows it.
+
+        A browser whose memory grew over the monitor limit is quit instead,
+        so the next test launches a fresh one.
+        """
+        if memory_monitor.over_limit(driver):
+            quit_browser(driver)
+            return
+        browser_pool.give_back(driver, reset=not self.keep_browser_state(driver))
+
+    def tearDown(self):
+        driver = getattr(self, '_pooled_driver', None)
+        self._pooled_driver = None
+        if driver is not None and driver in self._drivers_list:
+            # Keep seleniumbase from quitting it.
+            self._drivers_list.remove(driver)
+            self._drivers_browser_map.pop(driver, None)
+        try:
+            super().tearDown()
+        finally:
+            if driver is not None:
+                self.return_browser(driver)
@@ -0,0 +1,94 @@
+import functools
+import hashlib
+import inspect
+from pathlib import Path
+
+from harness.durations import history_key
+from harness.shards import row_key
+
+ROOT = Path(__file__).resolve().parents[1]
+HARNESS = ROOT / 'harness'
+
+# pytest cache entry holding the last result of each row.
+CACHE_KEY = 'harness/row_results'
+
+
+def harness_files():
+    """Returns the files of the harness package, without its own unit tests."""
+    return [
+        path for path in HARNESS.rglob('*')
+        if path.is_file() and not {'__pycache__', 'tests'} & set(path.relative_to(HARNESS).parts)
+    ]
+
+
+def conftest_files(directory):
+    """Returns the conftest.py files pytest loads for a test directory, up to the repository root."""
+    return [
+        folder / 'conftest.py' for folder in [directory, *directory.parents]
+        if (folder == ROOT or ROOT in folder.parents) and (folder / 'conftest.py').is_file()
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(cls):
+    """
+    Hashes the source files a test class runs: its module, the modules of
+    its base classes in the repository (the suite base class), the suite
+    conftest.py files and every file of the harness package (mixins and the
+    helpers the tests call).
+    """
+    digest = hashlib.sha256()
+    paths = set(harness_files())
+    for klass in cls.__mro__:
+        try:
+            path = Path(inspect.getsourcefile(klass)).resolve()
+        except TypeError:  # built-in classes
+            continue
+        if klass is cls:
+            paths.update(conftest_files(path.parent))
+        if klass is cls or ROOT in path.parents:
+            paths.add(path)
+    for path in sorted(paths):
+        name = path.relative_to(ROOT).as_posix() if ROOT in path.parents else path.name
+        digest.update(name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def row_hash(cls, row):
+    """Hashes every column of a CSV row with the source of the test class running it."""
+    digest = hashlib.sha256(source_digest(cls).encode('utf-8'))
+    digest.update(row_key(row).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Remembers which rows passed with which content, for `--incremental`.
+
+    `previous` holds the cached {node id: [row hash, passed]} of earlier
+    runs; `results` the ones of this run, recorded by the process reporting
+    the run. A row is unchanged when its hash is the cached one and it passed.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.previous = {}
+        self.results = {}
+
+    def is_unchanged(self, nodeid, digest):
+        return self.previous.get(history_key(nodeid)) == [digest, True]
+
+    def record(self, nodeid, digest, when, passed):
+        """Records one phase report of a row; the row passed if all its phases did."""
+        key = history_key(nodeid)
+        if when == 'setup' or key not in self.results:
+            self.results[key] = [digest, passed]
+        else:
+            self.results[key][1] = self.results[key][1] and passed
+
+    def merged(self):
+        return dict(self.previous, **self.results)
+
+
+result_cache = ResultCache()
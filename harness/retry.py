@@ -0,0 +1,166 @@
+import random
+import time
+from urllib.parse import urlparse
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of trying again a target whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a target that keeps failing.
+
+    After `threshold` consecutive failures the breaker opens: calls are
+    refused for `reset_after` seconds, then one trial call is let through
+    and its outcome closes or reopens the breaker.
+    """
+
+    def __init__(self, threshold=3, reset_after=60):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_after
+
+    def allow(self):
+        """Returns True if the target may be called."""
+        return not self.is_open
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+# One breaker per site and test process, shared by all the tests of a worker.
+breakers = {}
+
+
+def site_breaker(url):
+    """Returns the circuit breaker of the site `url` belongs to."""
+    parsed = urlparse(url)
+    key = f'{parsed.scheme}://{parsed.netloc}'
+    if key not in breakers:
+        breakers[key] = CircuitBreaker()
+    return breakers[key]
+
+
+class RetryPolicy:
+    """
+    How an operation is retried: attempts, delays and which errors to retry.
+
+    The delay after attempt n is `delay * backoff ** (n - 1)`, capped at
+    `max_delay` and randomized by +/- `jitter` (a fraction). Retrying stops
+    after `attempts` tries (None for no limit) or `deadline` seconds after
+    the first try (None for no limit); the wait before the last try is
+    shortened so it runs at the deadline.
+
+    Args:
+        attempts (int): Maximum number of tries.
+        delay (int or float): Seconds to wait after the first failed try.
+        backoff (int or float): Factor applied to the delay after each try.
+        max_delay (int or float): Longest wait between two tries.
+        jitter (float): Random variation of each delay, e.g. 0.2 for +/- 20%.
+        deadline (int or float): Seconds after the first try when the last try runs.
+        retry_on (tuple): Exception types that count as a failed try; others propagate.
+    """
+
+    def __init__(self, attempts=3, delay=1, backoff=2, max_delay=10, jitter=0.2, deadline=None,
+                 retry_on=(Exception,)):
+        self.attempts = attempts
+        self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = retry_on
+
+    def copy(self, **changes):
+        """Returns a policy with the same settings but `changes`."""
+        settings = dict(vars(self), **changes)
+        return RetryPolicy(**settings)
+
+    def delay_after(self, attempt):
+        """Returns the seconds to wait after failed try number `attempt` (1-based)."""
+        delay = min(self.delay * self.backoff ** (attempt - 1), self.max_delay)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(delay, 0)
+
+    def until(self, attempt, sleep=time.sleep, on_retry=None, breaker=None):
+        """
+        Calls `attempt` until it returns a truthy value.
+
+        Args:
+            attempt (callable): One try; returns truthy on success. Exceptions in
+                `retry_on` count as a failed try.
+            sleep (callable): Waits the given seconds between tries.
+            on_retry (callable): Called with the try number and the exception (or
+                None) before waiting for the next try.
+            breaker (CircuitBreaker): Refuses tries while open and records their outcome.
+
+        Returns:
+            The truthy result of the successful try, or the last falsy result.
+
+        Raises:
+            CircuitOpenError: If `breaker` is open.
+            Exception: The error of the last try, if it raised one in `retry_on`.
+        """
+        start = time.monotonic()
+        number = 0
+        while True:
+            number += 1
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(f"Gave up after {breaker.failures} consecutive failures")
+            error = None
+            try:
+                result = attempt()
+            except self.retry_on as exception:
+                error, result = exception, None
+            if result:
+                if breaker is not None:
+                    breaker.success()
+                return result
+            if breaker is not None:
+                breaker.failure()
+                if breaker.is_open:
+                    raise CircuitOpenError(f"Gave up after {breaker.failures} consecutive failures") from error
+
+            delay = self.delay_after(number)
+            out_of_time = False
+            if self.deadline is not None:
+                # The last try runs at the deadline rather than never.
+                remaining = self.deadline - (time.monotonic() - start)
+                out_of_time = remaining <= 0
+                delay = min(delay, max(remaining, 0))
+            out_of_attempts = self.attempts is not None and number >= self.attempts
+            if out_of_attempts or out_of_time:
+                if error is not None:
+                    raise error
+                return result
+            if on_retry is not None:
+                on_retry(number, error)
+            sleep(delay)
+
+    def call(self, func, sleep=time.sleep, on_retry=None, breaker=None):
+        """
+        Calls `func` until it returns without raising an error in `retry_on`.
+
+        Takes the same arguments as `until` and returns the result of `func`.
+        """
+        result = []
+
+        def attempt():
+            result.append(func())
+            return True
+
+        self.until(attempt, sleep, on_retry, breaker)
+        return result[-1]
@@ -0,0 +1,141 @@
+import os
+import sys
+
+from harness import planner
+from harness.shards import method_id, sharding
+
+
+def csv_rows(filename):
+    """
+    Marks a test method to be expanded into one test per CSV row.
+
+    The decorated method takes the row mapping as its only argument.
+    Expansion is done by `expand_csv_rows` when the test class is created,
+    so every row is collected by pytest as its own item and can be spread
+    across pytest-xdist workers.
+
+    Args:
+        filename (str): The CSV file, relative to the test module.
+    """
+    def decorator(func):
+        func.csv_rows_filename = filename
+        return func
+    return decorator
+
+
+def csv_stream(filename):
+    """
+    Marks a test method to run once per row of a CSV file read as a stream.
+
+    Unlike `csv_rows`, the method is collected as a single test that reads
+    the file while it runs: rows execute as soon as they are read, in one
+    worker, each as a unittest subTest. With `--shard-count`, only the rows
+    of the selected shard run. Meant for very large or generated
+    data files (which may be `.gz` compressed) that should not become one
+    test item per row.
+
+    Args:
+        filename (str): The CSV file, relative to the test module.
+    """
+    def decorator(func):
+        func.csv_stream_filename = filename
+        return func
+    return decorator
+
+
+def is_skipped_row(row):
+    """Returns True if the row is marked with a truthy `_skip_` column."""
+    return str(row.get('_skip_', False)).strip().lower() == 'true'
+
+
+def row_ids(rows):
+    """Builds unique ids for rows from their `test_name`, like pytest does for params."""
+    ids = [str(row.get('test_name') or f'Test_{idx + 1}') for idx, row in enumerate(rows)]
+    duplicates = {row_id for row_id in ids if ids.count(row_id) > 1}
+    seen = {}
+    unique_ids = []
+    for row_id in ids:
+        if row_id in duplicates:
+            seen[row_id] = seen.get(row_id, -1) + 1
+            row_id = f'{row_id}{seen[row_id]}'
+        unique_ids.append(row_id)
+    return unique_ids
+
+
+def _bind_row(func, row):
+    """Wraps a row test method into a regular unittest-style test method."""
+    def run_row(self):
+        return func(self, row)
+    run_row.__doc__ = func.__doc__
+    run_row.__qualname__ = func.__qualname__
+    run_row.csv_row = row
+    return run_row
+
+
+def with_next(items):
+    """Yields (item, next item) pairs, the last one with None, reading one item ahead."""
+    iterator = iter(items)
+    current = next(iterator, None)
+    while current is not None:
+        following = next(iterator, None)
+        yield current, following
+        current = following
+
+
+def _bind_stream(func, name, path, stream_rows):
+    """Wraps a row test method into one test method running every row streamed from `path`."""
+    def run_rows(self):
+        test = method_id(type(self), name)
+        # Tell the planner about the next row, so consecutive rows can share their prefix.
+        shares_prefix = hasattr(self, 'start_row')
+        last_next_key = planner.row_setup.next_key
+        rows = (row for row in stream_rows(path) if not is_skipped_row(row) and sharding.owns_row(test, row))
+        try:
+            for index, (row, next_row) in enumerate(with_next(rows)):
+                if shares_prefix:
+                    planner.row_setup.next_key = (
+                        planner.row_group_key(type(self), next_row) if next_row is not None else last_next_key
+                    )
+                with self.subTest(row=str(row.get('test_name') or f'Test_{index + 1}')):
+                    func(self, row)
+        finally:
+            planner.row_setup.next_key = last_next_key
+    run_rows.__doc__ = func.__doc__
+    run_rows.__qualname__ = func.__qualname__
+    run_rows.csv_stream = path
+    return run_rows
+
+
+def expand_csv_rows(cls, read_rows, stream_rows=None):
+    """
+    Replaces every `csv_rows` method of a class by one test method per row.
+
+    Generated methods are named `<method>[<row id>]`, rows marked with
+    `_skip_` are left out. `csv_stream` methods are replaced by one method
+    running their rows as they are streamed.
+
+    Args:
+        cls (type): The test class being created.
+        read_rows (callable): Reads a CSV file path into a sequence of row mappings.
+        stream_rows (callable): Yields the row mappings of a CSV file path, for
+            `csv_stream` methods.
+    """
+    module_file = getattr(sys.modules.get(cls.__module__), '__file__', None)
+    base_dir = os.path.dirname(os.path.abspath(module_file)) if module_file else os.getcwd()
+
+    for name, func in list(vars(cls).items()):
+        stream_filename = getattr(func, 'csv_stream_filename', None)
+        if stream_filename is not None and stream_rows is not None:
+            setattr(cls, name, _bind_stream(func, name, os.path.join(base_dir, stream_filename), stream_rows))
+            continue
+
+        filename = getattr(func, 'csv_rows_filename', None)
+        if filename is None:
+            continue
+
+        rows = read_rows(os.path.join(base_dir, filename))
+        delattr(cls, name)
+        for row_id, row in zip(row_ids(rows), rows):
+            if is_skipped_row(row):
+                continue
+            setattr(cls, f'{name}[{row_id}]', _bind_row(func, row))
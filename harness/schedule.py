@@ -0,0 +1,61 @@
+from xdist.scheduler import LoadScheduling
+
+from harness.durations import estimate, longest_first, makespan
+
+# Tests queued on each worker: the running one and the next, which the
+# worker needs to know before finishing the current one.
+QUEUED_PER_WORKER = 2
+
+
+class LongestFirstScheduling(LoadScheduling):
+    """
+    pytest-xdist scheduling that hands out the longest tests first (LPT).
+
+    Tests are sorted by their expected duration from the history of earlier
+    runs, then each worker that frees up takes the longest test left. Long
+    assignment rows therefore start early and the end of the run is filled
+    with short ones, instead of one worker finishing a long row while the
+    others are idle.
+
+    Args:
+        config (pytest.Config): The controller configuration.
+        log: The xdist scheduler log.
+        durations (dict): Maps node ids to the seconds they took before.
+    """
+
+    def __init__(self, config, log, durations):
+        super().__init__(config, log)
+        self.durations = durations
+        # Seconds the run is expected to take, and with how many workers.
+        self.predicted = None
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        expected = estimate(self.collection, self.durations)
+        self.pending[:] = longest_first(expected)
+        self.predicted = (makespan(expected, len(self.nodes)), len(self.nodes))
+        # One test per worker and round, so the longest ones start on different workers.
+        for _ in range(QUEUED_PER_WORKER):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        if self.pending:
+            self._send_tests(node, QUEUED_PER_WORKER - len(self.node2pending[node]))
+        else:
+            node.shutdown()
@@ -0,0 +1,104 @@
+from urllib.parse import urlparse
+
+SESSION_COOKIE_PREFIX = 'MoodleSession'
+LOGGED_IN_SEL = '.userinitials'
+
+
+class SessionCache:
+    """
+    Caches authenticated Moodle session cookies keyed by (site, username).
+
+    One instance lives in each test process, so every pytest-xdist worker
+    logs in once per user and reuses the session for its following rows.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+
+    @staticmethod
+    def key(url, username):
+        """Builds the cache key from any URL of the site and the username."""
+        parsed = urlparse(url)
+        return f'{parsed.scheme}://{parsed.netloc}', username
+
+    def get(self, url, username):
+        """Returns the cached session cookies, or None if there are none."""
+        return self._sessions.get(self.key(url, username))
+
+    def store(self, url, username, cookies):
+        """Keeps the Moodle session cookies out of all the browser cookies."""
+        session_cookies = [
+            cookie for cookie in cookies
+            if cookie.get('name', '').startswith(SESSION_COOKIE_PREFIX)
+        ]
+        if session_cookies:
+            self._sessions[self.key(url, username)] = session_cookies
+        return session_cookies
+
+    def invalidate(self, url, username):
+        """Forgets the cached session, e.g. after it expired on the server."""
+        self._sessions.pop(self.key(url, username), None)
+
+    def has_user(self, url):
+        """Returns True if any session is cached for the site."""
+        site = self.key(url, None)[0]
+        return any(key[0] == site for key in self._sessions)
+
+    def clear(self):
+        """Forgets every cached session."""
+        self._sessions.clear()
+
+
+session_cache = SessionCache()
+
+
+def restore_session(case, username):
+    """
+    Injects a cached session into the browser of a seleniumbase test case.
+
+    The page is reloaded with the cookies and the session is only trusted if
+    the user menu shows `.userinitials`; otherwise it is invalidated and the
+    browser is left logged out for a regular UI login.
+
+    Returns:
+        bool: True if the browser is now logged in as `username`.
+    """
+    url = case.get_current_url()
+    cookies = session_cache.get(url, username)
+    if not cookies:
+        return False
+
+    for cookie in cookies:
+        case.add_cookie({key: cookie[key] for key in ('name', 'value', 'path') if key in cookie})
+    case.refresh_page()
+
+    if case.is_element_visible(LOGGED_IN_SEL):
+        return True
+
+    print(f"Cached session for {username} is no longer valid, logging in again.")
+    session_cache.invalidate(url, username)
+    case.delete_all_cookies()
+    case.refresh_page()
+    return False
+
+
+def save_session(case, username):
+    """Caches the session cookies of a browser that just logged in as `username`."""
+    return session_cache.store(case.get_current_url(), username, case.get_cookies())
+
+
+def drop_session(case):
+    """
+    Logs the browser out locally by dropping its cookies.
+
+    The server-side session stays alive so it can be restored for the next
+    row. Returns False if no session is cached for the site, in which case
+    the caller should log out through the UI.
+    """
+    url = case.get_current_url()
+    if not session_cache.has_user(url):
+        return False
+
+    case.delete_all_cookies()
+    case.refresh_page()
+    return True
@@ -0,0 +1,57 @@
+import hashlib
+import json
+
+
+def row_key(row):
+    """Identifies a CSV row by its `test_name` and content, the same on every machine."""
+    content = json.dumps(dict(row), sort_keys=True, default=str)
+    return f"{row.get('test_name', '')}\n{content}"
+
+
+def method_id(cls, name):
+    """Identifies the test method `name` of `cls` as "module::Class::method", without a row id."""
+    return f"{cls.__module__}::{cls.__qualname__}::{name.split('[', 1)[0]}"
+
+
+def shard_key(test, row):
+    """
+    Returns the key sharding a row of the test method `test` (see `method_id`).
+
+    Tests often read identical CSV files, so the row content alone would
+    put all their rows in the same few shards.
+    """
+    return f"{test}\n{row_key(row)}"
+
+
+def shard_of(key, count):
+    """Returns the shard (0 to count - 1) of `key`, from a hash that does not change between runs."""
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+
+class Sharding:
+    """
+    Splits the rows of the suites between several runs.
+
+    With `count` shards, the run with `index` keeps the rows (and other
+    tests) whose stable hash falls in its shard. The shards of one dataset
+    are disjoint and together hold every row, on any machine and with any
+    number of pytest-xdist workers. One instance lives in each test process.
+    """
+
+    def __init__(self):
+        self.index = 0
+        self.count = 1
+
+    @property
+    def enabled(self):
+        return self.count > 1
+
+    def owns(self, key):
+        return not self.enabled or shard_of(key, self.count) == self.index
+
+    def owns_row(self, test, row):
+        return self.owns(shard_key(test, row))
+
+
+sharding = Sharding()
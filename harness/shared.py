@@ -0,0 +1,57 @@
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from filelock import FileLock  # comes with seleniumbase
+
+
+def marker_name(name):
+    """Turns a setup step name into a file name."""
+    return re.sub(r'[^\w.-]+', '_', name).strip('_')
+
+
+class SharedSetup:
+    """
+    Runs setup steps once per test session, across all pytest-xdist workers.
+
+    Each step is guarded by a file lock in a directory shared by the
+    workers of the session. The first test reaching a step runs it while
+    the others wait for the lock; once it succeeded a marker file records
+    it and later tests skip the step without touching the site. A step that
+    raises leaves no marker, so the next test tries it again.
+
+    Args:
+        directory (str): A directory shared by the workers of the session.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        # Steps this process already saw done, skipped without the lock.
+        self.done = set()
+
+    def once(self, name, func):
+        """
+        Calls `func` unless another test of the session already did.
+
+        Args:
+            name (str): Identifies the step, e.g. the resource and site it sets up.
+            func (callable): Performs the step.
+
+        Returns:
+            bool: True if `func` was called by this call.
+        """
+        if name in self.done:
+            return False
+        path = self.directory / marker_name(name)
+        called = False
+        # Names hold dots (course short names, IP addresses), so append the suffixes.
+        with FileLock(str(path.with_name(path.name + '.lock'))):
+            marker = path.with_name(path.name + '.done')
+            if not marker.exists():
+                func()
+                marker.write_text(json.dumps({'name': name, 'pid': os.getpid(), 'time': time.time()}))
+                called = True
+        self.done.add(name)
+        return called
@@ -0,0 +1,39 @@
+from harness.provision import MoodleApi
+
+SANDBOX_URL = 'https://sandbox.moodledemo.net'
+
+
+class Site:
+    """
+    The Moodle site the tests run against.
+
+    The suites hardcode the public sandbox; when `base_url` is set (pytest
+    `--moodle-url` or `--standin`), sandbox URLs are rewritten to it before
+    the browser opens them. With a web-service `token` (pytest
+    `--moodle-token`, the one of `--moodle-username`, or the stand-in's
+    own), `api` sets up state without the browser.
+    """
+
+    def __init__(self):
+        self.base_url = None
+        self.standin = None
+        self.token = None
+
+    def resolve(self, url):
+        """Returns `url` moved to `base_url` if it points at the sandbox."""
+        if not self.base_url or not url.startswith(SANDBOX_URL):
+            return url
+        return self.base_url.rstrip('/') + url[len(SANDBOX_URL):]
+
+    def api(self, url=SANDBOX_URL):
+        """
+        Returns a `MoodleApi` for the site `url` belongs to, or None without a
+        token or when `url` is on another site.
+        """
+        base_url = (self.base_url or SANDBOX_URL).rstrip('/')
+        if not self.token or not self.resolve(url).startswith(base_url):
+            return None
+        return MoodleApi(base_url, self.token)
+
+
+site = Site()
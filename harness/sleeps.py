@@ -0,0 +1,103 @@
+import functools
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HARNESS = ROOT / 'harness'
+
+
+class SleepProfiler:
+    """
+    Records the fixed sleeps of the running test.
+
+    One profiler lives in each test process. `records` holds a
+    (call site, seconds, already true) entry per sleep of the current test
+    and is reset between tests; "already true" is None when the sleep did
+    not say what it waits for.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+
+    def reset(self):
+        self.records = []
+
+    def record(self, site, seconds, already):
+        self.records.append((site, seconds, already))
+
+
+sleep_profiler = SleepProfiler()
+
+
+@functools.lru_cache(maxsize=None)
+def in_harness(filename):
+    return HARNESS in Path(filename).resolve().parents
+
+
+def calling_frame(frame):
+    """
+    Returns the frame of the code asking for a sleep: the first one from
+    `frame` up that is neither in the harness (like `RetryPolicy.call`) nor
+    a lambda handed to it, or `frame` itself if there is none.
+    """
+    caller = frame
+    while caller is not None and (caller.f_code.co_name == '<lambda>' or in_harness(caller.f_code.co_filename)):
+        caller = caller.f_back
+    return caller or frame
+
+
+def call_site(frame):
+    """Names the code location of `frame` as "path:line (function)", relative to the repository."""
+    filename = frame.f_code.co_filename
+    try:
+        filename = os.path.relpath(filename, ROOT)
+    except ValueError:  # another drive on Windows
+        pass
+    return f"{filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+class SleepProfilingMixin:
+    """
+    Lets seleniumbase sleeps say what they wait for, and profiles them.
+
+    `sleep(seconds, condition)` takes an optional callable returning True
+    once the awaited state is reached. With pytest `--sleep-profile`, the
+    condition is checked before sleeping and every sleep is recorded with
+    `sleep_profiler`; otherwise the condition is ignored.
+    """
+
+    def sleep(self, seconds, condition=None):
+        if sleep_profiler.enabled:
+            already = None
+            if condition is not None:
+                try:
+                    already = bool(condition())
+                except Exception:
+                    already = False
+            sleep_profiler.record(call_site(calling_frame(sys._getframe(1))), seconds, already)
+        super().sleep(seconds)
+
+
+def rank(records):
+    """
+    Aggregates sleep records per call site, most wasted seconds first.
+
+    A sleep is wasted when its condition was already true before it started.
+
+    Returns:
+        list: (site, calls, slept seconds, wasted seconds, calls without condition) tuples.
+    """
+    sites = {}
+    for site, seconds, already in records:
+        calls, slept, wasted, unknown = sites.get(site, (0, 0, 0, 0))
+        sites[site] = (
+            calls + 1,
+            slept + seconds,
+            wasted + (seconds if already else 0),
+            unknown + (already is None),
+        )
+    ranked = [(site,) + totals for site, totals in sites.items()]
+    ranked.sort(key=lambda entry: (-entry[3], -entry[2], entry[0]))
+    return ranked
@@ -0,0 +1 @@
+"""A local stand-in for the Moodle sandbox, to benchmark the suites offline."""
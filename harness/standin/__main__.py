@@ -0,0 +1,34 @@
+import argparse
+
+from harness.standin.server import StandinServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m harness.standin',
+        description="Serve the local Moodle stand-in until interrupted.",
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0, metavar='MS',
+                        help="Delay added to every HTTP response (default: 0).")
+    parser.add_argument('--editor-delay', type=float, default=0, metavar='MS',
+                        help="Delay before each editor reports its init (default: 0).")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Log every request.")
+    args = parser.parse_args(argv)
+
+    server = StandinServer(args.host, args.port, args.latency, args.editor_delay, args.verbose)
+    print(
+        f"Moodle stand-in serving on {server.url} "
+        f"(run the suites with --moodle-url {server.url} --moodle-token {server.token()})"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
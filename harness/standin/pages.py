@@ -0,0 +1,278 @@
+from html import escape
+
+# Toolbar buttons of the stand-in editor, in Moodle's order. Toggle buttons
+# carry `aria-pressed` like in TinyMCE.
+TOOLBAR_BUTTONS = [
+    ('bold', 'B', True),
+    ('italic', 'I', True),
+    ('alignleft', 'Left', True),
+    ('aligncenter', 'Center', True),
+    ('alignright', 'Right', True),
+    ('bullist', 'Bullets', True),
+    ('numlist', 'Numbers', True),
+    ('outdent', 'Outdent', False),
+    ('indent', 'Indent', False),
+    ('tiny_link_link', 'Link', False),
+]
+PRESSED = ' aria-pressed="false"'
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+nav { display: flex; gap: 16px; align-items: center; padding: 8px 16px; background: #f5f5f5; }
+nav .usermenu { margin-left: auto; position: relative; }
+main { padding: 16px; }
+.dropdown-menu { position: absolute; right: 0; background: #fff; border: 1px solid #ccc; padding: 4px; }
+.dropdown-menu a { display: block; padding: 4px 8px; }
+.tox-toolbar { display: flex; gap: 4px; }
+.tox-edit-area__iframe { width: 100%; height: 200px; border: 1px solid #ccc; }
+.modal { position: fixed; top: 20%; left: 30%; background: #fff; border: 1px solid #999; padding: 16px; z-index: 10; }
+.fitem { margin: 8px 0; }
+.icon { display: inline-block; min-width: 16px; cursor: pointer; }
+.yui3-calendar-day { padding: 4px; cursor: pointer; }
+.activity-actions { cursor: pointer; }
+.optionname { padding: 8px; cursor: pointer; }
+"""
+
+
+def user_initials(username):
+    return (username[:1] + username[-1:]).upper()
+
+
+def layout(title, body, username=None, settings=False):
+    """Wraps `body` in the page chrome: navigation bar and user menu."""
+    if username:
+        usermenu = f"""
+        <div class="usermenu">
+          <button type="button" id="user-menu-toggle"
+                  onclick="var m = document.getElementById('user-action-menu');
+                           m.style.display = m.style.display === 'none' ? 'block' : 'none';">
+            <span class="userinitials">{escape(user_initials(username))}</span>
+          </button>
+          <div class="dropdown-menu" id="user-action-menu" style="display: none;">
+            <a href="/user/profile.php">Profile</a>
+            <a href="/login/logout.php">Log out</a>
+          </div>
+        </div>"""
+    else:
+        usermenu = """
+        <div class="usermenu"><span class="login"><a href="/login/index.php">Log in</a></span></div>"""
+    links = '<a data-key="home" href="/">Home</a>'
+    if username:
+        links += '<a data-key="mycourses" href="/my/courses.php">My courses</a>'
+    if settings:
+        links += '<a data-key="editsettings" href="/admin/settings.php?section=frontpagesettings">Settings</a>'
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<style>{STYLE}</style>
+<script src="/lib/editor/tiny/tinymce.js"></script>
+</head>
+<body>
+<nav>{links}{usermenu}</nav>
+<main>
+<h1>{escape(title)}</h1>
+{body}
+</main>
+</body>
+</html>"""
+
+
+def editor(field_id, name, content, init_delay_ms=0):
+    """A TinyMCE-like editor: toolbar, iframe and the textarea it saves to."""
+    buttons = ''.join(
+        f'<button type="button" class="tox-tbtn" data-mce-name="{command}"{PRESSED if toggle else ""}>{label}</button>'
+        for command, label, toggle in TOOLBAR_BUTTONS
+    )
+    return f"""
+<div class="tox tox-tinymce">
+  <div class="tox-toolbar" id="{field_id}_toolbar">{buttons}</div>
+  <iframe id="{field_id}_ifr" class="tox-edit-area__iframe" title="Rich text area"></iframe>
+</div>
+<textarea id="{field_id}" name="{name}" style="display: none;">{escape(content)}</textarea>
+<div class="modal" id="{field_id}_tiny_link_dialog" style="display: none;">
+  <div class="modal-body">
+    <label for="{field_id}_tiny_link_urlentry">Enter a URL</label>
+    <input type="text" id="{field_id}_tiny_link_urlentry">
+  </div>
+  <div class="modal-footer"><button type="button" class="btn btn-primary">Create link</button></div>
+</div>
+<script>tinymce.setup('{field_id}', {int(init_delay_ms)});</script>"""
+
+
+def front_page(courses, username=None, settings=False):
+    items = ''.join(
+        f'<li><a href="/course/view.php?id={course["id"]}">{escape(course["fullname"])}</a></li>'
+        for course in courses
+    )
+    body = f'<h2>Available courses</h2><ul class="courses">{items}</ul>'
+    return layout('Moodle stand-in', body, username, settings)
+
+
+def login_page(error=''):
+    message = f'<div class="alert alert-danger" id="loginerrormessage">{escape(error)}</div>' if error else ''
+    body = f"""
+{message}
+<form method="post" action="/login/index.php" id="login">
+  <div class="fitem"><input type="text" name="username" id="username" placeholder="Username"></div>
+  <div class="fitem"><input type="password" name="password" id="password" placeholder="Password"></div>
+  <button type="submit" class="btn btn-primary" id="loginbtn">Log in</button>
+</form>"""
+    return layout('Log in', body)
+
+
+def settings_page(summary, username, init_delay_ms=0):
+    body = f"""
+<form method="post" action="/admin/settings.php?section=frontpagesettings" id="adminsettings">
+  <div class="fitem"><label for="id_s__summary">Front page summary</label>
+  {editor('id_s__summary', 's__summary', summary, init_delay_ms)}</div>
+  <button type="submit" class="btn btn-primary">Save changes</button>
+</form>"""
+    return layout('Front page settings', body, username, settings=True)
+
+
+def my_courses_page(courses, username):
+    items = ''.join(
+        f'<li><a href="/course/view.php?id={course["id"]}">{escape(course["fullname"])}</a></li>'
+        for course in courses
+    )
+    body = f"""
+<div id="action_bar"><a class="btn btn-primary" href="/course/edit.php">New course</a></div>
+<ul class="courses">{items}</ul>"""
+    return layout('My courses', body, username)
+
+
+def course_edit_page(username, values=None, error=''):
+    values = values or {}
+    message = f'<div class="form-control-feedback invalid-feedback" id="id_error_shortname">{escape(error)}</div>' \
+        if error else ''
+
+    def field(name, label):
+        return (f'<div class="fitem"><label for="id_{name}">{label}</label>'
+                f'<input type="text" name="{name}" id="id_{name}" value="{escape(values.get(name, ""))}"></div>')
+
+    body = f"""
+<form method="post" action="/course/edit.php" id="mform1">
+  {field('fullname', 'Course full name')}
+  {field('shortname', 'Course short name')}
+  {message}
+  {field('idnumber', 'Course ID number')}
+  <input type="submit" class="btn btn-primary" name="saveanddisplay" id="id_saveanddisplay" value="Save and display">
+</form>"""
+    return layout('Add a new course', body, username)
+
+
+def course_page(course, username):
+    activities = ''
+    for index, activity in enumerate(course['activities']):
+        # Moodle numbers the course and section action menus first.
+        menu = f'action-menu-{index + 5}-menu'
+        links = ''.join(f'<a href="#">{label}</a>' for label in
+                        ('Edit settings', 'Move', 'Hide', 'Duplicate', 'Assign roles',
+                         'Availability', 'Group mode', 'Move right'))
+        activities += f"""
+<li class="activity">
+  <div class="activity-grid">
+    <span class="inplaceeditable" data-value="{escape(activity['name'])}">
+      <a href="/mod/assign/view.php?id={activity['id']}">{escape(activity['name'])}</a>
+    </span>
+    <div class="activity-actions" onclick="document.getElementById('{menu}').style.display = 'block';">Edit
+      <div class="dropdown-menu" id="{menu}" style="display: none;">{links}<a
+        href="/course/mod.php?delete={activity['id']}">Delete</a></div>
+    </div>
+  </div>
+</li>"""
+    body = f"""
+<div class="custom-switch" onclick="
+    document.body.classList.toggle('editing');
+    var editing = document.body.classList.contains('editing');
+    document.querySelectorAll('.activity-add-text').forEach(function (e) {{
+        e.style.display = editing ? 'block' : 'none';
+    }});">Edit mode</div>
+<ul class="section">{activities}</ul>
+<div class="activity-add-text" style="display: none;"
+     onclick="document.getElementById('chooser').style.display = 'block';">Add an activity or resource</div>
+<div class="modal" id="chooser" style="display: none;">
+  <div class="optionname" onclick="location.href = '/course/modedit.php?add=assign&amp;course={course['id']}';">Assignment</div>
+  <div class="optionname">Forum</div>
+  <div class="optionname">Quiz</div>
+</div>"""
+    return layout(course['fullname'], body, username)
+
+
+def assignment_form(course, username, values=None, error='', init_delay_ms=0):
+    values = values or {}
+
+    def options(first, last, selected):
+        return ''.join(
+            f'<option value="{i}"{" selected" if i == selected else ""}>{i:02d}</option>'
+            for i in range(first, last + 1)
+        )
+
+    def checked(name, default=False):
+        return ' checked' if values.get(name, 'on' if default else '') else ''
+
+    submissions_enabled = bool(checked('allowsubmissionsfromdate_enabled', default=not values))
+    onlinetext_enabled = bool(checked('assignsubmission_onlinetext_enabled'))
+    name_error = (f'<div class="form-control-feedback invalid-feedback" id="id_error_name">'
+                  f'{escape(error)}</div>') if error else ''
+    days = ''.join(
+        '<tr class="yui3-calendar-row">' + ''.join(
+            f'<td class="yui3-calendar-day" data-day="{week * 7 + day + 1}">{week * 7 + day + 1}</td>'
+            for day in range(7)
+        ) + '</tr>'
+        for week in range(4)
+    )
+    body = f"""
+<form method="post" action="/course/modedit.php?add=assign&amp;course={course['id']}" id="mform1"
+      onsubmit="tinymce.get().forEach(function (e) {{ e.save(); }});">
+  <div class="fitem"><label for="id_name">Assignment name</label>
+    <input type="text" name="name" id="id_name" value="{escape(values.get('name', ''))}">
+    {name_error}</div>
+  <div class="fitem"><label for="id_introeditor">Description</label>
+    {editor('id_introeditor', 'introeditor', values.get('introeditor', ''), init_delay_ms)}</div>
+  <div class="fitem"><input type="checkbox" name="showdescription" id="id_showdescription"{checked('showdescription')}>
+    <label for="id_showdescription">Display description on course page</label></div>
+  <div class="fitem" id="fitem_id_allowsubmissionsfromdate">Allow submissions from
+    <select name="allowsubmissionsfromdate_day" id="id_allowsubmissionsfromdate_day">{options(1, 28, 1)}</select>
+    <select name="allowsubmissionsfromdate_hour" id="id_allowsubmissionsfromdate_hour">{options(0, 23, 0)}</select>
+    <select name="allowsubmissionsfromdate_minute" id="id_allowsubmissionsfromdate_minute">{options(0, 59, 0)}</select>
+    <a href="#" id="id_allowsubmissionsfromdate_calendar"{'' if submissions_enabled else ' class="disabled"'}
+       onclick="if (!this.classList.contains('disabled')) {{
+           document.getElementById('dateselector-calendar-panel').style.display = 'block'; }}
+           return false;"><i class="icon fa fa-calendar" title="Calendar">&#128197;</i></a>
+    <input type="checkbox" name="allowsubmissionsfromdate_enabled" id="id_allowsubmissionsfromdate_enabled"
+           {'checked' if submissions_enabled else ''}
+           onchange="document.getElementById('id_allowsubmissionsfromdate_calendar').classList.toggle('disabled', !this.checked);">
+    <label for="id_allowsubmissionsfromdate_enabled">Enable</label>
+  </div>
+  <div id="dateselector-calendar-panel" style="display: none;">
+    <table class="yui3-calendar-grid">
+      <thead><tr><th>Mo</th><th>Tu</th><th>We</th><th>Th</th><th>Fr</th><th>Sa</th><th>Su</th></tr></thead>
+      <tbody onclick="var day = event.target.getAttribute('data-day');
+          if (day) {{
+              document.getElementById('id_allowsubmissionsfromdate_day').value = day;
+              document.getElementById('dateselector-calendar-panel').style.display = 'none';
+          }}">{days}</tbody>
+    </table>
+  </div>
+  <div class="fitem"><input type="checkbox" name="assignsubmission_onlinetext_enabled"
+      id="id_assignsubmission_onlinetext_enabled"{' checked' if onlinetext_enabled else ''}
+      onchange="document.getElementById('fgroup_id_assignsubmission_onlinetext_wordlimit_group')
+                .style.display = this.checked ? 'block' : 'none';">
+    <label for="id_assignsubmission_onlinetext_enabled">Online text</label></div>
+  <div class="fitem" id="fgroup_id_assignsubmission_onlinetext_wordlimit_group"
+       data-groupname="assignsubmission_onlinetext_wordlimit_group"
+       style="display: {'block' if onlinetext_enabled else 'none'};">
+    <label id="fgroup_id_assignsubmission_onlinetext_wordlimit_group_label">Word limit</label>
+    <input type="text" name="assignsubmission_onlinetext_wordlimit" id="id_assignsubmission_onlinetext_wordlimit">
+  </div>
+  <input type="submit" class="btn btn-primary" name="submitbutton2" id="id_submitbutton2" value="Save and return to course">
+  <input type="submit" class="btn btn-secondary" name="submitbutton" id="id_submitbutton" value="Save and display">
+</form>"""
+    return layout(f'Adding a new Assignment to {course["fullname"]}', body, username)
+
+
+def message_page(title, message, username=None):
+    return layout(title, f'<p>{escape(message)}</p>', username)
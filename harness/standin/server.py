@@ -0,0 +1,450 @@
+import json
+import re
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from harness.standin import pages
+
+TINYMCE_JS = Path(__file__).with_name('tinymce.js')
+
+# The demo accounts of sandbox.moodledemo.net.
+DEFAULT_USERS = {
+    'admin': 'sandbox24',
+    'manager': 'sandbox24',
+    'teacher': 'sandbox24',
+    'student': 'sandbox24',
+}
+
+SESSION_COOKIE = 'MoodleSession'
+
+# `courses[0][fullname]` style web-service parameter names.
+PARAM_KEY_RE = re.compile(r'\[([^\]]*)\]')
+
+
+def decode_params(form):
+    """Rebuilds the lists and dicts of web-service parameters from their form fields."""
+    params = {}
+    for field, value in form.items():
+        name = field.split('[', 1)[0]
+        keys = [name] + PARAM_KEY_RE.findall(field[len(name):])
+        target = params
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+
+    def listify(value):
+        if not isinstance(value, dict):
+            return value
+        if value and all(key.isdigit() for key in value):
+            return [listify(value[key]) for key in sorted(value, key=int)]
+        return {key: listify(item) for key, item in value.items()}
+    return listify(params)
+
+
+class MoodleState:
+    """The users, sessions, courses and activities of one stand-in site."""
+
+    def __init__(self, users=None):
+        self.users = dict(DEFAULT_USERS if users is None else users)
+        self.sessions = {}
+        self.tokens = {}
+        self.courses = []
+        self.summary = ''
+        self.lock = threading.Lock()
+        self._next_id = 1
+
+    def next_id(self):
+        value = self._next_id
+        self._next_id += 1
+        return value
+
+    def login(self, username, password):
+        """Returns a new session id, or None if the credentials are wrong."""
+        if self.users.get(username) != password:
+            return None
+        session_id = secrets.token_hex(16)
+        self.sessions[session_id] = username
+        return session_id
+
+    def issue_token(self, username):
+        """Returns the web-service token of a user, creating it the first time."""
+        for token, owner in self.tokens.items():
+            if owner == username:
+                return token
+        token = secrets.token_hex(16)
+        self.tokens[token] = username
+        return token
+
+    def course(self, course_id):
+        for course in self.courses:
+            if str(course['id']) == str(course_id):
+                return course
+        return None
+
+    def add_course(self, fullname, shortname, idnumber=''):
+        course = {'id': self.next_id(), 'fullname': fullname, 'shortname': shortname,
+                  'idnumber': idnumber, 'activities': []}
+        self.courses.append(course)
+        return course
+
+    def add_assignment(self, course, name, **settings):
+        activity = dict(settings, id=self.next_id(), name=name, modname='assign')
+        course['activities'].append(activity)
+        return activity
+
+    def delete_activity(self, activity_id):
+        """Deletes an activity and returns its course, or None if it does not exist."""
+        for course in self.courses:
+            for activity in course['activities']:
+                if str(activity['id']) == str(activity_id):
+                    course['activities'].remove(activity)
+                    return course
+        return None
+
+
+class WebserviceError(Exception):
+    """A Moodle exception answered by a stand-in web-service function."""
+
+    def __init__(self, errorcode, message):
+        super().__init__(message)
+        self.errorcode = errorcode
+
+
+def course_info(course):
+    return {key: course[key] for key in ('id', 'fullname', 'shortname', 'idnumber')}
+
+
+def get_courses_by_field(state, field='', value=''):
+    courses = [course for course in state.courses if not field or str(course.get(field)) == str(value)]
+    return {'courses': [course_info(course) for course in courses], 'warnings': []}
+
+
+def create_courses(state, courses=()):
+    created = []
+    for settings in courses:
+        shortname = settings.get('shortname', '')
+        if any(course['shortname'] == shortname for course in state.courses):
+            raise WebserviceError('shortnametaken', f'Short name is already used for another course ({shortname})')
+        course = state.add_course(settings.get('fullname', ''), shortname, settings.get('idnumber', ''))
+        created.append({'id': course['id'], 'shortname': shortname})
+    return created
+
+
+def get_assignments(state, courseids=()):
+    courses = [state.course(course_id) for course_id in courseids] if courseids else state.courses
+    return {
+        'courses': [
+            dict(course_info(course), assignments=[
+                {'id': activity['id'], 'cmid': activity['id'], 'course': course['id'], 'name': activity['name']}
+                for activity in course['activities'] if activity['modname'] == 'assign'
+            ])
+            for course in courses if course is not None
+        ],
+        'warnings': [],
+    }
+
+
+def delete_modules(state, cmids=()):
+    for cmid in cmids:
+        if state.delete_activity(cmid) is None:
+            raise WebserviceError('invalidcoursemodule', f'Invalid course module ID ({cmid})')
+    return None
+
+
+# The web-service functions the stand-in implements, as functions of (state, **params).
+WEBSERVICE_FUNCTIONS = {
+    'core_course_get_courses_by_field': get_courses_by_field,
+    'core_course_create_courses': create_courses,
+    'mod_assign_get_assignments': get_assignments,
+    'core_course_delete_modules': delete_modules,
+}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Serves the Moodle pages the test flows go through."""
+
+    server_version = 'MoodleStandin/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # Request plumbing
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def dispatch(self, method):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parts = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.form = {}
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length).decode('utf-8')
+            self.form = {key: values[-1] for key, values in parse_qs(body, keep_blank_values=True).items()}
+        route = self.ROUTES.get((method, parts.path))
+        if route is None:
+            self.send_page(pages.message_page('Not found', f'No page at {parts.path}.', self.username()), 404)
+            return
+        with self.server.state.lock:
+            route(self)
+
+    def session_id(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        morsel = cookie.get(SESSION_COOKIE)
+        return morsel.value if morsel else None
+
+    def username(self):
+        return self.server.state.sessions.get(self.session_id())
+
+    def send_page(self, html, status=200, cookie=None):
+        data = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if cookie is not None:
+            self.send_header('Set-Cookie', cookie)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location, cookie=None):
+        self.send_response(303)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        if cookie is not None:
+            self.send_header('Set-Cookie', cookie)
+        self.end_headers()
+
+    def send_json(self, value):
+        data = json.dumps(value).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def require_login(self):
+        """Returns the logged in user, or redirects to the login page and returns None."""
+        username = self.username()
+        if username is None:
+            self.redirect('/login/index.php')
+        return username
+
+    # Pages
+
+    def front_page(self):
+        username = self.username()
+        self.send_page(pages.front_page(self.server.state.courses, username, settings=bool(username)))
+
+    def tinymce_js(self):
+        data = TINYMCE_JS.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/javascript')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'max-age=3600')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def login_form(self):
+        self.send_page(pages.login_page())
+
+    def login_submit(self):
+        session_id = self.server.state.login(self.form.get('username', ''), self.form.get('password', ''))
+        if session_id is None:
+            self.send_page(pages.login_page('Invalid login, please try again'))
+            return
+        self.redirect('/', cookie=f'{SESSION_COOKIE}={session_id}; Path=/; HttpOnly')
+
+    def logout(self):
+        self.server.state.sessions.pop(self.session_id(), None)
+        self.redirect('/', cookie=f'{SESSION_COOKIE}=; Path=/; Max-Age=0')
+
+    def settings_form(self):
+        username = self.require_login()
+        if username:
+            self.send_page(pages.settings_page(self.server.state.summary, username, self.server.editor_delay_ms))
+
+    def settings_submit(self):
+        if self.require_login():
+            self.server.state.summary = self.form.get('s__summary', '')
+            self.redirect('/admin/settings.php?section=frontpagesettings')
+
+    def my_courses(self):
+        username = self.require_login()
+        if username:
+            self.send_page(pages.my_courses_page(self.server.state.courses, username))
+
+    def course_form(self):
+        username = self.require_login()
+        if username:
+            self.send_page(pages.course_edit_page(username))
+
+    def course_submit(self):
+        username = self.require_login()
+        if not username:
+            return
+        state = self.server.state
+        shortname = self.form.get('shortname', '')
+        if any(course['shortname'] == shortname for course in state.courses):
+            self.send_page(pages.course_edit_page(username, self.form, 'Short name is already used for another course'))
+            return
+        course = state.add_course(self.form.get('fullname', ''), shortname, self.form.get('idnumber', ''))
+        self.redirect(f'/course/view.php?id={course["id"]}')
+
+    def course_view(self):
+        username = self.require_login()
+        if not username:
+            return
+        course = self.server.state.course(self.query.get('id'))
+        if course is None:
+            self.send_page(pages.message_page('Error', 'Can not find data record in database.', username), 404)
+            return
+        self.send_page(pages.course_page(course, username))
+
+    def assignment_form(self):
+        username = self.require_login()
+        if not username:
+            return
+        course = self.server.state.course(self.query.get('course'))
+        if course is None:
+            self.send_page(pages.message_page('Error', 'Can not find data record in database.', username), 404)
+            return
+        self.send_page(pages.assignment_form(course, username, init_delay_ms=self.server.editor_delay_ms))
+
+    def assignment_submit(self):
+        username = self.require_login()
+        if not username:
+            return
+        state = self.server.state
+        course = state.course(self.query.get('course'))
+        if course is None:
+            self.send_page(pages.message_page('Error', 'Can not find data record in database.', username), 404)
+            return
+        name = self.form.get('name', '').strip()
+        if not name:
+            self.send_page(pages.assignment_form(course, username, self.form, '- You must supply a value here.',
+                                                 self.server.editor_delay_ms))
+            return
+        state.add_assignment(
+            course, name,
+            intro=self.form.get('introeditor', ''),
+            showdescription='showdescription' in self.form,
+            allowsubmissionsfromdate='allowsubmissionsfromdate_enabled' in self.form,
+            onlinetext='assignsubmission_onlinetext_enabled' in self.form,
+        )
+        self.redirect(f'/course/view.php?id={course["id"]}')
+
+    def delete_activity(self):
+        if not self.require_login():
+            return
+        course = self.server.state.delete_activity(self.query.get('delete'))
+        self.redirect(f'/course/view.php?id={course["id"]}' if course else '/')
+
+    # Web services
+
+    def token(self):
+        params = dict(self.query, **self.form)
+        state = self.server.state
+        username = params.get('username', '')
+        if state.users.get(username) != params.get('password'):
+            self.send_json({'error': 'Invalid login, please try again', 'errorcode': 'invalidlogin'})
+            return
+        self.send_json({'token': state.issue_token(username), 'privatetoken': None})
+
+    def webservice(self):
+        params = decode_params(dict(self.query, **self.form))
+        if params.pop('wstoken', None) not in self.server.state.tokens:
+            self.send_json({'exception': 'moodle_exception', 'errorcode': 'invalidtoken',
+                            'message': 'Invalid token - token not found'})
+            return
+        function = WEBSERVICE_FUNCTIONS.get(params.pop('wsfunction', None))
+        params.pop('moodlewsrestformat', None)
+        if function is None:
+            self.send_json({'exception': 'dml_missing_record_exception', 'errorcode': 'invalidrecord',
+                            'message': 'Can not find data record in database table external_functions.'})
+            return
+        try:
+            self.send_json(function(self.server.state, **params))
+        except WebserviceError as e:
+            self.send_json({'exception': 'moodle_exception', 'errorcode': e.errorcode, 'message': str(e)})
+
+    ROUTES = {
+        ('GET', '/'): front_page,
+        ('GET', '/lib/editor/tiny/tinymce.js'): tinymce_js,
+        ('GET', '/login/index.php'): login_form,
+        ('POST', '/login/index.php'): login_submit,
+        ('GET', '/login/logout.php'): logout,
+        ('GET', '/admin/settings.php'): settings_form,
+        ('POST', '/admin/settings.php'): settings_submit,
+        ('GET', '/my/courses.php'): my_courses,
+        ('GET', '/course/edit.php'): course_form,
+        ('POST', '/course/edit.php'): course_submit,
+        ('GET', '/course/view.php'): course_view,
+        ('GET', '/course/modedit.php'): assignment_form,
+        ('POST', '/course/modedit.php'): assignment_submit,
+        ('GET', '/course/mod.php'): delete_activity,
+        ('GET', '/login/token.php'): token,
+        ('POST', '/login/token.php'): token,
+        ('GET', '/webservice/rest/server.php'): webservice,
+        ('POST', '/webservice/rest/server.php'): webservice,
+    }
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the Moodle sandbox, for offline and reproducible runs.
+
+    Implements the login form, user menu, front page settings with an editor,
+    course pages with edit mode and the assignment form, and the REST web
+    services used by `harness.provision`, backed by an in-memory `MoodleState`.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on, 0 picks a free one.
+        latency_ms (int or float): Delay added to every HTTP response.
+        editor_delay_ms (int or float): Delay before each editor reports its init.
+        verbose (bool): Log every request to stderr.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, editor_delay_ms=0, verbose=False):
+        super().__init__((host, port), StandinHandler)
+        self.latency = latency_ms / 1000
+        self.editor_delay_ms = editor_delay_ms
+        self.verbose = verbose
+        self.state = MoodleState()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def token(self, username='admin'):
+        """Returns a web-service token of `username` for this server."""
+        with self.state.lock:
+            return self.state.issue_token(username)
+
+    def start(self):
+        """Serves requests from a background thread and returns the server."""
+        self._thread = threading.Thread(target=self.serve_forever, name='moodle-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,195 @@
+// Minimal TinyMCE stand-in: the API and DOM the test helpers rely on.
+(function () {
+    var editors = [];
+
+    function Editor(textarea, toolbar, iframe) {
+        this.id = textarea.id;
+        this.textarea = textarea;
+        this.toolbar = toolbar;
+        this.iframeElement = iframe;
+        this.initialized = false;
+        this.handlers = {};
+        this.undoManager = {add: function () {}};
+        this.mode = {get: function () { return 'design'; }};
+        this.dirty = false;
+    }
+
+    Editor.prototype.on = function (name, callback) {
+        (this.handlers[name] = this.handlers[name] || []).push(callback);
+    };
+
+    Editor.prototype.once = function (name, callback) {
+        var editor = this;
+        function wrapper() {
+            editor.handlers[name] = editor.handlers[name].filter(function (cb) { return cb !== wrapper; });
+            callback.apply(editor, arguments);
+        }
+        this.on(name, wrapper);
+    };
+
+    Editor.prototype.fire = function (name, data) {
+        (this.handlers[name] || []).slice().forEach(function (callback) { callback(data || {}); });
+    };
+    Editor.prototype.dispatch = Editor.prototype.fire;
+
+    Editor.prototype.getDoc = function () {
+        return this.iframeElement.contentWindow.document;
+    };
+
+    Editor.prototype.getBody = function () {
+        return this.initialized ? this.getDoc().body : null;
+    };
+
+    Editor.prototype.setContent = function (html) {
+        this.getBody().innerHTML = html || '<p><br></p>';
+        this.save();
+    };
+
+    Editor.prototype.getContent = function () {
+        return this.getBody().innerHTML;
+    };
+
+    Editor.prototype.setDirty = function (dirty) {
+        this.dirty = dirty;
+    };
+
+    Editor.prototype.save = function () {
+        this.textarea.value = this.getBody().innerHTML;
+    };
+
+    Editor.prototype.blocks = function () {
+        var body = this.getBody();
+        if (!body.children.length && body.textContent) {
+            body.innerHTML = '<p>' + body.innerHTML + '</p>';
+        }
+        return Array.prototype.slice.call(body.children);
+    };
+
+    Editor.prototype.wrapInline = function (tag) {
+        var doc = this.getDoc();
+        this.blocks().forEach(function (block) {
+            var wrapper = doc.createElement(tag);
+            while (block.firstChild) {
+                wrapper.appendChild(block.firstChild);
+            }
+            block.appendChild(wrapper);
+        });
+    };
+
+    Editor.prototype.makeList = function (tag) {
+        var doc = this.getDoc();
+        var list = doc.createElement(tag);
+        this.blocks().forEach(function (block) {
+            var item = doc.createElement('li');
+            item.innerHTML = block.innerHTML;
+            list.appendChild(item);
+            block.parentNode.removeChild(block);
+        });
+        this.getBody().appendChild(list);
+    };
+
+    Editor.prototype.setBlockStyle = function (property, value) {
+        this.blocks().forEach(function (block) {
+            block.style[property] = value;
+        });
+    };
+
+    Editor.prototype.execCommand = function (name, value) {
+        switch (name) {
+            case 'bold': this.wrapInline('strong'); break;
+            case 'italic': this.wrapInline('em'); break;
+            case 'numlist': this.makeList('ol'); break;
+            case 'bullist': this.makeList('ul'); break;
+            case 'indent': this.setBlockStyle('paddingLeft', '40px'); break;
+            case 'outdent': this.setBlockStyle('paddingLeft', ''); break;
+            case 'alignleft': this.setBlockStyle('textAlign', 'left'); break;
+            case 'aligncenter': this.setBlockStyle('textAlign', 'center'); break;
+            case 'alignright': this.setBlockStyle('textAlign', 'right'); break;
+            case 'link': this.wrapLink(value); break;
+        }
+        this.save();
+        this.updateToolbar();
+        this.fire('change');
+    };
+
+    Editor.prototype.wrapLink = function (href) {
+        var doc = this.getDoc();
+        this.blocks().forEach(function (block) {
+            var link = doc.createElement('a');
+            link.setAttribute('href', href);
+            while (block.firstChild) {
+                link.appendChild(block.firstChild);
+            }
+            block.appendChild(link);
+        });
+    };
+
+    Editor.prototype.updateToolbar = function () {
+        var indented = this.blocks().some(function (block) { return block.style.paddingLeft; });
+        var outdent = this.toolbar.querySelector('[data-mce-name="outdent"]');
+        if (outdent) {
+            outdent.classList.toggle('tox-tbtn--disabled', !indented);
+        }
+    };
+
+    Editor.prototype.openLinkDialog = function () {
+        var editor = this;
+        var dialog = document.getElementById(this.id + '_tiny_link_dialog');
+        var input = document.getElementById(this.id + '_tiny_link_urlentry');
+        input.value = '';
+        dialog.style.display = 'block';
+        dialog.querySelector('.modal-footer > .btn').onclick = function () {
+            dialog.style.display = 'none';
+            editor.execCommand('link', input.value);
+        };
+    };
+
+    Editor.prototype.init = function (body) {
+        var editor = this;
+        var doc = this.getDoc();
+        doc.open();
+        doc.write('<!DOCTYPE html><html><head></head><body id="tinymce" class="mce-content-body" data-id="' +
+                  this.id + '" contenteditable="true">' + (body || '<p><br></p>') + '</body></html>');
+        doc.close();
+        doc.body.addEventListener('input', function () { editor.save(); editor.fire('input'); });
+        Array.prototype.forEach.call(this.toolbar.querySelectorAll('[data-mce-name]'), function (button) {
+            button.addEventListener('click', function () {
+                var name = button.getAttribute('data-mce-name');
+                if (button.classList.contains('tox-tbtn--disabled')) {
+                    return;
+                }
+                if (name === 'tiny_link_link') {
+                    editor.openLinkDialog();
+                    return;
+                }
+                if (button.hasAttribute('aria-pressed')) {
+                    button.setAttribute('aria-pressed', 'true');
+                }
+                editor.execCommand(name);
+            });
+        });
+        this.initialized = true;
+        this.updateToolbar();
+        this.fire('init');
+    };
+
+    window.tinymce = {
+        get: function (id) {
+            if (id === undefined) {
+                return editors.slice();
+            }
+            return editors.filter(function (editor) { return editor.id === id; })[0] || null;
+        },
+        get activeEditor() {
+            return editors[0] || null;
+        },
+        setup: function (textareaId, initDelay) {
+            var textarea = document.getElementById(textareaId);
+            var toolbar = document.getElementById(textareaId + '_toolbar');
+            var iframe = document.getElementById(textareaId + '_ifr');
+            var editor = new Editor(textarea, toolbar, iframe);
+            editors.push(editor);
+            setTimeout(function () { editor.init(textarea.value); }, initDelay || 0);
+        }
+    };
+})();
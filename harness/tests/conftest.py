@@ -0,0 +1,4 @@
+# Unit tests of the harness; they need neither a browser nor a Moodle site:
+#
+#     python -m pytest harness/tests
+pytest_plugins = ['pytester']
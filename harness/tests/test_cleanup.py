@@ -0,0 +1,133 @@
+import pytest
+
+from harness.cleanup import CreatedAssignments
+from harness.site import SANDBOX_URL, site
+from harness.standin.server import StandinServer
+
+COURSE = 'L01.25-Q'
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = StandinServer().start()
+    monkeypatch.setattr(site, 'base_url', server.url)
+    monkeypatch.setattr(site, 'token', server.token())
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def course(server):
+    return server.state.add_course('Lab 1', COURSE)
+
+
+def names(course):
+    return sorted(activity['name'] for activity in course['activities'])
+
+
+def test_only_the_recorded_assignments_are_deleted(server, course):
+    created = [server.state.add_assignment(course, 'ass_1')['id'] for _ in range(3)]
+    server.state.add_assignment(course, 'ass_1')
+    server.state.add_assignment(course, 'other')
+    assignments = CreatedAssignments()
+    for cmid in created:
+        assignments.add(SANDBOX_URL, COURSE, [cmid])
+        assignments.collect(assignments.recent)
+        assignments.reset()
+
+    assignments.delete_all()
+
+    assert names(course) == ['ass_1', 'other']
+    assert (assignments.deleted, assignments.left) == (3, 0)
+
+
+def test_assignments_reported_twice_or_already_gone_are_not_left(server, course):
+    cmid = server.state.add_assignment(course, 'ass_1')['id']
+    gone = server.state.add_assignment(course, 'ass_1')['id']
+    server.state.delete_activity(gone)
+    assignments = CreatedAssignments()
+    assignments.collect([(SANDBOX_URL, COURSE, cmid), (SANDBOX_URL, COURSE, cmid), (SANDBOX_URL, COURSE, gone)])
+
+    assignments.delete_all()
+
+    assert course['activities'] == []
+    assert (assignments.deleted, assignments.left) == (1, 0)
+    assignments.delete_all()
+    assert assignments.deleted == 1
+
+
+def test_assignments_are_left_without_a_token(server, course, monkeypatch):
+    monkeypatch.setattr(site, 'token', None)
+    server.state.add_assignment(course, 'ass_1')
+    assignments = CreatedAssignments()
+    assignments.collect([(SANDBOX_URL, COURSE, 1), (SANDBOX_URL, COURSE, 2)])
+
+    assignments.delete_all()
+
+    assert names(course) == ['ass_1']
+    assert (assignments.deleted, assignments.left) == (0, 2)
+
+
+class Driver:
+    """Deletes the activities the script is given from the stand-in, like the browser would."""
+
+    def __init__(self, state, fail=False):
+        self.state = state
+        self.fail = fail
+        self.scripts = 0
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, cmids):
+        self.scripts += 1
+        if self.fail:
+            raise RuntimeError('no browser')
+        return [cmid for cmid in cmids if self.state.delete_activity(cmid) is not None]
+
+
+class Case:
+    def __init__(self, driver):
+        self.driver = driver
+
+
+def test_without_a_token_the_test_deletes_its_assignments_with_its_browser(server, course, monkeypatch):
+    monkeypatch.setattr(site, 'token', None)
+    created = [server.state.add_assignment(course, 'ass_1')['id'] for _ in range(3)]
+    server.state.add_assignment(course, 'other')
+    driver = Driver(server.state)
+    assignments = CreatedAssignments()
+    assignments.add(SANDBOX_URL, COURSE, created)
+
+    assignments.delete_recent_in_browser(Case(driver))
+
+    assert names(course) == ['other']
+    assert driver.scripts == 1
+    assert (assignments.recent, assignments.deleted_recent) == ([], 3)
+
+
+def test_assignments_the_browser_could_not_delete_are_left(server, course, monkeypatch, capsys):
+    monkeypatch.setattr(site, 'token', None)
+    cmid = server.state.add_assignment(course, 'ass_1')['id']
+    assignments = CreatedAssignments()
+    assignments.add(SANDBOX_URL, COURSE, [cmid])
+
+    assignments.delete_recent_in_browser(Case(Driver(server.state, fail=True)))
+    assignments.collect(assignments.recent)
+    assignments.delete_all()
+
+    assert names(course) == ['ass_1']
+    assert (assignments.deleted_recent, assignments.left) == (0, 1)
+    assert 'no browser' in capsys.readouterr().out
+
+
+def test_with_a_token_the_browser_leaves_the_assignments_to_the_end(server, course):
+    cmid = server.state.add_assignment(course, 'ass_1')['id']
+    driver = Driver(server.state)
+    assignments = CreatedAssignments()
+    assignments.add(SANDBOX_URL, COURSE, [cmid])
+
+    assignments.delete_recent_in_browser(Case(driver))
+
+    assert driver.scripts == 0
+    assert assignments.recent == [(SANDBOX_URL, COURSE, cmid)]
@@ -0,0 +1,49 @@
+import pytest
+
+from harness.commands import OTHER_PHASE, CommandCounter, budget_failures, command_counter, instrument
+from harness.timing import phase_timer
+
+
+class Driver:
+    def __init__(self):
+        self.sent = []
+
+    def execute(self, driver_command, params=None):
+        self.sent.append(driver_command)
+        return {'value': None}
+
+
+@pytest.fixture
+def counter():
+    command_counter.reset()
+    yield command_counter
+    command_counter.reset()
+
+
+def test_commands_are_counted_by_phase_while_active(counter):
+    driver = Driver()
+    instrument(driver)
+    instrument(driver)
+
+    driver.execute('newSession')
+    counter.active = True
+    driver.execute('get')
+    with phase_timer.phase('login'):
+        driver.execute('findElement')
+        driver.execute('findElement')
+
+    assert driver.sent == ['newSession', 'get', 'findElement', 'findElement']
+    assert counter.counts == {OTHER_PHASE: {'get': 1}, 'login': {'findElement': 2}}
+    assert (counter.total, counter.phase_total('login')) == (3, 2)
+
+
+def test_budgets_are_checked_for_the_test_and_each_phase():
+    counter = CommandCounter()
+    counter.counts = {'login': {'findElement': 5}, 'verify': {'executeAsyncScript': 1}}
+
+    assert budget_failures(counter) == []
+    assert budget_failures(counter, budget=6, phase_budgets={'verify': 1}) == []
+    assert budget_failures(counter, budget=5, phase_budgets={'login': 4, 'open': 0}) == [
+        '6 WebDriver commands, budget is 5',
+        '5 WebDriver commands in phase login, budget is 4',
+    ]
@@ -0,0 +1,106 @@
+import gzip
+
+import pytest
+
+from harness import data
+from harness.data import TEXT_SCHEMA, TYPED_SCHEMA, fit, iter_rows, load_rows, sidecar_path
+
+TYPED_CSV = (
+    'test_name,enabled,minute,ratio,name,mixed\n'
+    "row1,True,5,0.5,'ass 1',1\n"
+    'row2,false,10,1.5,two\\nlines,x\n'
+    'row3,,,,,\n'
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(data, '_cache', {})
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_typed_schema_converts_columns(tmp_path):
+    rows = load_rows(write(tmp_path / 'rows.csv', TYPED_CSV), TYPED_SCHEMA)
+
+    assert [dict(row) for row in rows] == [
+        {'test_name': 'row1', 'enabled': True, 'minute': 5, 'ratio': 0.5, 'name': 'ass 1', 'mixed': 1},
+        {'test_name': 'row2', 'enabled': False, 'minute': 10, 'ratio': 1.5, 'name': 'two\nlines', 'mixed': 'x'},
+        {'test_name': 'row3', 'enabled': '', 'minute': '', 'ratio': '', 'name': '', 'mixed': ''},
+    ]
+
+
+def test_text_schema_strips_quotes_and_keeps_text(tmp_path):
+    rows = load_rows(write(tmp_path / 'rows.csv', "test_name,content\n'a','1'\nb,x\\ty\n"), TEXT_SCHEMA)
+
+    assert [dict(row) for row in rows] == [
+        {'test_name': 'a', 'content': '1'},
+        {'test_name': 'b', 'content': 'x\ty'},
+    ]
+
+
+def test_rows_are_read_only(tmp_path):
+    row = load_rows(write(tmp_path / 'rows.csv', TYPED_CSV), TYPED_SCHEMA)[0]
+
+    with pytest.raises(TypeError):
+        row['minute'] = 6
+
+
+def test_short_and_long_records_fit_the_header():
+    assert fit(['a'], ['x', 'y', 'z']) == ['a', '', '']
+    assert fit(['a', 'b', 'c'], ['x', 'y']) == ['a', 'b']
+
+
+def test_sidecar_is_reused_without_parsing(tmp_path, monkeypatch):
+    path = write(tmp_path / 'rows.csv', TYPED_CSV)
+    rows = load_rows(path, TYPED_SCHEMA)
+    assert sidecar_path(path, TYPED_SCHEMA).is_file()
+
+    monkeypatch.setattr(data, '_cache', {})
+    monkeypatch.setattr(data, 'parse_csv', lambda path, schema: pytest.fail('parsed again'))
+    assert load_rows(path, TYPED_SCHEMA) == rows
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    path = tmp_path / 'rows.csv'
+    load_rows(write(path, TYPED_CSV), TYPED_SCHEMA)
+
+    path.write_text(TYPED_CSV + 'row4,True,1,1.0,four,2\n')
+    rows = load_rows(str(path), TYPED_SCHEMA)
+
+    assert [row['test_name'] for row in rows] == ['row1', 'row2', 'row3', 'row4']
+
+
+def test_sidecar_of_another_loader_version_is_ignored(tmp_path, monkeypatch):
+    path = write(tmp_path / 'rows.csv', TYPED_CSV)
+    load_rows(path, TYPED_SCHEMA)
+
+    monkeypatch.setattr(data, '_cache', {})
+    monkeypatch.setattr(data, 'LOADER_VERSION', data.LOADER_VERSION + 1)
+    parsed = []
+    parse_csv = data.parse_csv
+    monkeypatch.setattr(data, 'parse_csv', lambda *args: parsed.append(args) or parse_csv(*args))
+    load_rows(path, TYPED_SCHEMA)
+
+    assert parsed
+
+
+@pytest.mark.parametrize('schema', [TEXT_SCHEMA, TYPED_SCHEMA])
+def test_streamed_rows_match_loaded_rows(tmp_path, schema):
+    path = write(tmp_path / 'rows.csv', TYPED_CSV)
+
+    assert [dict(row) for row in iter_rows(path, schema)] == [dict(row) for row in load_rows(path, schema)]
+
+
+def test_gzip_files_are_decompressed(tmp_path):
+    path = tmp_path / 'rows.csv.gz'
+    with gzip.open(path, 'wt', newline='') as file:
+        file.write(TYPED_CSV)
+
+    streamed = [dict(row) for row in iter_rows(str(path), TYPED_SCHEMA)]
+
+    assert streamed == [dict(row) for row in load_rows(str(path), TYPED_SCHEMA)]
+    assert streamed[0]['enabled'] is True
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from harness.durations import (
+    DurationHistory, estimate, history_key, load_durations, longest_first, makespan, save_durations,
+)
+
+
+def test_history_key_drops_the_xdist_group():
+    assert history_key('test_a.py::TestA::test_a[Test_1]@lv1') == 'test_a.py::TestA::test_a[Test_1]'
+    assert history_key('test_a.py::TestA::test_a[Test_1]') == 'test_a.py::TestA::test_a[Test_1]'
+
+
+def test_history_adds_up_the_phases_of_a_test():
+    history = DurationHistory()
+    for seconds in (0.5, 2, 0.25):
+        history.record('test_a.py::test_a@group', seconds)
+
+    assert history.durations == {'test_a.py::test_a': 2.75}
+
+
+def test_missing_or_broken_history_is_empty(tmp_path):
+    assert load_durations(tmp_path / 'missing.json') == {}
+    (tmp_path / 'broken.json').write_text('{')
+    assert load_durations(tmp_path / 'broken.json') == {}
+
+
+def test_saved_durations_average_with_the_history(tmp_path):
+    path = tmp_path / 'durations.json'
+    save_durations(path, {'a': 10, 'b': 4})
+
+    merged = save_durations(path, {'a': 20, 'c': 1})
+
+    assert merged == {'a': 15, 'b': 4, 'c': 1}
+    assert json.loads(path.read_text()) == {'durations': merged}
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_unknown_tests_are_expected_to_take_the_average():
+    assert estimate(['a', 'b@g', 'new'], {'a': 1, 'b': 3}) == [1, 3, 2]
+    assert estimate(['new'], {}) == [0]
+
+
+def test_longest_first_keeps_collection_order_for_ties():
+    assert longest_first([1, 5, 3, 5]) == [1, 3, 2, 0]
+
+
+@pytest.mark.parametrize('expected, workers, seconds', [
+    ([5, 4, 3, 3, 3], 2, 10),
+    ([10, 1, 1, 1], 3, 10),
+    ([2, 2], 0, 4),
+    ([], 2, 0),
+])
+def test_makespan_of_longest_first(expected, workers, seconds):
+    assert makespan(expected, workers) == seconds
@@ -0,0 +1,65 @@
+import pytest
+
+from harness.editor import (
+    EDITOR_READY_SCRIPT, SET_EDITOR_CONTENT_SCRIPT, editor_text, set_editor_content, wait_for_editor_ready,
+)
+
+
+class Driver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def set_script_timeout(self, seconds):
+        self.calls.append(('timeout', seconds))
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(('async', script, args))
+        return self.result
+
+
+class Case:
+    def __init__(self, result=None):
+        self.driver = Driver(result)
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        return self.driver.result
+
+
+@pytest.mark.parametrize('typed, read_back', [
+    ('hello world', 'hello world'),
+    ('  two  spaces ', '\xa0 two\xa0 spaces\xa0'),
+    ('a\tb', 'a b'),
+    ('  leading', 'leading'),
+    ('first\n\n last ', 'first\n\nlast'),
+])
+def test_editor_text_matches_what_tinymce_reads_back(typed, read_back):
+    assert editor_text(typed) == editor_text(read_back)
+
+
+def test_editor_text_keeps_words_and_lines_apart():
+    assert editor_text('a b') != editor_text('ab')
+    assert editor_text('a\nb') != editor_text('a b')
+    assert editor_text(None) is None
+
+
+def test_content_is_set_as_lines_in_one_script():
+    case = Case('one\ntwo')
+
+    assert set_editor_content(case, 'one\r\ntwo', frame=1) == 'one\ntwo'
+    assert case.scripts == [(SET_EDITOR_CONTENT_SCRIPT, (1, ['one', 'two']))]
+
+
+def test_content_script_uses_dispatch_when_tinymce_has_it():
+    assert '(editor.dispatch || editor.fire)' in SET_EDITOR_CONTENT_SCRIPT
+    assert "editor.fire('" not in SET_EDITOR_CONTENT_SCRIPT
+
+
+def test_readiness_is_awaited_in_one_async_script():
+    case = Case(True)
+
+    assert wait_for_editor_ready(case, frame=0, timeout=3)
+    assert case.driver.calls == [('timeout', 8), ('async', EDITOR_READY_SCRIPT, (0, 3000))]
+    assert not wait_for_editor_ready(Case(False), timeout=1)
@@ -0,0 +1,35 @@
+from harness.forms import FILL_FORM_SCRIPT, fill_form
+
+
+class Case:
+    def __init__(self, problems=()):
+        self.problems = list(problems)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.problems
+
+
+def test_the_form_is_filled_in_one_script_call_with_editor_text_as_lines():
+    case = Case()
+    fields = [
+        ('text', '#id_name', 'ass_1'),
+        ('editor', 0, 'First line\r\nSecond line\n'),
+        ('checkbox', '#id_showdescription', True),
+        ('select', '#id_duedate_day', '15'),
+    ]
+
+    assert fill_form(case, fields) == []
+    assert case.calls == [(FILL_FORM_SCRIPT, ([
+        ('text', '#id_name', 'ass_1'),
+        ('editor', 0, ['First line', 'Second line', '']),
+        ('checkbox', '#id_showdescription', True),
+        ('select', '#id_duedate_day', '15'),
+    ],))]
+
+
+def test_the_fields_that_could_not_be_filled_are_returned():
+    case = Case(['no element #id_name'])
+
+    assert fill_form(case, [('text', '#id_name', 'ass_1')]) == ['no element #id_name']
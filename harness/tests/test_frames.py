@@ -0,0 +1,108 @@
+import pytest
+
+from harness.frames import UNKNOWN, FrameTrackingMixin, frame_tracker
+
+
+class Case:
+    """The seleniumbase frame methods, recording the switches the browser would do."""
+
+    def __init__(self):
+        self.driver = object()
+        self.calls = []
+
+    def setUp(self):
+        pass
+
+    def switch_to_frame(self, frame='iframe', timeout=None, invisible=False):
+        self.calls.append(('frame', frame))
+
+    def switch_to_parent_frame(self):
+        self.calls.append(('parent',))
+
+    def switch_to_default_content(self):
+        self.calls.append(('default',))
+
+    def open(self, url, **kwargs):
+        self.calls.append(('open', url))
+
+
+class TrackedCase(FrameTrackingMixin, Case):
+    pass
+
+
+@pytest.fixture
+def case(monkeypatch):
+    monkeypatch.setattr(frame_tracker, 'driver', None)
+    monkeypatch.setattr(frame_tracker, 'path', UNKNOWN)
+    frame_tracker.reset_counts()
+    case = TrackedCase()
+    case.setUp()
+    return case
+
+
+@pytest.mark.parametrize('frame, calls, path', [
+    (None, [('default',)], ()),
+    (0, [('default',), ('frame', 0)], (0,)),
+])
+def test_use_frame_from_an_unknown_frame_switches_from_the_page(case, frame, calls, path):
+    case.use_frame(frame)
+
+    assert case.calls == calls
+    assert frame_tracker.current(case.driver) == path
+
+
+def test_use_frame_skips_switches_to_the_current_frame(case):
+    case.use_frame(0)
+    case.calls.clear()
+
+    case.use_frame(0)
+    assert case.calls == []
+    assert frame_tracker.avoided == 1
+
+    case.use_frame(None)
+    case.use_frame(None)
+    assert case.calls == [('default',)]
+    assert frame_tracker.avoided == 2
+
+
+def test_use_frame_leaves_the_other_frame_through_the_page(case):
+    case.use_frame(0)
+    case.calls.clear()
+
+    case.use_frame(1)
+
+    assert case.calls == [('default',), ('frame', 1)]
+    assert frame_tracker.current(case.driver) == (1,)
+
+
+def test_page_load_puts_the_driver_in_the_page(case):
+    case.use_frame(0)
+    case.open('https://sandbox.moodledemo.net/')
+    case.calls.clear()
+
+    case.use_frame(None)
+
+    assert case.calls == []
+
+
+def test_parent_of_an_unknown_frame_stays_unknown(case):
+    case.switch_to_frame(0)
+    assert frame_tracker.current(case.driver) is UNKNOWN
+
+    case.switch_to_parent_frame()
+    assert frame_tracker.current(case.driver) is UNKNOWN
+
+
+def test_another_driver_is_in_an_unknown_frame(case):
+    case.use_frame(None)
+    other = TrackedCase()
+
+    assert frame_tracker.current(other.driver) is UNKNOWN
+
+
+def test_set_up_forgets_the_frame(case):
+    case.use_frame(0)
+
+    case.setUp()
+
+    assert frame_tracker.current(case.driver) is UNKNOWN
@@ -0,0 +1,38 @@
+from harness import memory
+from harness.memory import MB, MemoryMonitor, summarize
+
+
+def test_browsers_over_the_limit_are_retired(monkeypatch):
+    samples = iter([100 * MB, 300 * MB])
+    monkeypatch.setattr(memory, 'browser_memory', lambda driver: next(samples))
+    monitor = MemoryMonitor(limit_mb=200)
+
+    assert not monitor.over_limit('driver')
+    assert monitor.over_limit('driver')
+    assert (monitor.last_sample, monitor.last_retired) == (300 * MB, True)
+    monitor.reset_last()
+    assert (monitor.last_sample, monitor.last_retired) == (None, False)
+
+
+def test_without_a_limit_or_a_sample_browsers_are_kept(monkeypatch):
+    monkeypatch.setattr(memory, 'browser_memory', lambda driver: 900 * MB)
+    assert not MemoryMonitor().over_limit('driver')
+
+    monkeypatch.setattr(memory, 'browser_memory', lambda driver: None)
+    assert not MemoryMonitor(limit_mb=200).over_limit('driver')
+
+
+def test_the_js_heap_is_used_when_the_browser_processes_are_unknown():
+    class Driver:
+        def execute_cdp_cmd(self, command, params):
+            return {'metrics': [{'name': 'Nodes', 'value': 10}, {'name': 'JSHeapUsedSize', 'value': 2.0 * MB}]}
+
+    assert memory.browser_memory(Driver()) == 2 * MB
+
+
+def test_samples_are_summarized_by_worker():
+    stats = summarize([('gw1', 300 * MB, True), ('gw0', 100 * MB, False), ('gw1', 100 * MB, False)])
+
+    assert list(stats) == ['gw0', 'gw1']
+    assert stats['gw0'] == (100, 100, 1, 0)
+    assert stats['gw1'] == (300, 200, 2, 1)
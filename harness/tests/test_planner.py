@@ -0,0 +1,170 @@
+import pytest
+
+from harness import planner
+from harness.planner import RowPlan, finish_row, group_in_order, keep_row_state, row_group_key, start_row
+
+URL = 'https://sandbox.moodledemo.net/'
+
+GROUPED_TEST = '''
+import unittest
+
+from harness.data import TEXT_SCHEMA, load_rows
+from harness.rows import csv_rows, expand_csv_rows
+
+
+class TestRows(unittest.TestCase):
+    url = 'https://sandbox.moodledemo.net/'
+    start_page_sel = '#course'
+
+    def start_row(self, row):
+        pass
+
+    def test_first(self):
+        pass
+
+    @csv_rows('rows.csv')
+    def test_row(self, row):
+        pass
+
+    def test_last(self):
+        pass
+
+expand_csv_rows(TestRows, lambda path: load_rows(path, TEXT_SCHEMA))
+'''
+
+
+class Rows:
+    url = URL
+    start_page_sel = '#course'
+
+
+def test_the_group_key_falls_back_to_the_class_url_and_ignores_the_trailing_slash():
+    assert row_group_key(Rows, {'username': 'teacher'}) == (URL.rstrip('/'), 'teacher', '#course')
+    assert row_group_key(Rows, {'url': URL.rstrip('/'), 'username': 'teacher'}) == row_group_key(
+        Rows, {'username': 'teacher'}
+    )
+    assert row_group_key(Rows, {'url': 'https://other.test/', 'username': 'teacher'})[0] == 'https://other.test'
+
+
+def test_grouping_keeps_the_order_of_the_first_item_of_each_group():
+    items = ['a1', 'b1', 'a2', 'c1', 'b2', 'a3']
+
+    assert group_in_order(items, lambda item: item[0]) == ['a1', 'a2', 'a3', 'b1', 'b2', 'c1']
+
+
+def test_the_plan_counts_the_shared_prefixes():
+    plan = RowPlan([('u', 'teacher', None)] * 3 + [('u', 'student', '#course')] * 2)
+
+    assert (plan.rows, plan.groups, plan.logins_saved) == (5, 2, 3)
+    assert plan.page_loads_saved == 3 * (planner.FULL_PREFIX_PAGE_LOADS - planner.SHARED_PREFIX_PAGE_LOADS)
+    assert plan.lines() == [
+        'row plan: 5 rows in 2 groups, saves 3 logins and 9 page loads',
+        '  3 rows: u as teacher',
+        '  2 rows: u as student -> #course',
+    ]
+
+
+def test_rows_are_run_grouped_by_prefix(pytester):
+    pytester.makefile('.csv', rows=(
+        'test_name,username\n'
+        'Test_1,teacher\nTest_2,student\nTest_3,teacher\nTest_4,admin\nTest_5,student\n'
+    ))
+    pytester.makepyfile(test_rows=GROUPED_TEST)
+
+    result = pytester.runpytest('-p', 'harness.plugin', '-p', 'no:seleniumbase', '--collect-only', '-q')
+
+    tests = [line.split('::')[-1] for line in result.outlines if '::' in line]
+    assert tests == [
+        'test_first', 'test_last',
+        'test_row[Test_1]', 'test_row[Test_3]', 'test_row[Test_2]', 'test_row[Test_5]', 'test_row[Test_4]',
+    ]
+    result.stdout.fnmatch_lines(['row plan: 5 rows in 3 groups, saves 2 logins and 6 page loads'])
+
+
+class Case:
+    """The seleniumbase calls `start_row` and `finish_row` make, recorded."""
+
+    _reuse_session = True
+
+    def __init__(self):
+        self.driver = object()
+        self.calls = []
+        self.page = None
+
+    def open_page_with_retries(self, url):
+        self.calls.append(('open', url))
+        self.page = url
+
+    def execute_script(self, script):
+        pass
+
+    def set_window_size(self, width, height):
+        pass
+
+    def wait_for_ready_state_complete(self):
+        pass
+
+    def login(self, username, password):
+        self.calls.append(('login', username))
+        self.page = URL + 'my/'
+
+    def click(self, selector):
+        self.calls.append(('click', selector))
+        self.page = URL + 'course/view.php?id=2'
+
+    def get_current_url(self):
+        return self.page
+
+    def logout(self):
+        self.calls.append(('logout',))
+
+
+@pytest.fixture
+def row_setup(monkeypatch):
+    setup = planner.RowSetup()
+    monkeypatch.setattr(planner, 'row_setup', setup)
+    return setup
+
+
+def run_row(case, row_setup, username, next_username):
+    row_setup.next_key = (URL.rstrip('/'), next_username, '#course') if next_username else None
+    start_row(case, URL, username, 'sandbox24', '#course')
+    finish_row(case)
+
+
+def test_the_next_row_of_the_group_only_reopens_the_start_page(row_setup):
+    case = Case()
+
+    run_row(case, row_setup, 'teacher', 'teacher')
+    assert row_setup.prefix == 'full'
+    assert keep_row_state(case.driver)
+    case.calls.clear()
+    run_row(case, row_setup, 'teacher', None)
+
+    assert row_setup.prefix == 'shared'
+    assert case.calls == [('open', URL + 'course/view.php?id=2'), ('logout',)]
+    assert row_setup.driver is None
+
+
+def test_a_row_of_another_group_logs_out_and_runs_the_full_prefix(row_setup):
+    case = Case()
+    run_row(case, row_setup, 'teacher', 'teacher')
+    case.calls.clear()
+
+    # The row planned next failed before it started; a row of another group follows.
+    run_row(case, row_setup, 'student', None)
+
+    assert row_setup.prefix == 'full'
+    assert case.calls == [
+        ('logout',), ('open', URL), ('login', 'student'), ('click', '#course'), ('logout',),
+    ]
+
+
+def test_the_prefix_is_not_shared_once_the_browser_state_is_reset(row_setup):
+    case = Case()
+    row_setup.next_key = None
+    start_row(case, URL, 'teacher', 'sandbox24', '#course')
+
+    assert not keep_row_state(case.driver)
+    assert row_setup.driver is None
+    assert not keep_row_state(Case().driver)
@@ -0,0 +1,156 @@
+import pytest
+
+from harness import pool
+from harness.pool import BrowserPool, BrowserPoolMixin, browser_pool
+
+
+class Driver:
+    """A browser answering the WebDriver commands the pool sends."""
+
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.quit_calls = 0
+        self.pages = []
+        self.window_handles = ['main']
+        self.switch_to = self
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError('browser died')
+        return 1
+
+    def window(self, handle):
+        pass
+
+    def default_content(self):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_given_back_browsers_are_reset_and_lent_again():
+    browsers = BrowserPool(size=1)
+    driver = Driver()
+
+    browsers.give_back(driver)
+
+    assert driver.pages == ['about:blank']
+    assert browsers.borrow() is driver
+    assert browsers.reused == 1
+    assert browsers.borrow() is None
+
+
+def test_browsers_over_the_pool_size_are_quit():
+    browsers = BrowserPool(size=1)
+    first, second = Driver(), Driver()
+
+    browsers.give_back(first)
+    browsers.give_back(second)
+
+    assert (first.quit_calls, second.quit_calls) == (0, 1)
+
+
+def test_dead_browsers_are_not_lent():
+    browsers = BrowserPool()
+    driver = Driver()
+    browsers.give_back(driver)
+    driver.healthy = False
+
+    assert browsers.borrow() is None
+    assert driver.quit_calls == 1
+
+
+def test_browsers_kept_dirty_are_reset_unless_the_borrower_keeps_their_state():
+    browsers = BrowserPool()
+    driver = Driver()
+    browsers.give_back(driver, reset=False)
+
+    assert browsers.borrow(keep_state=lambda driver: True) is driver
+    assert driver.pages == []
+
+    browsers.give_back(driver, reset=False)
+    assert browsers.borrow(keep_state=lambda driver: False) is driver
+    assert driver.pages == ['about:blank']
+
+
+class Case:
+    """The seleniumbase driver bookkeeping, with launches and quits recorded."""
+
+    def __init__(self):
+        self.browser = 'chrome'
+        self.driver = None
+        self._drivers_list = []
+        self._drivers_browser_map = {}
+        self.launched = []
+
+    def get_new_driver(self, browser=None, switch_to=True, **kwargs):
+        driver = Driver()
+        self.launched.append(driver)
+        self._drivers_list.append(driver)
+        self._drivers_browser_map[driver] = browser or self.browser
+        if switch_to:
+            self.driver = driver
+            self.browser = browser or self.browser
+        return driver
+
+    def tearDown(self):
+        for driver in self._drivers_list:
+            driver.quit()
+
+
+class PooledCase(BrowserPoolMixin, Case):
+    pass
+
+
+@pytest.fixture
+def browsers(monkeypatch):
+    browsers = BrowserPool()
+    for name in ('enabled', 'size', 'launched', 'reused', 'last_borrow', '_idle'):
+        monkeypatch.setattr(browser_pool, name, getattr(browsers, name))
+    monkeypatch.setattr(pool.memory_monitor, 'over_limit', lambda driver: False)
+    return browser_pool
+
+
+def test_the_next_test_reuses_the_browser(browsers):
+    first = PooledCase()
+    driver = first.get_new_driver(browser='chrome')
+    first.tearDown()
+
+    second = PooledCase()
+    assert second.get_new_driver(browser='chrome') is driver
+    assert (browsers.launched, browsers.reused, browsers.last_borrow) == (1, 1, 'reused')
+    assert driver.quit_calls == 0
+    assert second.launched == []
+
+
+def test_reused_browsers_get_the_seleniumbase_bookkeeping(browsers):
+    first = PooledCase()
+    driver = first.get_new_driver(browser='edge')
+    first.tearDown()
+    assert first._drivers_list == [] and first._drivers_browser_map == {}
+
+    second = PooledCase()
+    second.get_new_driver(browser='edge')
+
+    assert second.driver is driver
+    assert second.browser == 'edge'
+    assert second._drivers_list == [driver]
+    assert second._drivers_browser_map == {driver: 'edge'}
+
+
+def test_extra_browsers_are_not_pooled(browsers):
+    case = PooledCase()
+    main = case.get_new_driver()
+    extra = case.get_new_driver(switch_to=False)
+    case.tearDown()
+
+    assert extra.quit_calls == 1
+    assert main.quit_calls == 0
+    assert browsers.borrow() is main
@@ -0,0 +1,82 @@
+import pytest
+
+from harness.provision import MoodleApi, MoodleApiError, encode_params
+from harness.standin.server import StandinServer
+
+
+@pytest.fixture
+def server():
+    server = StandinServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def api(server):
+    return MoodleApi(server.url, server.token())
+
+
+def test_params_are_flattened_like_moodle_forms():
+    fields = encode_params({'courses': [{'fullname': 'L01', 'visible': True}], 'courseids': [3, 4]})
+
+    assert fields == [
+        ('courses[0][fullname]', 'L01'),
+        ('courses[0][visible]', 1),
+        ('courseids[0]', 3),
+        ('courseids[1]', 4),
+    ]
+
+
+def test_token_of_a_user(server):
+    token = MoodleApi.request_token(server.url, 'admin', 'sandbox24')
+
+    assert token == server.token()
+    with pytest.raises(MoodleApiError, match='Invalid login'):
+        MoodleApi.request_token(server.url, 'admin', 'wrong')
+
+
+def test_course_is_created_once(api):
+    course_id, created = api.ensure_course('Lab 1', 'L01.25-Q', 'L01')
+
+    assert created
+    assert api.ensure_course('Lab 1', 'L01.25-Q') == (course_id, False)
+    assert api.find_course('L01.25-Q')['fullname'] == 'Lab 1'
+    assert api.find_course('missing') is None
+
+
+def test_moodle_exceptions_raise(api):
+    api.create_course('Lab 1', 'L01.25-Q')
+
+    with pytest.raises(MoodleApiError, match='Short name is already used'):
+        api.create_course('Lab 1 again', 'L01.25-Q')
+
+
+def test_invalid_token_raises(server):
+    with pytest.raises(MoodleApiError, match='Invalid token'):
+        MoodleApi(server.url, 'not a token').find_course('L01.25-Q')
+
+
+def test_unreachable_site_raises():
+    server = StandinServer()
+    url = server.url
+    server.server_close()
+
+    with pytest.raises(MoodleApiError):
+        MoodleApi(url, 'token', timeout=2).find_course('L01.25-Q')
+
+
+def test_assignments_are_listed_and_deleted_by_course_module_id(server, api):
+    course_id = api.create_course('Lab 1', 'L01.25-Q')
+    course = server.state.course(course_id)
+    first = server.state.add_assignment(course, 'ass_1')
+    second = server.state.add_assignment(course, 'ass_1')
+
+    assignments = api.course_assignments(course_id)
+    assert [(assignment['cmid'], assignment['name']) for assignment in assignments] == [
+        (first['id'], 'ass_1'), (second['id'], 'ass_1'),
+    ]
+
+    api.delete_modules([first['id']])
+    assert [assignment['cmid'] for assignment in api.course_assignments(course_id)] == [second['id']]
+    with pytest.raises(MoodleApiError, match='Invalid course module'):
+        api.delete_modules([first['id']])
@@ -0,0 +1,139 @@
+import importlib.util
+import sys
+import textwrap
+
+import pytest
+
+from harness import results
+from harness.results import ResultCache, row_hash, source_digest
+
+ROW_TEST = '''
+import unittest
+
+from harness.data import TEXT_SCHEMA, load_rows
+from harness.rows import csv_rows, expand_csv_rows
+
+
+class TestRows(unittest.TestCase):
+    @csv_rows('rows.csv')
+    def test_row(self, row):
+        assert row['expected'] == 'pass'
+
+expand_csv_rows(TestRows, lambda path: load_rows(path, TEXT_SCHEMA))
+'''
+
+
+@pytest.fixture
+def test_class(tmp_path, monkeypatch):
+    """Returns a function importing a test class `Test` from module source, in a file of its own."""
+    def load(source, name='case_module'):
+        path = tmp_path / f'{name}.py'
+        path.write_text(textwrap.dedent(source))
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, name, module)
+        spec.loader.exec_module(module)
+        return module.Test
+    source_digest.cache_clear()
+    yield load
+    source_digest.cache_clear()
+
+
+def test_passed_rows_with_the_same_hash_are_unchanged():
+    cache = ResultCache()
+    for when in ('setup', 'call', 'teardown'):
+        cache.record('test_a.py::Test::test[Test_1]@group', 'hash', when, True)
+    cache.previous = cache.merged()
+
+    assert cache.is_unchanged('test_a.py::Test::test[Test_1]', 'hash')
+    assert not cache.is_unchanged('test_a.py::Test::test[Test_1]', 'other hash')
+    assert not cache.is_unchanged('test_a.py::Test::test[Test_2]', 'hash')
+
+
+def test_a_failed_phase_fails_the_row():
+    cache = ResultCache()
+    cache.record('test_a.py::test', 'hash', 'setup', True)
+    cache.record('test_a.py::test', 'hash', 'call', False)
+    cache.record('test_a.py::test', 'hash', 'teardown', True)
+    cache.previous = cache.merged()
+
+    assert not cache.is_unchanged('test_a.py::test', 'hash')
+
+
+def test_results_of_this_run_replace_the_previous_ones():
+    cache = ResultCache()
+    cache.previous = {'a': ['old', True], 'b': ['old', True]}
+    cache.record('a', 'new', 'setup', False)
+
+    assert cache.merged() == {'a': ['new', False], 'b': ['old', True]}
+
+
+def test_any_column_changes_the_row_hash(test_class):
+    Test = test_class('class Test:\n    pass\n')
+    row = {'test_name': 'Test_1', 'username': 'admin', 'content': 'hello'}
+
+    assert row_hash(Test, row) == row_hash(Test, dict(row))
+    assert row_hash(Test, row) != row_hash(Test, dict(row, content='hello!'))
+
+
+def test_editing_the_test_module_changes_the_row_hash(test_class):
+    row = {'test_name': 'Test_1'}
+    before = row_hash(test_class('class Test:\n    pass\n'), row)
+    source_digest.cache_clear()
+
+    assert row_hash(test_class('class Test:\n    timeout = 5\n'), row) != before
+
+
+def test_editing_a_harness_helper_changes_the_row_hash(test_class, tmp_path, monkeypatch):
+    harness = tmp_path / 'harness'
+    harness.mkdir()
+    (harness / 'waits.py').write_text('TIMEOUT = 5\n')
+    (harness / 'tests').mkdir()
+    (harness / 'tests' / 'test_waits.py').write_text('')
+    monkeypatch.setattr(results, 'HARNESS', harness)
+    Test = test_class('class Test:\n    pass\n')
+    before = source_digest(Test)
+
+    (harness / 'tests' / 'test_waits.py').write_text('def test_waits():\n    pass\n')
+    source_digest.cache_clear()
+    assert source_digest(Test) == before
+
+    (harness / 'waits.py').write_text('TIMEOUT = 10\n')
+    source_digest.cache_clear()
+    assert source_digest(Test) != before
+
+
+def test_the_harness_and_suite_conftest_are_hashed():
+    paths = {path.name for path in results.harness_files()}
+    assert {'planner.py', 'editor.py', 'waits.py', 'forms.py', 'session.py', 'retry.py', 'data.py'} <= paths
+    assert 'test_results.py' not in paths
+
+    suite = results.ROOT / 'editor-format-lv1'
+    assert results.conftest_files(suite) == [suite / 'conftest.py']
+
+
+@pytest.fixture
+def row_suite(pytester):
+    pytester.makefile('.csv', rows='test_name,expected\nTest_1,pass\nTest_2,pass\nTest_3,fail\n')
+    pytester.makepyfile(test_rows=ROW_TEST)
+    return pytester
+
+
+def run_incremental(pytester):
+    return pytester.runpytest('-p', 'harness.plugin', '-p', 'no:seleniumbase', '--incremental', '-rs')
+
+
+def test_incremental_runs_only_changed_or_failed_rows(row_suite):
+    run_incremental(row_suite).assert_outcomes(passed=2, failed=1)
+
+    run_incremental(row_suite).assert_outcomes(skipped=2, failed=1)
+
+    row_suite.makefile('.csv', rows='test_name,expected\nTest_1,pass\nTest_2,pass\nTest_3,pass\n')
+    run_incremental(row_suite).assert_outcomes(passed=1, skipped=2)
+
+
+def test_incremental_runs_every_row_again_after_the_test_changed(row_suite):
+    run_incremental(row_suite)
+
+    row_suite.makepyfile(test_rows=ROW_TEST + '\n# Edited.\n')
+    run_incremental(row_suite).assert_outcomes(passed=2, failed=1)
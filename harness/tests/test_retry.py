@@ -0,0 +1,113 @@
+import pytest
+
+from harness import retry
+from harness.retry import CircuitBreaker, CircuitOpenError, RetryPolicy, site_breaker
+
+
+def attempts_from(results):
+    """Returns an attempt giving `results` in turn, raising the exceptions among them."""
+    results = iter(results)
+
+    def attempt():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return attempt
+
+
+def test_until_retries_until_success():
+    sleeps = []
+    retried = []
+    policy = RetryPolicy(attempts=5, delay=1, backoff=2, jitter=0)
+
+    result = policy.until(attempts_from([False, ValueError('down'), 'page']), sleep=sleeps.append,
+                          on_retry=lambda number, error: retried.append((number, type(error))))
+
+    assert result == 'page'
+    assert sleeps == [1, 2]
+    assert retried == [(1, type(None)), (2, ValueError)]
+
+
+def test_until_raises_the_last_error_after_the_attempts():
+    policy = RetryPolicy(attempts=2, jitter=0)
+
+    with pytest.raises(KeyError):
+        policy.until(attempts_from([ValueError(), KeyError()]), sleep=lambda seconds: None)
+
+
+def test_until_returns_the_last_falsy_result_after_the_attempts():
+    assert RetryPolicy(attempts=3, jitter=0).until(attempts_from([None, 0, '']), sleep=lambda seconds: None) == ''
+
+
+def test_errors_not_retried_propagate_at_once():
+    policy = RetryPolicy(attempts=3, retry_on=(ValueError,))
+
+    with pytest.raises(KeyError):
+        policy.until(attempts_from([KeyError(), True]), sleep=pytest.fail)
+
+
+def test_delays_grow_up_to_the_maximum():
+    policy = RetryPolicy(delay=1, backoff=3, max_delay=5, jitter=0)
+
+    assert [policy.delay_after(attempt) for attempt in (1, 2, 3)] == [1, 3, 5]
+
+
+def test_jitter_stays_within_its_fraction():
+    policy = RetryPolicy(delay=10, jitter=0.2)
+
+    assert all(8 <= policy.delay_after(1) <= 12 for _ in range(100))
+
+
+def test_deadline_shortens_the_last_wait(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(retry.time, 'monotonic', lambda: clock[0])
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    policy = RetryPolicy(attempts=None, delay=4, backoff=1, jitter=0, deadline=10)
+    assert not policy.until(lambda: False, sleep=sleep)
+    assert sleeps == [4, 4, 2]
+
+
+def test_call_returns_the_result_of_the_function():
+    assert RetryPolicy(jitter=0).call(attempts_from([OSError(), 0]), sleep=lambda seconds: None) == 0
+
+
+def test_open_breaker_refuses_tries():
+    breaker = CircuitBreaker(threshold=2, reset_after=60)
+    policy = RetryPolicy(attempts=5, jitter=0)
+
+    with pytest.raises(CircuitOpenError):
+        policy.until(lambda: False, sleep=lambda seconds: None, breaker=breaker)
+    assert breaker.failures == 2
+    with pytest.raises(CircuitOpenError):
+        policy.until(pytest.fail, sleep=lambda seconds: None, breaker=breaker)
+
+
+def test_breaker_lets_a_trial_through_after_the_reset_time(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(retry.time, 'monotonic', lambda: clock[0])
+    breaker = CircuitBreaker(threshold=1, reset_after=30)
+    breaker.failure()
+    assert not breaker.allow()
+
+    clock[0] = 31
+    assert RetryPolicy().until(lambda: True, breaker=breaker)
+    assert breaker.failures == 0 and not breaker.is_open
+
+
+def test_sites_have_one_breaker_each(monkeypatch):
+    monkeypatch.setattr(retry, 'breakers', {})
+
+    assert site_breaker('https://a.example/login') is site_breaker('https://a.example/course/view.php?id=2')
+    assert site_breaker('https://a.example/') is not site_breaker('https://b.example/')
+
+
+def test_copy_changes_only_the_given_settings():
+    policy = RetryPolicy(attempts=4, delay=2).copy(delay=0)
+
+    assert (policy.attempts, policy.delay) == (4, 0)
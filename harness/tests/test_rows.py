@@ -0,0 +1,75 @@
+import contextlib
+
+import pytest
+
+from harness.rows import csv_rows, csv_stream, expand_csv_rows, is_skipped_row, row_ids, with_next
+
+ROWS = [
+    {'test_name': 'Test_1', 'value': 'a'},
+    {'test_name': 'Test_2', 'value': 'b', '_skip_': 'TRUE'},
+    {'test_name': 'Test_3', 'value': 'c', '_skip_': False},
+]
+
+
+def test_row_ids_number_duplicates_and_rows_without_name():
+    rows = [{'test_name': 'login'}, {'test_name': ''}, {'test_name': 'login'}, {}]
+
+    assert row_ids(rows) == ['login0', 'Test_2', 'login1', 'Test_4']
+
+
+@pytest.mark.parametrize('value, skipped', [(True, True), (' true ', True), ('False', False), ('', False)])
+def test_rows_are_skipped_with_a_truthy_skip_column(value, skipped):
+    assert is_skipped_row({'_skip_': value}) is skipped
+
+
+def test_with_next_reads_one_item_ahead():
+    assert list(with_next([1, 2, 3])) == [(1, 2), (2, 3), (3, None)]
+    assert list(with_next([])) == []
+
+
+def test_each_row_becomes_a_test_method():
+    read = []
+
+    class Test:
+        @csv_rows('rows.csv')
+        def test_row(self, row):
+            """Checks a row."""
+            return row['value']
+
+    expand_csv_rows(Test, lambda path: read.append(path) or ROWS)
+
+    assert read[0].endswith('rows.csv')
+    assert not hasattr(Test, 'test_row')
+    assert [name for name in vars(Test) if name.startswith('test_')] == ['test_row[Test_1]', 'test_row[Test_3]']
+    method = getattr(Test, 'test_row[Test_3]')
+    assert method(Test()) == 'c'
+    assert method.csv_row is ROWS[2]
+    assert method.__doc__ == 'Checks a row.'
+
+
+class SubTests:
+    """Records the unittest subTests run, by row."""
+
+    def __init__(self):
+        self.rows = []
+
+    def subTest(self, row):
+        self.rows.append(row)
+        return contextlib.nullcontext()
+
+
+def test_stream_rows_run_in_one_test_as_they_are_read():
+    seen = []
+
+    class Test(SubTests):
+        @csv_stream('rows.csv.gz')
+        def test_rows(self, row):
+            seen.append(row['value'])
+
+    expand_csv_rows(Test, lambda path: pytest.fail('streamed files are not read up front'), lambda path: iter(ROWS))
+    case = Test()
+    Test.test_rows(case)
+
+    assert Test.test_rows.csv_stream.endswith('rows.csv.gz')
+    assert seen == ['a', 'c']
+    assert case.rows == ['Test_1', 'Test_3']
@@ -0,0 +1,106 @@
+import heapq
+
+import pytest
+
+pytest.importorskip('xdist')
+
+from harness.schedule import QUEUED_PER_WORKER, LongestFirstScheduling  # noqa: E402
+
+
+class Config:
+    """The options pytest-xdist schedulers read, for `workers` local workers."""
+
+    def __init__(self, workers):
+        self.options = {'tx': [f'{workers}*popen'], 'maxschedchunk': None}
+
+    def getvalue(self, name):
+        return self.options[name]
+
+    getoption = getvalue
+
+
+class Gateway:
+    def __init__(self, name):
+        self.id = name
+
+
+class Node:
+    """A pytest-xdist worker that only records the tests it is sent."""
+
+    def __init__(self, name):
+        self.name = name
+        self.gateway = Gateway(name)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+    def __repr__(self):
+        return self.name
+
+
+def scheduler_for(durations, collection, workers):
+    scheduler = LongestFirstScheduling(Config(workers), None, durations)
+    nodes = [Node(f'gw{index}') for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def run(scheduler, nodes, seconds):
+    """Runs the tests each worker was sent, one at a time, and returns when the last one finishes."""
+    started = {node: 0 for node in nodes}
+    running = [(seconds[node.sent[0]], node.name, node) for node in nodes if node.sent]
+    heapq.heapify(running)
+    finished = 0
+    while running:
+        now, _, node = heapq.heappop(running)
+        index = node.sent[started[node]]
+        started[node] += 1
+        scheduler.mark_test_complete(node, index, seconds[index])
+        finished = now
+        if started[node] < len(node.sent):
+            heapq.heappush(running, (now + seconds[node.sent[started[node]]], node.name, node))
+    return finished
+
+
+def test_longest_tests_start_first_on_different_workers():
+    collection = ['short_a', 'long', 'short_b', 'longer', 'medium']
+    durations = {'short_a': 1, 'long': 8, 'short_b': 1, 'longer': 9, 'medium': 4}
+
+    scheduler, (first, second) = scheduler_for(durations, collection, 2)
+
+    assert [collection[index] for index in first.sent] == ['longer', 'medium']
+    assert [collection[index] for index in second.sent] == ['long', 'short_a']
+    assert all(len(scheduler.node2pending[node]) == QUEUED_PER_WORKER for node in (first, second))
+
+
+def test_every_test_runs_once_close_to_the_prediction():
+    collection = [f'test_{index}@group' for index in range(9)]
+    seconds = [3, 1, 7, 2, 2, 5, 1, 4, 6]
+    durations = {f'test_{index}': value for index, value in enumerate(seconds)}
+
+    scheduler, nodes = scheduler_for(durations, collection, 3)
+    finished = run(scheduler, nodes, seconds)
+
+    assert sorted(index for node in nodes for index in node.sent) == list(range(9))
+    assert all(node.shutting_down for node in nodes)
+    # Each worker queues its next test before finishing the current one, which can add up to one test.
+    predicted, workers = scheduler.predicted
+    assert workers == 3
+    assert predicted <= finished <= predicted + max(seconds)
+
+
+def test_tests_without_history_run_in_collection_order():
+    collection = ['a', 'b', 'c', 'd']
+
+    scheduler, (node,) = scheduler_for({}, collection, 1)
+    run(scheduler, [node], [1, 1, 1, 1])
+
+    assert node.sent == [0, 1, 2, 3]
@@ -0,0 +1,87 @@
+import textwrap
+
+import pytest
+
+from harness.shards import Sharding, method_id, row_key, shard_key, shard_of
+
+ROWS_CSV = 'test_name,username,editor_content\nTest_1,admin,hello\nTest_2,admin,world\n'
+
+ROW_TEST = '''
+import unittest
+
+from harness.data import TEXT_SCHEMA, iter_rows, load_rows
+from harness.rows import csv_rows, csv_stream, expand_csv_rows
+
+
+class Test{name}(unittest.TestCase):
+    @csv_rows('rows.csv')
+    def test_{name}(self, row):
+        pass
+
+expand_csv_rows(Test{name}, lambda path: load_rows(path, TEXT_SCHEMA), lambda path: iter_rows(path, TEXT_SCHEMA))
+'''
+
+
+def sharded(count, index, rows):
+    sharding = Sharding()
+    sharding.count, sharding.index = count, index
+    return [(test, row) for test, row in rows if sharding.owns_row(test, row)]
+
+
+def test_shards_do_not_change_between_runs():
+    assert shard_of('row', 7) == shard_of('row', 7)
+    assert {shard_of(str(number), 3) for number in range(100)} == {0, 1, 2}
+
+
+def test_method_id_leaves_out_the_row_id():
+    class TestBold:
+        pass
+
+    assert method_id(TestBold, 'test_bold[Test_1]') == method_id(TestBold, 'test_bold')
+    assert method_id(TestBold, 'test_bold').endswith('TestBold::test_bold')
+
+
+def test_row_key_ignores_column_order():
+    assert row_key({'test_name': 'a', 'x': 1, 'y': 2}) == row_key({'y': 2, 'x': 1, 'test_name': 'a'})
+
+
+def test_one_shard_owns_everything():
+    assert Sharding().owns_row('module::Test::test', {'test_name': 'a'})
+
+
+def test_identical_rows_of_different_tests_spread_over_the_shards():
+    rows = [(f'test_module::TestCase{number}::test_case{number}', {'test_name': 'Test_1', 'content': 'same'})
+            for number in range(30)]
+    assert len({shard_key(test, row) for test, row in rows}) == 30
+
+    shards = [sharded(3, index, rows) for index in range(3)]
+
+    assert sorted(entry for shard in shards for entry in shard) == sorted(rows)
+    assert all(len(shard) >= 5 for shard in shards)
+
+
+@pytest.fixture
+def identical_suites(pytester):
+    """Ten test modules whose CSV files are identical, like editor-format-lv1."""
+    for name in ('bold', 'italic', 'link', 'align_left', 'align_right', 'align_center',
+                 'indent_increase', 'indent_decrease', 'bullet_list', 'number_list'):
+        directory = pytester.mkpydir(name)
+        (directory / 'rows.csv').write_text(ROWS_CSV)
+        (directory / f'test_{name}.py').write_text(textwrap.dedent(ROW_TEST.format(name=name)))
+    return pytester
+
+
+def collected(pytester, *args):
+    result = pytester.runpytest('-p', 'harness.plugin', '-p', 'no:seleniumbase', '--collect-only', '-q', *args)
+    return {line for line in result.outlines if '::' in line}
+
+
+def test_shards_of_identical_csv_files_are_disjoint_and_balanced(identical_suites):
+    everything = collected(identical_suites)
+    assert len(everything) == 20
+
+    shards = [collected(identical_suites, '--shard-count', '4', '--shard-index', str(index)) for index in range(4)]
+
+    assert set.union(*shards) == everything
+    assert sum(len(shard) for shard in shards) == 20
+    assert all(2 <= len(shard) <= 8 for shard in shards)
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from harness.shared import SharedSetup, marker_name
+
+
+def test_marker_names_are_file_names():
+    assert marker_name('course L01.25-Q on http://127.0.0.1:41234') == 'course_L01.25-Q_on_http_127.0.0.1_41234'
+
+
+def test_a_step_runs_once(tmp_path):
+    calls = []
+    first, second = SharedSetup(tmp_path), SharedSetup(tmp_path)
+
+    assert first.once('course', lambda: calls.append(1))
+    assert not first.once('course', lambda: calls.append(2))
+    assert not second.once('course', lambda: calls.append(3))
+    assert calls == [1]
+
+
+def test_sites_differing_only_in_port_have_their_own_step(tmp_path):
+    calls = []
+    shared = SharedSetup(tmp_path)
+
+    shared.once('course L01.25-Q on http://127.0.0.1:41234', lambda: calls.append(41234))
+    shared.once('course L01.25-Q on http://127.0.0.1:5555', lambda: calls.append(5555))
+
+    assert calls == [41234, 5555]
+    assert sorted(path.name for path in tmp_path.glob('*.done')) == [
+        'course_L01.25-Q_on_http_127.0.0.1_41234.done',
+        'course_L01.25-Q_on_http_127.0.0.1_5555.done',
+    ]
+
+
+def test_a_failed_step_is_tried_again(tmp_path):
+    shared = SharedSetup(tmp_path)
+
+    def fail():
+        raise RuntimeError('site down')
+
+    with pytest.raises(RuntimeError):
+        shared.once('course', fail)
+    assert shared.once('course', lambda: None)
+
+
+def test_concurrent_steps_wait_for_the_first(tmp_path):
+    calls = []
+    started = threading.Barrier(4)
+
+    def run():
+        started.wait()
+        SharedSetup(tmp_path).once('course', lambda: calls.append(threading.get_ident()))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
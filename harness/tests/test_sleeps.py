@@ -0,0 +1,45 @@
+import textwrap
+
+from harness.sleeps import rank, sleep_profiler
+
+# Test code outside the harness, like the suite base classes.
+CASE_SOURCE = '''
+from harness.retry import RetryPolicy
+from harness.sleeps import SleepProfilingMixin
+
+
+class Case:
+    def sleep(self, seconds):
+        pass
+
+
+class ProfiledCase(SleepProfilingMixin, Case):
+    def open_page_with_retries(self):
+        RetryPolicy(attempts=2, jitter=0).until(lambda: False, sleep=self.sleep)
+
+    def verify_with_retries(self):
+        RetryPolicy(attempts=2, jitter=0).until(lambda: False, sleep=lambda seconds: self.sleep(seconds, lambda: True))
+'''
+
+
+def test_sleeps_are_charged_to_the_test_code_asking_for_them(tmp_path, monkeypatch):
+    path = tmp_path / 'base_case.py'
+    path.write_text(textwrap.dedent(CASE_SOURCE))
+    namespace = {}
+    exec(compile(path.read_text(), str(path), 'exec'), namespace)
+    monkeypatch.setattr(sleep_profiler, 'enabled', True)
+    monkeypatch.setattr(sleep_profiler, 'records', [])
+
+    namespace['ProfiledCase']().open_page_with_retries()
+    namespace['ProfiledCase']().verify_with_retries()
+
+    sites = [site for site, _, _ in sleep_profiler.records]
+    assert sites[0].endswith('base_case.py:13 (open_page_with_retries)')
+    assert sites[1].endswith('base_case.py:16 (verify_with_retries)')
+    assert [already for _, _, already in sleep_profiler.records] == [None, True]
+
+
+def test_sleeps_are_ranked_by_wasted_seconds():
+    records = [('a', 1, False), ('b', 2, True), ('a', 1, None), ('b', 1, False)]
+
+    assert rank(records) == [('b', 2, 3, 2, 0), ('a', 2, 2, 0, 1)]
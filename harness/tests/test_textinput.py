@@ -0,0 +1,91 @@
+import pytest
+
+from harness.textinput import (
+    CHANGE_SCRIPT, PREPARE_FIELD_SCRIPT, SET_VALUE_SCRIPT, TEXT_INPUT_CDP, TextInputMixin, insert_text,
+)
+
+
+class Driver:
+    """Records the scripts and DevTools commands sent, with the field reporting itself as `kind`."""
+
+    def __init__(self, kind='field'):
+        self.kind = kind
+        self.sent = []
+
+    def execute_script(self, script, *args):
+        self.sent.append(('script', script))
+        return self.kind if script == PREPARE_FIELD_SCRIPT else None
+
+    def execute_cdp_cmd(self, command, params):
+        self.sent.append((command, params.get('type', params.get('text'))))
+
+
+class NoDevToolsDriver:
+    def __init__(self):
+        self.sent = []
+
+    def execute_script(self, script, *args):
+        self.sent.append((script, args))
+
+
+class Case:
+    def __init__(self, driver):
+        self.driver = driver
+        self.typed = []
+
+    def wait_for_element_present(self, selector, by=None):
+        return f'<{selector}>'
+
+    def update_text(self, selector, text):
+        self.typed.append((selector, text))
+
+
+def test_a_field_gets_the_whole_text_in_one_call():
+    driver = Driver()
+
+    insert_text(Case(driver), '#id_name', 'line 1\nline 2')
+
+    assert driver.sent == [
+        ('script', PREPARE_FIELD_SCRIPT),
+        ('Input.insertText', 'line 1\nline 2'),
+        ('script', CHANGE_SCRIPT),
+    ]
+
+
+def test_an_editable_body_gets_each_line_with_enter_between_them():
+    driver = Driver(kind='editable')
+
+    insert_text(Case(driver), '#tinymce', 'line 1\r\n\nline 3')
+
+    assert driver.sent == [
+        ('script', PREPARE_FIELD_SCRIPT),
+        ('Input.insertText', 'line 1'),
+        ('Input.dispatchKeyEvent', 'keyDown'),
+        ('Input.dispatchKeyEvent', 'keyUp'),
+        ('Input.dispatchKeyEvent', 'keyDown'),
+        ('Input.dispatchKeyEvent', 'keyUp'),
+        ('Input.insertText', 'line 3'),
+        ('script', CHANGE_SCRIPT),
+    ]
+
+
+def test_browsers_without_devtools_get_the_value_set_by_script():
+    driver = NoDevToolsDriver()
+
+    insert_text(Case(driver), '#id_name', 'ass_1')
+
+    assert driver.sent == [(SET_VALUE_SCRIPT, ('<#id_name>', 'ass_1'))]
+
+
+class Inputs(TextInputMixin, Case):
+    text_inputs = {'description': TEXT_INPUT_CDP}
+
+
+@pytest.mark.parametrize('helper, cdp', [('description', True), ('login', False), (None, False)])
+def test_helpers_type_unless_their_text_input_is_cdp(helper, cdp):
+    case = Inputs(Driver())
+
+    case.input_text('#field', 12, helper)
+
+    assert bool(case.driver.sent) is cdp
+    assert case.typed == ([] if cdp else [('#field', 12)])
@@ -0,0 +1,65 @@
+import pytest
+
+from harness.timing import PhaseTimingMixin, compare, phase_stats, phase_timer, save_results
+
+
+@pytest.fixture
+def timer(monkeypatch):
+    monkeypatch.setattr(phase_timer, 'enabled', True)
+    phase_timer.reset()
+    yield phase_timer
+    phase_timer.reset()
+
+
+class Case(PhaseTimingMixin):
+    def login(self, username):
+        return phase_timer.current
+
+    def create_course(self):
+        # Nested in create_course: counts for create_course only.
+        return self.login('admin')
+
+    def verify_course(self):
+        return phase_timer.current
+
+    def test_login(self):
+        return phase_timer.current
+
+
+def test_matching_methods_are_timed_as_their_phase(timer):
+    case = Case()
+
+    assert case.login('teacher') == 'login'
+    assert case.create_course() == 'create_course'
+    assert case.verify_course() == 'verify'
+    assert case.test_login() is None
+    assert set(timer.durations) == {'login', 'create_course', 'verify'}
+    assert timer.current is None
+
+
+def test_phase_statistics_use_nearest_rank_percentiles():
+    stats = phase_stats({'login': [float(second) for second in range(1, 21)], 'open': []})
+
+    assert stats == {'login': {'count': 20, 'p50': 10.0, 'p95': 19.0, 'max': 20.0}}
+
+
+def test_only_slowdowns_beyond_the_tolerance_and_the_noise_regress():
+    baseline = {'login': {'p50': 1.0, 'p95': 2.0}, 'open': {'p50': 0.01, 'p95': 0.02}}
+    phases = {
+        'login': {'p50': 1.1, 'p95': 3.0},
+        'open': {'p50': 0.04, 'p95': 0.05},
+        'logout': {'p50': 9.0, 'p95': 9.0},
+    }
+
+    assert compare(phases, baseline, tolerance=0.2) == ['login p95 3.00s > baseline 2.00s +20%']
+
+
+def test_results_of_several_runs_are_merged(tmp_path):
+    path = tmp_path / 'benchmark.json'
+
+    save_results(path, {'login': [1.0, 2.0]})
+    results = save_results(path, {'login': [3.0], 'open': [0.5]})
+
+    assert results['runs'] == 2
+    assert results['samples'] == {'login': [1.0, 2.0, 3.0], 'open': [0.5]}
+    assert results['phases']['login']['max'] == 3.0
@@ -0,0 +1,87 @@
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from harness.waits import batch_verify, describe_failures, wait_for_selector
+
+
+class Driver:
+    """Answers async scripts with `result`, or raises it if it is an exception."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+        self.timeout = None
+
+    def set_script_timeout(self, timeout):
+        self.timeout = timeout
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class Case:
+    """Finds the elements listed in `elements` by (frame, selector), switching frames like seleniumbase."""
+
+    def __init__(self, result, elements=()):
+        self.driver = Driver(result)
+        self.elements = set(elements)
+        self.frame = None
+
+    def switch_to_default_content(self):
+        self.frame = None
+
+    def switch_to_frame(self, frame):
+        self.frame = frame
+
+    def find_elements(self, selector):
+        return ['element'] if (self.frame, selector) in self.elements else []
+
+
+def test_the_wait_runs_as_one_script_with_the_timeout_in_milliseconds():
+    case = Case({'matched': True})
+
+    assert wait_for_selector(case, '#id_name', present=False, timeout=2) is True
+    assert case.driver.calls == [('#id_name', False, 2000)]
+    assert case.driver.timeout == 7
+
+
+def test_a_timeout_is_reported_as_not_matched():
+    assert wait_for_selector(Case({'matched': False}), '#id_name') is False
+
+
+@pytest.mark.parametrize('result', [
+    {'error': 'SyntaxError'},
+    None,
+    JavascriptException('invalid selector'),
+])
+def test_selectors_the_browser_cannot_evaluate_fall_back_to_polling(result):
+    assert wait_for_selector(Case(result), 'span:contains("Save")') is None
+
+
+CHECKS = [(None, '#id_name', True), (0, '#tinymce', 1), (None, '.alert-danger', False)]
+
+
+def test_the_checks_are_verified_in_one_script():
+    case = Case({'ok': False, 'presence': [True, False, True]})
+
+    presence = batch_verify(case, CHECKS, timeout=1)
+
+    assert case.driver.calls == [([[None, '#id_name', True], [0, '#tinymce', True], [None, '.alert-danger', False]], 1000)]
+    assert presence == {(None, '#id_name'): True, (0, '#tinymce'): False, (None, '.alert-danger'): True}
+    assert describe_failures(CHECKS, presence).split('\n') == [
+        "Element with selector '#tinymce' not found in frame 0.",
+        "Element with selector '.alert-danger' still present in page.",
+    ]
+
+
+def test_selectors_the_browser_cannot_evaluate_are_checked_through_the_driver():
+    case = Case({'error': 'SyntaxError'}, elements=[(None, '#id_name'), (0, '#tinymce')])
+
+    presence = batch_verify(case, CHECKS)
+
+    assert presence == {(None, '#id_name'): True, (0, '#tinymce'): True, (None, '.alert-danger'): False}
+    assert describe_failures(CHECKS, presence) == ''
+    assert case.frame is None
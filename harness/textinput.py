@@ -0,0 +1,98 @@
+from selenium.webdriver.common.by import By
+
+# Ways of entering text into a field, per helper.
+TEXT_INPUT_KEYS = 'keys'
+TEXT_INPUT_CDP = 'cdp'
+
+# Empties and focuses the field, leaving the caret where the text goes.
+# Returns 'editable' for contenteditable elements, whose lines are inserted separately.
+PREPARE_FIELD_SCRIPT = """
+var element = arguments[0];
+element.focus();
+if (element.isContentEditable) {
+    element.innerHTML = '<p><br></p>';
+    var range = element.ownerDocument.createRange();
+    range.setStart(element.firstChild, 0);
+    range.collapse(true);
+    var selection = element.ownerDocument.defaultView.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+    return 'editable';
+}
+element.value = '';
+element.dispatchEvent(new Event('input', {bubbles: true}));
+return 'field';
+"""
+
+# Sets the value directly when the browser has no DevTools protocol.
+SET_VALUE_SCRIPT = """
+var element = arguments[0], text = arguments[1];
+if (element.isContentEditable) {
+    element.innerText = text;
+} else {
+    element.value = text;
+}
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
+CHANGE_SCRIPT = "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));"
+
+ENTER_KEY = {'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13, 'nativeVirtualKeyCode': 13}
+
+
+def press_enter(driver):
+    driver.execute_cdp_cmd('Input.dispatchKeyEvent', dict(ENTER_KEY, type='keyDown', text='\r'))
+    driver.execute_cdp_cmd('Input.dispatchKeyEvent', dict(ENTER_KEY, type='keyUp'))
+
+
+def insert_text(case, selector, text, by=By.CSS_SELECTOR):
+    """
+    Replaces the text of a field with one DevTools `Input.insertText` call.
+
+    The browser inserts the text like an input method would, firing the
+    input events of typing, so the number of round trips does not grow
+    with the length of the text. In contenteditable elements (the TinyMCE
+    body), each line is inserted separately with an Enter key between
+    lines. Browsers without the DevTools protocol get the value set by
+    script instead.
+
+    Args:
+        case (BaseCase): The test case whose browser to use.
+        selector (str): The field, in the current frame.
+        text (str): The new text.
+        by (str): How `selector` locates the field.
+    """
+    driver = case.driver
+    element = case.wait_for_element_present(selector, by=by)
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        driver.execute_script(SET_VALUE_SCRIPT, element, text)
+        return
+    kind = driver.execute_script(PREPARE_FIELD_SCRIPT, element)
+    lines = text.replace('\r\n', '\n').split('\n') if kind == 'editable' else [text]
+    for index, line in enumerate(lines):
+        if index:
+            press_enter(driver)
+        if line:
+            driver.execute_cdp_cmd('Input.insertText', {'text': line})
+    driver.execute_script(CHANGE_SCRIPT, element)
+
+
+class TextInputMixin:
+    """
+    Lets helpers choose how they enter text: keystrokes or one DevTools call.
+
+    `input_text(selector, text, helper)` types like `update_text` unless
+    `text_inputs[helper]` (or `text_input` for helpers not listed) is
+    "cdp", which inserts the whole text with `insert_text`.
+    """
+
+    text_input = TEXT_INPUT_KEYS
+    # Maps helper names ("login", "assignment_name", "description", "editor_content") to a text input.
+    text_inputs = {}
+
+    def input_text(self, selector, text, helper=None):
+        if self.text_inputs.get(helper, self.text_input) == TEXT_INPUT_CDP:
+            insert_text(self, selector, str(text))
+        else:
+            self.update_text(selector, text)
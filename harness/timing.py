@@ -0,0 +1,183 @@
+import functools
+import json
+import math
+import time
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+# Slowdowns smaller than this are noise, whatever the relative tolerance.
+MIN_REGRESSION_SECONDS = 0.05
+
+# Test case methods timed as a phase of the row, as (phase, method name pattern).
+# A call nested in another timed call counts for the outer phase only.
+DEFAULT_PHASES = (
+    ('open', 'open_page_with_retries'),
+    ('login', 'login'),
+    ('editor_content', 'switch_and_update_editor_content'),
+    ('verify', 'verify_*'),
+    ('verify', 'safe_verify_*'),
+    ('format', '*_text'),
+    ('format', 'align_text_*'),
+    ('create_course', 'create_course*'),
+    ('create_assignment', 'create_assignment'),
+    ('logout', 'logout'),
+)
+
+
+class PhaseTimer:
+    """
+    Tracks and times the phases of the running test.
+
+    One timer lives in each test process. `current` is the phase running
+    right now (also used to attribute WebDriver commands); when enabled,
+    `durations` holds the seconds spent in each phase by the current test.
+    Both are reset between tests.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.durations = {}
+        self.current = None
+
+    def reset(self):
+        self.durations = {}
+        self.current = None
+
+    @contextmanager
+    def phase(self, name):
+        if self.current is not None:
+            yield
+            return
+        self.current = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current = None
+            if self.enabled:
+                self.durations[name] = self.durations.get(name, 0) + time.perf_counter() - start
+
+
+phase_timer = PhaseTimer()
+
+
+def phase_of(name, phases):
+    """Returns the phase a method name belongs to, or None."""
+    for phase, pattern in phases:
+        if fnmatchcase(name, pattern):
+            return phase
+    return None
+
+
+def timed(phase, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with phase_timer.phase(phase):
+            return func(*args, **kwargs)
+    wrapper.timed_phase = phase
+    return wrapper
+
+
+class PhaseTimingMixin:
+    """
+    Times the methods of test cases matching `timed_phases` with `phase_timer`.
+
+    Methods are wrapped when their class is created, so helpers defined in
+    the base classes and in the tests are both timed. The wrappers only
+    measure time when the timer is enabled (pytest `--benchmark`).
+    """
+
+    timed_phases = DEFAULT_PHASES
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if not callable(value) or name.startswith('test') or hasattr(value, 'timed_phase'):
+                continue
+            phase = phase_of(name, cls.timed_phases)
+            if phase is not None:
+                setattr(cls, name, timed(phase, value))
+
+
+def percentile(values, fraction):
+    """Returns the nearest-rank percentile of `values`, e.g. 0.95 for p95."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def phase_stats(samples):
+    """
+    Aggregates phase samples into statistics.
+
+    Args:
+        samples (dict): Maps each phase to the seconds it took in each row.
+
+    Returns:
+        dict: Maps each phase to its count, p50, p95 and max in seconds.
+    """
+    return {
+        phase: {
+            'count': len(values),
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'max': max(values),
+        }
+        for phase, values in sorted(samples.items())
+        if values
+    }
+
+
+def load_results(path):
+    """Reads benchmark results written by `save_results`, or None if the file does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as file:
+        return json.load(file)
+
+
+def save_results(path, samples, runs=1):
+    """
+    Writes the phase samples of `runs` runs with their statistics as JSON.
+
+    Samples already in the file are kept, so running the suite several
+    times with the same file aggregates across runs.
+    """
+    previous = load_results(path)
+    if previous:
+        runs += previous.get('runs', 0)
+        merged = {phase: list(values) for phase, values in previous.get('samples', {}).items()}
+        for phase, values in samples.items():
+            merged.setdefault(phase, []).extend(values)
+        samples = merged
+    results = {'runs': runs, 'phases': phase_stats(samples), 'samples': samples}
+    with Path(path).open('w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+    return results
+
+
+def compare(phases, baseline, tolerance):
+    """
+    Compares phase statistics against baseline statistics.
+
+    Args:
+        phases (dict): Statistics of this run, from `phase_stats`.
+        baseline (dict): Statistics of the baseline, from `phase_stats`.
+        tolerance (float): Allowed relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list: Messages describing each p50/p95 that regressed beyond the tolerance.
+    """
+    regressions = []
+    for phase, stats in phases.items():
+        reference = baseline.get(phase)
+        if reference is None:
+            continue
+        for stat in ('p50', 'p95'):
+            current, allowed = stats[stat], reference[stat] * (1 + tolerance)
+            if current > allowed and current - reference[stat] > MIN_REGRESSION_SECONDS:
+                regressions.append(
+                    f"{phase} {stat} {current:.2f}s > baseline {reference[stat]:.2f}s +{tolerance:.0%}"
+                )
+    return regressions
@@ -0,0 +1,204 @@
+from selenium.common.exceptions import JavascriptException
+
+from harness.js import execute_async_script
+
+# Counts the matches of a CSS or XPath (starting with "/" or "(") selector.
+COUNT_MATCHES_JS = """
+function countMatches(doc, selector) {
+    if (/^(\\.?\\/|\\()/.test(selector)) {
+        return doc.evaluate('count(' + selector + ')', doc, null,
+                            XPathResult.NUMBER_TYPE, null).numberValue;
+    }
+    return doc.querySelectorAll(selector).length;
+}
+"""
+
+ELEMENT_WAIT_SCRIPT = COUNT_MATCHES_JS + """
+var selector = arguments[0];
+var present = arguments[1];
+var timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var finished = false;
+var observer = null;
+var timer = null;
+
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearTimeout(timer);
+    done(result);
+}
+
+function check() {
+    try {
+        if ((countMatches(document, selector) > 0) === present) {
+            finish({matched: true});
+        }
+    } catch (e) {
+        finish({error: String(e)});
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    timer = setTimeout(function () { finish({matched: false}); }, timeout);
+}
+"""
+
+BATCH_VERIFY_SCRIPT = COUNT_MATCHES_JS + """
+var checks = arguments[0];
+var timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+var finished = false;
+var observers = [];
+var timer = null;
+
+function documentFor(frame) {
+    if (frame === null) {
+        return document;
+    }
+    var win = window.frames[frame];
+    return win ? win.document : null;
+}
+
+function evaluate() {
+    var presence = [];
+    var ok = true;
+    for (var i = 0; i < checks.length; i++) {
+        var doc = documentFor(checks[i][0]);
+        var present = !!doc && countMatches(doc, checks[i][1]) > 0;
+        presence.push(present);
+        ok = ok && present === checks[i][2];
+    }
+    return {ok: ok, presence: presence};
+}
+
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observers.forEach(function (observer) { observer.disconnect(); });
+    clearTimeout(timer);
+    done(result);
+}
+
+function check() {
+    try {
+        var result = evaluate();
+        if (result.ok) {
+            finish(result);
+        }
+        return result;
+    } catch (e) {
+        finish({error: String(e)});
+    }
+}
+
+check();
+if (!finished) {
+    checks.forEach(function (item) {
+        var doc = documentFor(item[0]);
+        if (doc && !observers.some(function (observer) { return observer.doc === doc; })) {
+            var observer = new MutationObserver(check);
+            observer.doc = doc;
+            observer.observe(doc.documentElement || doc, {
+                childList: true, subtree: true, attributes: true, characterData: true
+            });
+            observers.push(observer);
+        }
+    });
+    timer = setTimeout(function () { finish(check() || {error: 'evaluation failed'}); }, timeout);
+}
+"""
+
+
+def wait_for_selector(case, selector, present=True, timeout=3):
+    """
+    Waits in the current document until `selector` is present (or absent).
+
+    A MutationObserver is installed in the document the driver is switched
+    to (the page or the TinyMCE frame), so the single async script resolves
+    right after the DOM change that satisfies the condition, or when
+    `timeout` seconds have passed. CSS selectors and XPath (starting with
+    "/" or "(") are supported.
+
+    Returns:
+        bool: Whether the condition was met in time, or None if the selector
+        cannot be evaluated by the browser (e.g. seleniumbase `:contains()`),
+        in which case the caller should fall back to polling.
+    """
+    try:
+        result = execute_async_script(
+            case, ELEMENT_WAIT_SCRIPT, selector, bool(present), int(timeout * 1000), timeout=timeout + 5
+        )
+    except JavascriptException:
+        return None
+    if not result or 'error' in result:
+        return None
+    return bool(result['matched'])
+
+
+def _count_with_driver(case, frame, selector):
+    """Counts the matches of a selector by switching frames, for selectors the browser cannot evaluate."""
+    case.switch_to_default_content()
+    if frame is not None:
+        case.switch_to_frame(frame)
+    count = len(case.find_elements(selector))
+    case.switch_to_default_content()
+    return count
+
+
+def batch_verify(case, checks, timeout=3):
+    """
+    Evaluates several element checks in one round trip.
+
+    The async script runs from the default content and reads the documents
+    of same-origin iframes directly, so no frame switches are needed. It
+    resolves once every expectation holds or after `timeout` seconds.
+    Must be called from the default content. Selectors the browser cannot
+    evaluate make the batch fall back to checking each one once through the
+    driver.
+
+    Args:
+        checks (list): (frame, selector, expected) tuples. `frame` is the
+            iframe index or None for the page, `expected` is True if the
+            element must be present and False if it must be absent.
+        timeout (int or float): The number of seconds to wait.
+
+    Returns:
+        dict: Maps each (frame, selector) to whether it was present.
+    """
+    checks = [(frame, selector, bool(expected)) for frame, selector, expected in checks]
+    try:
+        result = execute_async_script(
+            case, BATCH_VERIFY_SCRIPT, [list(check) for check in checks], int(timeout * 1000), timeout=timeout + 5
+        )
+    except JavascriptException:
+        result = None
+
+    if result and 'error' not in result:
+        presence = result['presence']
+    else:
+        presence = [_count_with_driver(case, frame, selector) > 0 for frame, selector, _ in checks]
+    return {(frame, selector): present for (frame, selector, _), present in zip(checks, presence)}
+
+
+def describe_failures(checks, presence):
+    """Builds one failure message for every check whose expectation does not hold."""
+    failures = []
+    for frame, selector, expected in checks:
+        if presence[(frame, selector)] != bool(expected):
+            where = "page" if frame is None else f"frame {frame}"
+            state = "not found" if expected else "still present"
+            failures.append(f"Element with selector '{selector}' {state} in {where}.")
+    return "\n".join(failures)